@@ -0,0 +1,145 @@
+"""
+Sparse fieldsets for artwork list responses.
+
+List endpoints accept `fields=`, either a preset name or a comma-separated
+list of ArtworkResponse fields, with `artist.<field>` (or `artist` for all of
+them) selecting fields of the nested artist:
+
+    fields=card
+    fields=id,title,thumbnail_path,artist.artist_name
+
+A fieldset names the columns to load and carries lean response schemas that
+only contain the requested fields. The schemas of the presets are built at
+import time; custom fieldsets are built on first use and cached.
+"""
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+from app.api.schemas import ArtworkListResponse, ArtworkResponse, GalleryResponse, UserResponse
+
+ARTWORK_FIELDS = tuple(name for name in ArtworkResponse.model_fields if name != "artist")
+ARTIST_FIELDS = tuple(UserResponse.model_fields)
+
+PRESETS = {
+    # Grid views: enough to draw a tile and credit the artist
+    "card": "id,title,thumbnail_path,placeholder,artist.artist_name",
+    "full": ",".join((*ARTWORK_FIELDS, "artist")),
+}
+DEFAULT_PRESET = "full"
+
+
+class Fieldset(NamedTuple):
+    """Columns to load and response schemas for a set of artwork fields"""
+    name: str  # preset name or normalized field list, part of cache keys
+    artwork_columns: tuple[str, ...]
+    artist_columns: tuple[str, ...]  # empty: the artist is not loaded
+    schema: type[BaseModel]  # one artwork
+    gallery_schema: type[BaseModel]  # GalleryResponse
+    list_schema: type[BaseModel]  # ArtworkListResponse
+    list_adapter: TypeAdapter  # list of artworks
+
+
+def _lean_model(name: str, source: type[BaseModel], fields: tuple[str, ...], **extra) -> type[BaseModel]:
+    """A copy of `source` with only `fields` (plus `extra` field definitions)"""
+    definitions = {
+        field: (source.model_fields[field].annotation, source.model_fields[field])
+        for field in fields
+    }
+    return create_model(name, __config__=ConfigDict(from_attributes=True), **definitions, **extra)
+
+
+def _build(name: str, artwork_fields: tuple[str, ...], artist_fields: tuple[str, ...]) -> Fieldset:
+    if name == "full":
+        schema, gallery_schema, list_schema = ArtworkResponse, GalleryResponse, ArtworkListResponse
+    else:
+        suffix = name.capitalize() if name in PRESETS else "Custom"
+        extra = {}
+        if artist_fields:
+            extra["artist"] = (_lean_model(f"UserResponse{suffix}", UserResponse, artist_fields), ...)
+        schema = _lean_model(f"ArtworkResponse{suffix}", ArtworkResponse, artwork_fields, **extra)
+        gallery_schema = create_model(
+            f"GalleryResponse{suffix}", __base__=GalleryResponse,
+            artworks=(list[schema], ...), featured=(list[schema], ...)
+        )
+        list_schema = create_model(f"ArtworkListResponse{suffix}", __base__=ArtworkListResponse, artworks=(list[schema], ...))
+
+    return Fieldset(
+        name=name,
+        artwork_columns=artwork_fields,
+        artist_columns=artist_fields,
+        schema=schema,
+        gallery_schema=gallery_schema,
+        list_schema=list_schema,
+        list_adapter=TypeAdapter(list[schema]),
+    )
+
+
+def _parse(spec: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Split a field list into artwork and artist fields, in schema order"""
+    requested = {part.strip() for part in spec.split(",") if part.strip()}
+    if "artist" in requested:
+        requested |= {f"artist.{field}" for field in ARTIST_FIELDS}
+        requested.discard("artist")
+
+    unknown = requested - set(ARTWORK_FIELDS) - {f"artist.{field}" for field in ARTIST_FIELDS}
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Unknown fields: {', '.join(sorted(unknown))}. Use a preset ({', '.join(PRESETS)}) or any of: "
+                f"{', '.join(ARTWORK_FIELDS)}, artist, {', '.join(f'artist.{field}' for field in ARTIST_FIELDS)}"
+            )
+        )
+
+    # The id is always included (clients key tiles and sprite sheets by it)
+    artwork_fields = tuple(field for field in ARTWORK_FIELDS if field in requested or field == "id")
+    artist_fields = tuple(field for field in ARTIST_FIELDS if f"artist.{field}" in requested)
+    return artwork_fields, artist_fields
+
+
+@lru_cache(maxsize=64)
+def _custom(artwork_fields: tuple[str, ...], artist_fields: tuple[str, ...]) -> Fieldset:
+    name = ",".join((*artwork_fields, *(f"artist.{field}" for field in artist_fields)))
+    return _build(name, artwork_fields, artist_fields)
+
+
+FIELDSETS = {name: _build(name, *_parse(spec)) for name, spec in PRESETS.items()}
+
+
+def get_fieldset(spec: Optional[str]) -> Fieldset:
+    """
+    Resolve a `fields` value to a fieldset.
+
+    Args:
+        spec: Preset name, comma-separated field list, or None for the default
+
+    Returns:
+        Fieldset
+
+    Raises:
+        HTTPException: If a field is unknown
+    """
+    if not spec:
+        return FIELDSETS[DEFAULT_PRESET]
+    if spec in FIELDSETS:
+        return FIELDSETS[spec]
+
+    artwork_fields, artist_fields = _parse(spec)
+    for fieldset in FIELDSETS.values():
+        if (fieldset.artwork_columns, fieldset.artist_columns) == (artwork_fields, artist_fields):
+            return fieldset
+    return _custom(artwork_fields, artist_fields)
+
+
+def artwork_fieldset(
+    fields: Optional[str] = Query(
+        None,
+        description=f"Preset ({', '.join(PRESETS)}; default {DEFAULT_PRESET}) or comma-separated fields, "
+                    "e.g. id,title,thumbnail_path,artist.artist_name"
+    )
+) -> Fieldset:
+    """Dependency resolving the `fields` query parameter"""
+    return get_fieldset(fields)
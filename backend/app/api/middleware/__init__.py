@@ -1,3 +1,18 @@
 from app.api.middleware.auth_middleware import get_current_user, get_current_user_optional
+from app.api.middleware.metrics_middleware import MetricsMiddleware
+from app.api.middleware.profiler_middleware import ProfilerMiddleware
+from app.api.middleware.concurrency_middleware import ConcurrencyLimitMiddleware
+from app.api.middleware.compression_middleware import CompressionMiddleware
+from app.api.middleware.idempotency_middleware import IdempotencyMiddleware
+from app.api.middleware.request_log_middleware import RequestLogMiddleware
 
-__all__ = ["get_current_user", "get_current_user_optional"]
+__all__ = [
+    "get_current_user",
+    "get_current_user_optional",
+    "MetricsMiddleware",
+    "ProfilerMiddleware",
+    "ConcurrencyLimitMiddleware",
+    "CompressionMiddleware",
+    "IdempotencyMiddleware",
+    "RequestLogMiddleware",
+]
@@ -4,6 +4,7 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core import profiler
 from app.models import User
 from app.services import AuthService
 
@@ -29,7 +30,8 @@ async def get_current_user(
     """
     token = credentials.credentials
 
-    user = AuthService.get_current_user(db, token)
+    with profiler.phase("auth"):
+        user = AuthService.get_current_user(db, token)
 
     if not user:
         raise HTTPException(
@@ -65,4 +67,5 @@ async def get_current_user_optional(
         return None
 
     token = credentials.credentials
-    return AuthService.get_current_user(db, token)
+    with profiler.phase("auth"):
+        return AuthService.get_current_user(db, token)
@@ -0,0 +1,68 @@
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.compression import choose_encoding, compress
+from app.core.config import settings
+
+COMPRESSIBLE_TYPES = ("application/json", "text/plain", "text/html", "text/css", "application/javascript")
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing JSON and text responses above
+    COMPRESSION_MIN_SIZE with brotli or gzip, as accepted by the client.
+
+    Responses that already carry a Content-Encoding (e.g. cached gallery
+    payloads) and streams such as Server-Sent Events are passed through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        body_parts: list[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            headers = MutableHeaders(scope=start_message)
+            headers.add_vary_header("Accept-Encoding")
+
+            if len(body) >= settings.COMPRESSION_MIN_SIZE:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
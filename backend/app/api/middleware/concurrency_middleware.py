@@ -0,0 +1,166 @@
+import time
+from typing import Optional
+
+from starlette.responses import JSONResponse
+
+from app.core import metrics
+from app.core.config import settings
+
+# Paths that are never limited (probes, scrapes and long-lived streams)
+EXEMPT_PATHS = {"/", "/api/health", "/metrics", "/api/gallery/stream"}
+
+UPLOAD_PATHS = {"/api/artworks/upload", "/api/artworks/batch-upload"}
+UPLOAD_PREFIX = "/api/uploads"  # resumable uploads and their chunks
+
+# Groups whose latency does not adapt the limit: upload time is dominated by
+# how fast the client sends the body, not by how loaded the server is
+UNADAPTED_GROUPS = {"upload"}
+
+
+def route_group(method: str, path: str) -> Optional[str]:
+    """
+    Classify a request into a concurrency group.
+
+    Returns:
+        "read", "write", "upload" or "auth", or None if the request is exempt
+    """
+    if method == "OPTIONS" or path in EXEMPT_PATHS or path.startswith("/uploads/"):
+        return None
+    if method in ("GET", "HEAD"):
+        return "read"
+    if path in UPLOAD_PATHS or path.startswith(UPLOAD_PREFIX):
+        return "upload"
+    if path.startswith("/api/auth/"):
+        return "auth"
+    return "write"
+
+
+class _LatencyBaseline:
+    """Exponentially weighted moving average of a route's unsaturated latency"""
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.current: Optional[float] = None
+
+    def update(self, latency: float):
+        if self.current is None:
+            self.current = latency
+        else:
+            self.current += self.alpha * (latency - self.current)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit driven by request latency.
+
+    Each route keeps a baseline: the moving average of its latency while the
+    limiter is not saturated. While it is saturated (in-flight requests near
+    the limit), a request slower than `tolerance` times its route's baseline
+    shrinks the limit multiplicatively and a faster one grows it by roughly
+    one per `limit` requests. Below saturation the limit is left alone, so
+    slow requests on an idle server (cache misses, large pages) never shrink
+    it. Groups may use only their share of the limit, so cheap reads keep
+    being admitted after uploads and logins are shed.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        tolerance: float,
+        backoff: float = 0.9,
+        min_latency: float = 0.01,
+        saturation: float = 0.9,
+        alpha: float = 0.05
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.min_latency = min_latency
+        self.saturation = saturation
+        self.alpha = alpha
+        self.in_flight = 0
+        self._baselines: dict[str, _LatencyBaseline] = {}
+
+    def try_acquire(self, share: float) -> bool:
+        """Admit a request of a group allowed `share` of the limit"""
+        if self.in_flight < max(self.min_limit, self.limit * share):
+            self.in_flight += 1
+            return True
+        return False
+
+    def release(self, route: str, latency: float, adapt: bool = True):
+        """
+        Record a finished request and adapt the limit.
+
+        Args:
+            route: Route template (or group) whose baseline the latency is compared with
+            latency: Seconds the request took
+            adapt: False to only free the slot (requests timed by the client, like uploads)
+        """
+        saturated = self.in_flight >= self.limit * self.saturation
+        self.in_flight -= 1
+        if not adapt:
+            return
+
+        baseline = self._baselines.setdefault(route, _LatencyBaseline(self.alpha))
+        if baseline.current is None or not saturated:
+            # Only unsaturated requests define the baseline, so it does not
+            # drift up with the queueing delay it is meant to detect
+            baseline.update(latency)
+            return
+
+        if latency > max(baseline.current, self.min_latency) * self.tolerance:
+            self.limit = max(self.min_limit, self.limit * self.backoff)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        metrics.CONCURRENCY_LIMIT.set(round(self.limit, 2))
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    ASGI middleware that sheds load with `503 Service Unavailable` and a
+    `Retry-After` header once the adaptive concurrency limit is reached.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=settings.CONCURRENCY_INITIAL_LIMIT,
+            min_limit=settings.CONCURRENCY_MIN_LIMIT,
+            max_limit=settings.CONCURRENCY_MAX_LIMIT,
+            tolerance=settings.CONCURRENCY_LATENCY_TOLERANCE,
+        )
+
+    async def __call__(self, scope, receive, send):
+        group = route_group(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not self.limiter.try_acquire(settings.CONCURRENCY_GROUP_SHARES.get(group, 1.0)):
+            metrics.REQUESTS_SHED.inc(1, group)
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is busy, please retry shortly"},
+                headers={"Retry-After": str(settings.CONCURRENCY_RETRY_AFTER.get(group, 1))},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The router records the matched route in the scope; templates
+            # keep one baseline per endpoint rather than per artwork id
+            route = scope.get("route")
+            self.limiter.release(
+                f"{scope['method']} {route.path}" if route is not None else group,
+                time.perf_counter() - started,
+                adapt=group not in UNADAPTED_GROUPS,
+            )
@@ -0,0 +1,157 @@
+import asyncio
+import re
+import time
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.idempotency_service import IdempotencyService
+
+# Requests whose retries are answered from the stored response
+IDEMPOTENT_ROUTES = (
+    ("POST", re.compile(r"^/api/artworks/upload$")),
+    ("POST", re.compile(r"^/api/artworks/batch-upload$")),
+    ("POST", re.compile(r"^/api/artworks/\d+/heart$")),
+    ("POST", re.compile(r"^/api/uploads/[^/]+/complete$")),
+)
+
+# Visible ASCII, as in Stripe-style keys (UUIDs, ULIDs, ...)
+KEY_PATTERN = re.compile(r"^[\x21-\x7e]{1,255}$")
+
+POLL_INTERVAL_SECONDS = 0.25
+
+
+def is_idempotent(method: str, path: str) -> bool:
+    return any(method == route_method and pattern.match(path) for route_method, pattern in IDEMPOTENT_ROUTES)
+
+
+def _claim(scope: str, key: str, endpoint: str) -> Optional[tuple]:
+    """Claim a key; returns (endpoint, status_code, content_type, body) of an existing record"""
+    db = SessionLocal()
+    try:
+        record = IdempotencyService.claim(db, scope, key, endpoint)
+        if record is None:
+            return None
+        return record.endpoint, record.status_code, record.content_type, record.response_body
+    finally:
+        db.close()
+
+
+def _finish(scope: str, key: str, status_code: Optional[int], content_type: Optional[str], body: Optional[bytes]):
+    """Store a successful response, or release the key of a failed request"""
+    db = SessionLocal()
+    try:
+        if status_code is not None and body is not None:
+            IdempotencyService.complete(db, scope, key, status_code, content_type, body)
+        else:
+            IdempotencyService.release(db, scope, key)
+    finally:
+        db.close()
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware honouring the `Idempotency-Key` header on uploads and hearts.
+
+    The first request with a key is handled normally and its successful
+    (2xx) response is stored; retries with the same key get that response
+    back, marked `Idempotent-Replayed: true`, without the file, image or
+    database work. A retry arriving while the original is still in flight
+    waits up to IDEMPOTENCY_WAIT_SECONDS for it, then gets `409 Conflict`
+    with `Retry-After`. Failed requests are not stored, so they can be
+    retried with the same key.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not is_idempotent(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = headers.get("idempotency-key")
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not KEY_PATTERN.match(key):
+            response = JSONResponse(
+                status_code=400,
+                content={"detail": "Idempotency-Key must be 1-255 visible ASCII characters"},
+            )
+            await response(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_scope = IdempotencyService.scope_for(headers.get("authorization"), client[0] if client else None)
+        endpoint = f"{scope['method']} {scope['path']}"
+
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            existing = await run_in_threadpool(_claim, client_scope, key, endpoint)
+            if existing is None:
+                break
+            stored_endpoint, status_code, content_type, body = existing
+
+            if stored_endpoint != endpoint:
+                response = JSONResponse(
+                    status_code=422,
+                    content={"detail": "Idempotency-Key was already used for a different request"},
+                )
+            elif status_code is not None:
+                response = Response(
+                    body.encode("utf-8"),
+                    status_code=status_code,
+                    media_type=content_type,
+                    headers={"Idempotent-Replayed": "true"},
+                )
+            elif time.monotonic() >= deadline:
+                response = JSONResponse(
+                    status_code=409,
+                    content={"detail": "A request with this Idempotency-Key is still in progress"},
+                    headers={"Retry-After": "1"},
+                )
+            else:
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+                continue
+
+            await response(scope, receive, send)
+            return
+
+        # Claimed: handle the request, keeping a copy of the response
+        status_code: Optional[int] = None
+        content_type: Optional[str] = None
+        body_parts: list[bytes] = []
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, content_type, size
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = Headers(raw=message["headers"]).get("content-type")
+            elif message["type"] == "http.response.body" and size <= settings.IDEMPOTENCY_MAX_RESPONSE_BYTES:
+                chunk = message.get("body", b"")
+                body_parts.append(chunk)
+                size += len(chunk)
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            # Release the key in a worker thread without awaiting it: the
+            # task may be cancelled (client disconnected)
+            asyncio.get_running_loop().run_in_executor(None, _finish, client_scope, key, None, None, None)
+            raise
+
+        stored = status_code is not None and 200 <= status_code < 300 and size <= settings.IDEMPOTENCY_MAX_RESPONSE_BYTES
+        await run_in_threadpool(
+            _finish, client_scope, key, status_code, content_type, b"".join(body_parts) if stored else None
+        )
@@ -0,0 +1,40 @@
+import time
+
+from app.core import metrics
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route request latency and status counts.
+
+    Implemented as plain ASGI (rather than BaseHTTPMiddleware) so it adds no
+    extra task or body buffering to the request path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # FastAPI stores the matched route in the scope; mounts set root_path
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or scope.get("root_path") or "unmatched"
+            method = scope["method"]
+
+            metrics.HTTP_REQUESTS.inc(1, method, route_path, str(status_code))
+            metrics.HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method, route_path)
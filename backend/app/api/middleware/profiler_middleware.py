@@ -0,0 +1,80 @@
+import hmac
+import logging
+
+from starlette.datastructures import MutableHeaders
+
+from app.core import profiler
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware that profiles requests when PROFILING_ENABLED is set or,
+    with PROFILING_ALLOW_HEADER, the client sends the profiling header (e.g.
+    `X-Profile: 1`, or `X-Profile: <PROFILING_SECRET>` when a secret is set).
+
+    Adds a Server-Timing header with the SQL, phase and total breakdown and
+    logs slow requests together with repeated (N+1) statements.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = settings.PROFILING_HEADER.lower().encode()
+        self.secret = settings.PROFILING_SECRET.encode()
+
+    def _should_profile(self, scope) -> bool:
+        if settings.PROFILING_ENABLED:
+            return True
+        if not settings.PROFILING_ALLOW_HEADER:
+            return False
+        for name, value in scope["headers"]:
+            if name == self.header:
+                if self.secret:
+                    return hmac.compare_digest(value, self.secret)
+                return value not in (b"", b"0")
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        token = profiler.start_profile(scope["method"], scope["path"])
+        profile = profiler.current_profile()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop_profile(token)
+            log_if_slow(profile)
+
+
+def log_if_slow(profile: profiler.RequestProfile):
+    """Log the breakdown of a profiled request slower than SLOW_REQUEST_MS"""
+    elapsed_ms = profile.elapsed * 1000
+    if elapsed_ms < settings.SLOW_REQUEST_MS:
+        return
+
+    logger.warning(
+        "Slow request %s %s", profile.method, profile.path,
+        extra={
+            "duration_ms": round(elapsed_ms, 1),
+            "queries": profile.statement_count,
+            "db_ms": round(profile.db_seconds * 1000, 1),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in profile.phases.items()},
+        }
+    )
+
+    for statement, count in profile.repeated_statements(settings.N_PLUS_ONE_THRESHOLD):
+        logger.warning(
+            "N+1 suspect in %s %s", profile.method, profile.path,
+            extra={"count": count, "statement": " ".join(statement.split())[:200]}
+        )
@@ -0,0 +1,70 @@
+import logging
+import random
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.config import settings
+from app.core.log import request_id_var
+
+logger = logging.getLogger("app.access")
+
+# Accepted from clients and proxies; anything else is replaced with a new ID
+REQUEST_ID_PATTERN = re.compile(r"^[\w.:-]{1,128}$")
+
+
+class RequestLogMiddleware:
+    """
+    ASGI middleware giving each request an ID and writing the access log.
+
+    The ID comes from the client's `X-Request-ID` header or is generated,
+    is attached to every log record written while handling the request, and
+    is returned in the `X-Request-ID` response header. Server errors and
+    requests slower than SLOW_REQUEST_MS are always logged; other requests
+    are sampled at LOG_ACCESS_SAMPLE_RATE.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id", "")
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            always = status_code >= 500 or duration_ms >= settings.SLOW_REQUEST_MS
+            if always or random.random() < settings.LOG_ACCESS_SAMPLE_RATE:
+                client = scope.get("client")
+                logger.info(
+                    "%s %s %s", scope["method"], scope["path"], status_code,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round(duration_ms, 1),
+                        "client": client[0] if client else None,
+                        "sample_rate": 1.0 if always else settings.LOG_ACCESS_SAMPLE_RATE,
+                    }
+                )
+            request_id_var.reset(token)
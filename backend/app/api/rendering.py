@@ -0,0 +1,115 @@
+"""
+JSON rendering of gallery responses.
+
+Shared by the gallery routes, which cache the rendered bytes, and the static
+snapshot job (SnapshotService), which writes them to storage. Bodies are
+serialized straight from the response schemas of a fieldset, without
+FastAPI's response validation.
+"""
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.api.fieldsets import Fieldset, get_fieldset
+from app.core import profiler
+from app.core.config import settings
+from app.services import ArtworkService, SpriteService
+
+# Default page sizes of the gallery routes
+GALLERY_PAGE_SIZE = 50
+FEATURED_LIMIT = 10
+LATEST_LIMIT = 20
+
+
+def render_gallery(
+    db: Session,
+    skip: int = 0,
+    limit: int = GALLERY_PAGE_SIZE,
+    color: Optional[str] = None,
+    fieldset: Optional[Fieldset] = None,
+    wait_for_sprite: bool = False
+) -> bytes:
+    """
+    Render a Hall of Fame page as JSON.
+
+    Args:
+        db: Database session
+        skip: Number of artworks to skip
+        limit: Maximum number of artworks
+        color: Optional color bucket name or hex color to filter by
+        fieldset: Artwork fields to include (defaults to all)
+        wait_for_sprite: Wait for the sprite sheet instead of rendering
+            `sprite: null` while it is built (background callers only)
+
+    Returns:
+        Serialized GalleryResponse
+    """
+    fieldset = fieldset or get_fieldset(None)
+    columns = fieldset.artwork_columns
+    if settings.GALLERY_SPRITES_ENABLED:
+        columns += ("thumbnail_path",)  # the sprite sheet is built from the thumbnails
+
+    artworks = ArtworkService.get_gallery_artworks(
+        db, skip=skip, limit=limit, color=color, columns=columns, artist_columns=fieldset.artist_columns
+    )
+    featured = ArtworkService.get_gallery_artworks(
+        db, skip=0, limit=FEATURED_LIMIT, featured_only=True, columns=columns, artist_columns=fieldset.artist_columns
+    )
+
+    # One image with every thumbnail of the page
+    sprite = None
+    if settings.GALLERY_SPRITES_ENABLED:
+        with profiler.phase("sprite"):
+            sprite = SpriteService.get_sheet(featured + artworks, wait=wait_for_sprite)
+
+    with profiler.phase("serialize"):
+        return fieldset.gallery_schema(
+            artworks=[fieldset.schema.model_validate(a) for a in artworks],
+            featured=[fieldset.schema.model_validate(a) for a in featured],
+            total=len(artworks),
+            sprite=sprite
+        ).model_dump_json().encode()
+
+
+def render_artworks(db: Session, limit: int, featured_only: bool = False, fieldset: Optional[Fieldset] = None) -> bytes:
+    """
+    Render the newest public artworks as a JSON list.
+
+    Args:
+        db: Database session
+        limit: Maximum number of artworks
+        featured_only: If True, only featured artworks
+        fieldset: Artwork fields to include (defaults to all)
+
+    Returns:
+        Serialized list of ArtworkResponse
+    """
+    fieldset = fieldset or get_fieldset(None)
+    artworks = ArtworkService.get_gallery_artworks(
+        db, skip=0, limit=limit, featured_only=featured_only,
+        columns=fieldset.artwork_columns, artist_columns=fieldset.artist_columns
+    )
+    with profiler.phase("serialize"):
+        return fieldset.list_adapter.dump_json([fieldset.schema.model_validate(a) for a in artworks])
+
+
+def render_snapshots(db: Session) -> dict[str, bytes]:
+    """
+    Render every static snapshot, with the default parameters of the routes.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Dict of storage key to JSON body
+    """
+    prefix = settings.SNAPSHOT_PREFIX
+    snapshots = {
+        f"{prefix}/featured.json": render_artworks(db, FEATURED_LIMIT, featured_only=True),
+        f"{prefix}/latest.json": render_artworks(db, LATEST_LIMIT),
+    }
+    for page in range(1, settings.SNAPSHOT_GALLERY_PAGES + 1):
+        snapshots[f"{prefix}/gallery/{page}.json"] = render_gallery(
+            db, skip=(page - 1) * GALLERY_PAGE_SIZE, limit=GALLERY_PAGE_SIZE, wait_for_sprite=True
+        )
+    return snapshots
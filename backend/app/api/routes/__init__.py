@@ -1,3 +1,3 @@
-from app.api.routes import auth, artworks, gallery
+from app.api.routes import auth, artworks, drafts, gallery, uploads
 
-__all__ = ["auth", "artworks", "gallery"]
+__all__ = ["auth", "artworks", "drafts", "gallery", "uploads"]
@@ -1,10 +1,25 @@
+import json
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.api.schemas import ArtworkResponse, ArtworkListResponse, MessageResponse
-from app.services import ArtworkService, FileService
+from app.core import profiler
+from app.api.fieldsets import Fieldset, artwork_fieldset
+from app.api.schemas import (
+    ArtworkCreate,
+    ArtworkResponse,
+    ArtworkListResponse,
+    ArtworkLookupResponse,
+    ArtworkLookupResult,
+    BatchUploadResponse,
+    BatchUploadResult,
+    MessageResponse,
+)
+from app.services import ArtworkService, FileService, DraftService
 from app.api.middleware import get_current_user, get_current_user_optional
 from app.models import User
 
@@ -19,37 +34,177 @@ async def upload_artwork(
     width: Optional[int] = Form(None),
     height: Optional[int] = Form(None),
     canvas_data: Optional[str] = Form(None),
+    draft_id: Optional[int] = Form(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Upload a new artwork file and create artwork entry.
-    Requires authentication.
+    With `draft_id`, the draft's latest canvas state becomes `canvas_data`
+    and the draft is deleted. Requires authentication.
     """
-    # Save artwork file
-    file_path, file_size, file_format = await FileService.save_artwork_file(file)
-
-    # Create thumbnail
-    thumbnail_path = FileService.create_thumbnail(file_path)
-
-    # Create artwork entry
-    artwork = ArtworkService.create_artwork(
-        db=db,
-        artist_id=current_user.id,
-        file_path=file_path,
-        file_format=file_format,
-        file_size=file_size,
+    if draft_id is not None:
+        draft = DraftService.get_draft(db, draft_id, current_user.id)
+        canvas_data = DraftService.get_canvas_data(db, draft)
+
+    # Save artwork file (its header is checked first)
+    file_path, file_size, image = await FileService.save_artwork_file(file)
+
+    # Create the thumbnail, palette, placeholder and artwork entry
+    artwork = await run_in_threadpool(
+        ArtworkService.create_from_stored_file,
+        db,
+        current_user.id,
+        file_path,
+        file_size,
+        image,
         title=title,
         description=description,
         width=width,
         height=height,
         canvas_data=canvas_data,
-        thumbnail_path=thumbnail_path
+        draft_id=draft_id
     )
 
     return ArtworkResponse.model_validate(artwork)
 
 
+@router.post("/batch-upload", response_model=BatchUploadResponse)
+async def batch_upload_artworks(
+    files: list[UploadFile] = File(...),
+    metadata: Optional[str] = Form(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload many artwork files at once.
+    `metadata` is an optional JSON array with one ArtworkCreate object per file.
+    Thumbnails are generated in parallel and all artworks are inserted in a
+    single transaction. Requires authentication.
+    """
+    if len(files) > settings.MAX_BATCH_UPLOAD_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files. Maximum per batch: {settings.MAX_BATCH_UPLOAD_FILES}"
+        )
+
+    # Parse per-file metadata
+    items_metadata = [ArtworkCreate() for _ in files]
+    if metadata:
+        try:
+            raw = json.loads(metadata)
+            if not isinstance(raw, list) or len(raw) != len(files):
+                raise ValueError("metadata must be a JSON array with one entry per file")
+            items_metadata = [ArtworkCreate.model_validate(item or {}) for item in raw]
+        except (ValueError, ValidationError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid metadata: {str(e)}"
+            )
+
+    results = [
+        BatchUploadResult(index=index, filename=file.filename, success=False)
+        for index, file in enumerate(files)
+    ]
+
+    # Save artwork files
+    saved = []
+    for index, file in enumerate(files):
+        try:
+            saved.append((index, *await FileService.save_artwork_file(file)))
+        except HTTPException as e:
+            results[index].error = e.detail
+
+    processed = []
+    try:
+        # Create thumbnails, palettes and placeholders in parallel
+        processed = await run_in_threadpool(FileService.process_images, [file_path for _, file_path, _, _ in saved])
+
+        items = []
+        for (index, file_path, file_size, image), (thumbnail_path, palette, placeholder) in zip(saved, processed):
+            item_metadata = items_metadata[index]
+            items.append({
+                **item_metadata.model_dump(),
+                "width": image.width or item_metadata.width,
+                "height": image.height or item_metadata.height,
+                "file_path": file_path,
+                "file_format": image.format,
+                "file_size": file_size,
+                "thumbnail_path": thumbnail_path,
+                "palette": palette,
+                "placeholder": placeholder,
+            })
+
+        # Create artwork entries in one transaction
+        artworks = await run_in_threadpool(ArtworkService.create_artworks, db, current_user.id, items) if items else []
+    except Exception:
+        db.rollback()
+        for _, file_path, _, _ in saved:
+            FileService.delete_file(file_path)
+        for thumbnail_path, _, _ in processed:
+            if thumbnail_path:
+                FileService.delete_file(thumbnail_path)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save artworks"
+        )
+
+    with profiler.phase("serialize"):
+        for (index, *_), artwork in zip(saved, artworks):
+            results[index].success = True
+            results[index].artwork = ArtworkResponse.model_validate(artwork)
+
+    return BatchUploadResponse(
+        results=results,
+        created=len(artworks),
+        failed=len(files) - len(artworks)
+    )
+
+
+@router.get("", response_model=ArtworkLookupResponse)
+async def get_artworks(
+    ids: str = Query(..., description="Comma-separated artwork IDs, e.g. 3,1,2"),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """
+    Get many artworks at once, in the requested order.
+    Same rules as GET /artworks/{artwork_id}: private artworks are only
+    returned to their artist, and a view is counted for each returned one.
+    Missing and private IDs are reported per ID.
+    """
+    try:
+        artwork_ids = list(dict.fromkeys(int(part) for part in ids.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+
+    if len(artwork_ids) > settings.MAX_ARTWORK_IDS_PER_REQUEST:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many ids. Maximum per request: {settings.MAX_ARTWORK_IDS_PER_REQUEST}"
+        )
+
+    viewer_id = current_user.id if current_user else None
+    artworks = ArtworkService.get_artworks_by_ids(db, artwork_ids, viewer_id)
+
+    results = []
+    with profiler.phase("serialize"):
+        for artwork_id in artwork_ids:
+            artwork = artworks.get(artwork_id)
+            if artwork is None:
+                results.append(ArtworkLookupResult(id=artwork_id, error="Artwork not found"))
+            elif not artwork.is_public and artwork.artist_id != viewer_id:
+                results.append(ArtworkLookupResult(id=artwork_id, error="This artwork is private"))
+            else:
+                results.append(ArtworkLookupResult(id=artwork_id, artwork=ArtworkResponse.model_validate(artwork)))
+
+    found = sum(1 for result in results if result.artwork is not None)
+    return ArtworkLookupResponse(results=results, found=found, missing=len(results) - found)
+
+
 @router.get("/{artwork_id}", response_model=ArtworkResponse)
 async def get_artwork(
     artwork_id: int,
@@ -75,7 +230,8 @@ async def get_artwork(
             detail="This artwork is private"
         )
 
-    return ArtworkResponse.model_validate(artwork)
+    with profiler.phase("serialize"):
+        return ArtworkResponse.model_validate(artwork)
 
 
 @router.get("/artist/{artist_id}", response_model=ArtworkListResponse)
@@ -83,25 +239,34 @@ async def get_artist_artworks(
     artist_id: int,
     skip: int = 0,
     limit: int = 100,
+    fieldset: Fieldset = Depends(artwork_fieldset),
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
     """
     Get all artworks by a specific artist.
     Public artworks only unless requesting own artworks.
+    `fields=card` returns lean grid items.
     """
-    artworks = ArtworkService.get_artworks_by_artist(db, artist_id, skip, limit)
+    artworks = ArtworkService.get_artworks_by_artist(
+        db, artist_id, skip, limit,
+        columns=fieldset.artwork_columns + ("is_public",),
+        artist_columns=fieldset.artist_columns
+    )
 
     # Filter private artworks unless user is viewing their own
     if not current_user or current_user.id != artist_id:
         artworks = [a for a in artworks if a.is_public]
 
-    return ArtworkListResponse(
-        artworks=[ArtworkResponse.model_validate(a) for a in artworks],
-        total=len(artworks),
-        skip=skip,
-        limit=limit
-    )
+    # Serialized here: the lean schemas of a fieldset are not ArtworkListResponse
+    with profiler.phase("serialize"):
+        body = fieldset.list_schema(
+            artworks=[fieldset.schema.model_validate(a) for a in artworks],
+            total=len(artworks),
+            skip=skip,
+            limit=limit
+        ).model_dump_json()
+    return Response(body, media_type="application/json")
 
 
 @router.post("/{artwork_id}/heart", response_model=ArtworkResponse)
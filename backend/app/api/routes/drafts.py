@@ -0,0 +1,110 @@
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.schemas import (
+    DraftCreate,
+    DraftPatch,
+    DraftSummary,
+    DraftResponse,
+    DraftVersionResponse,
+    DraftDeltasResponse,
+    MessageResponse,
+)
+from app.services import DraftService
+from app.api.middleware import get_current_user
+from app.models import User
+
+router = APIRouter(prefix="/drafts", tags=["Drafts"])
+
+
+@router.post("/", response_model=DraftResponse, status_code=status.HTTP_201_CREATED)
+async def create_draft(
+    draft_data: DraftCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Start a new work-in-progress canvas.
+    Requires authentication.
+    """
+    draft = DraftService.create_draft(db, current_user.id, **draft_data.model_dump())
+    return DraftResponse(
+        **DraftSummary.model_validate(draft).model_dump(),
+        canvas_data=DraftService.get_canvas_data(db, draft)
+    )
+
+
+@router.get("/", response_model=list[DraftSummary])
+async def list_drafts(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    List the current user's drafts (without canvas state).
+    """
+    return [DraftSummary.model_validate(d) for d in DraftService.list_drafts(db, current_user.id)]
+
+
+@router.get("/{draft_id}", response_model=DraftResponse)
+async def get_draft(
+    draft_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a draft with its latest canvas state.
+    """
+    draft = DraftService.get_draft(db, draft_id, current_user.id)
+    return DraftResponse(
+        **DraftSummary.model_validate(draft).model_dump(),
+        canvas_data=DraftService.get_canvas_data(db, draft)
+    )
+
+
+@router.patch("/{draft_id}", response_model=DraftVersionResponse)
+async def autosave_draft(
+    draft_id: int,
+    patch: DraftPatch,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Autosave changes made since `base_version`.
+    `strokes` are appended to the canvas state's `strokes` list, then `ops`
+    (JSON Patch) are applied. Returns 409 if the draft has moved past
+    `base_version` (e.g. saved from another tab).
+    """
+    ops = [op.model_dump(by_alias=True, exclude_unset=True) for op in patch.ops] if patch.ops else None
+    draft, compacted = DraftService.apply_patch(
+        db, draft_id, current_user.id, patch.base_version, strokes=patch.strokes, ops=ops
+    )
+    return DraftVersionResponse(id=draft.id, version=draft.version, compacted=compacted)
+
+
+@router.get("/{draft_id}/deltas", response_model=DraftDeltasResponse)
+async def get_draft_deltas(
+    draft_id: int,
+    since: int = Query(..., ge=0, description="Version the client already has"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the deltas after `since`, to catch up without downloading the
+    whole canvas. Returns 410 if they were compacted away.
+    """
+    draft = DraftService.get_draft(db, draft_id, current_user.id)
+    return DraftDeltasResponse(version=draft.version, deltas=DraftService.get_deltas(db, draft, since))
+
+
+@router.delete("/{draft_id}", response_model=MessageResponse)
+async def delete_draft(
+    draft_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete a draft.
+    """
+    DraftService.delete_draft(db, draft_id, current_user.id)
+    return MessageResponse(message="Draft deleted successfully")
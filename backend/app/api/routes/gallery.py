@@ -1,55 +1,118 @@
-from fastapi import APIRouter, Depends, Query
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.cache import gallery_cache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.events import gallery_events
+from app.api.fieldsets import Fieldset, artwork_fieldset
+from app.api.rendering import render_artworks, render_gallery
 from app.api.schemas import GalleryResponse, ArtworkResponse
-from app.services import ArtworkService
 
 router = APIRouter(prefix="/gallery", tags=["Hall of Fame"])
 
 
 @router.get("/", response_model=GalleryResponse)
 async def get_hall_of_fame(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    color: Optional[str] = Query(None, description="Color bucket name or hex color"),
+    fieldset: Fieldset = Depends(artwork_fieldset),
     db: Session = Depends(get_db)
 ):
     """
     Get the Hall of Fame gallery - all public artworks.
     Returns regular artworks and featured artworks separately.
+    Optionally filtered by dominant color; `fields=card` returns lean grid items.
     """
-    # Get all public artworks
-    artworks = ArtworkService.get_gallery_artworks(db, skip=skip, limit=limit)
+    cache_key = ("gallery", skip, limit, color, fieldset.name)
+    cached = gallery_cache.get(cache_key)
+    if cached:
+        return cached.to_response(request)
 
-    # Get featured artworks
-    featured = ArtworkService.get_gallery_artworks(db, skip=0, limit=10, featured_only=True)
-
-    return GalleryResponse(
-        artworks=[ArtworkResponse.model_validate(a) for a in artworks],
-        featured=[ArtworkResponse.model_validate(a) for a in featured],
-        total=len(artworks)
-    )
+    # Public artworks plus the featured spotlight, as also written to the static snapshots
+    body = render_gallery(db, skip=skip, limit=limit, color=color, fieldset=fieldset)
+    return gallery_cache.set(cache_key, body).to_response(request)
 
 
 @router.get("/featured", response_model=list[ArtworkResponse])
 async def get_featured_artworks(
+    request: Request,
     limit: int = Query(10, ge=1, le=50),
+    fieldset: Fieldset = Depends(artwork_fieldset),
     db: Session = Depends(get_db)
 ):
     """
     Get only featured artworks for the spotlight section.
     """
-    featured = ArtworkService.get_gallery_artworks(db, skip=0, limit=limit, featured_only=True)
-    return [ArtworkResponse.model_validate(a) for a in featured]
+    cache_key = ("featured", limit, fieldset.name)
+    cached = gallery_cache.get(cache_key)
+    if cached:
+        return cached.to_response(request)
+
+    body = render_artworks(db, limit, featured_only=True, fieldset=fieldset)
+
+    return gallery_cache.set(cache_key, body).to_response(request)
 
 
 @router.get("/latest", response_model=list[ArtworkResponse])
 async def get_latest_artworks(
+    request: Request,
     limit: int = Query(20, ge=1, le=100),
+    fieldset: Fieldset = Depends(artwork_fieldset),
     db: Session = Depends(get_db)
 ):
     """
     Get the latest artworks (newest first).
     """
-    artworks = ArtworkService.get_gallery_artworks(db, skip=0, limit=limit)
-    return [ArtworkResponse.model_validate(a) for a in artworks]
+    cache_key = ("latest", limit, fieldset.name)
+    cached = gallery_cache.get(cache_key)
+    if cached:
+        return cached.to_response(request)
+
+    body = render_artworks(db, limit, fieldset=fieldset)
+
+    return gallery_cache.set(cache_key, body).to_response(request)
+
+
+@router.get("/stream")
+async def stream_gallery():
+    """
+    Stream gallery updates as Server-Sent Events.
+
+    Events:
+    - `artwork_created`: a new public artwork (summary fields)
+    - `artwork_deleted`: `{"id": ...}` of a removed artwork
+    - `hearts`: coalesced `[{"id": ..., "hearts": ...}]` heart count updates
+    """
+    if gallery_events.subscriber_count >= settings.SSE_MAX_CLIENTS:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many stream clients, please retry later",
+            headers={"Retry-After": "30"}
+        )
+
+    subscriber = gallery_events.subscribe()
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not subscriber.dropped:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), settings.SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield message
+        finally:
+            gallery_events.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
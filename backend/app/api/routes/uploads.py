@@ -0,0 +1,115 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.schemas import (
+    UploadCreate,
+    UploadStatusResponse,
+    UploadChunkResponse,
+    UploadComplete,
+    ArtworkResponse,
+    MessageResponse,
+)
+from app.services import UploadService, ArtworkService, DraftService
+from app.api.middleware import get_current_user
+from app.models import User
+
+router = APIRouter(prefix="/uploads", tags=["Uploads"])
+
+
+@router.post("/", response_model=UploadStatusResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload(
+    upload_data: UploadCreate,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a resumable upload for a large artwork file.
+    Send the file with PUT requests of at most `chunk_size` bytes, then
+    complete it. Requires authentication.
+    """
+    return UploadService.create_upload(current_user.id, upload_data.filename, upload_data.size)
+
+
+@router.get("/{upload_id}", response_model=UploadStatusResponse)
+async def get_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the progress of an upload; after a lost connection, resume from `offset`.
+    """
+    return UploadService.get_status(current_user.id, upload_id)
+
+
+@router.put("/{upload_id}", response_model=UploadChunkResponse)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Position of this chunk in the file"),
+    chunk_sha256: Optional[str] = Header(None, alias="X-Chunk-SHA256"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Write the raw request body at `offset`.
+    Returns 409 with an `Upload-Offset` header if the offset is not where the
+    upload left off. With `X-Chunk-SHA256`, a corrupted chunk is rejected.
+    """
+    new_offset = await UploadService.write_chunk(
+        current_user.id, upload_id, offset, request.stream(), sha256=chunk_sha256
+    )
+    return UploadChunkResponse(offset=new_offset)
+
+
+@router.post("/{upload_id}/complete", response_model=ArtworkResponse, status_code=status.HTTP_201_CREATED)
+async def complete_upload(
+    upload_id: str,
+    upload_data: UploadComplete,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Verify the SHA-256 of the uploaded file and create the artwork entry.
+    With `draft_id`, the draft's latest canvas state becomes `canvas_data`
+    and the draft is deleted.
+    """
+    canvas_data = upload_data.canvas_data
+    if upload_data.draft_id is not None:
+        draft = DraftService.get_draft(db, upload_data.draft_id, current_user.id)
+        canvas_data = DraftService.get_canvas_data(db, draft)
+
+    # Verify and move the file to storage
+    file_path, file_size, image = await run_in_threadpool(
+        UploadService.finish_upload, current_user.id, upload_id, upload_data.sha256
+    )
+
+    # Create the thumbnail, palette, placeholder and artwork entry
+    artwork = await run_in_threadpool(
+        ArtworkService.create_from_stored_file,
+        db,
+        current_user.id,
+        file_path,
+        file_size,
+        image,
+        title=upload_data.title,
+        description=upload_data.description,
+        width=upload_data.width,
+        height=upload_data.height,
+        canvas_data=canvas_data,
+        draft_id=upload_data.draft_id
+    )
+
+    return ArtworkResponse.model_validate(artwork)
+
+
+@router.delete("/{upload_id}", response_model=MessageResponse)
+async def abort_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Cancel an upload and delete the data received so far.
+    """
+    UploadService.abort_upload(current_user.id, upload_id)
+    return MessageResponse(message="Upload aborted successfully")
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -63,6 +63,8 @@ class ArtworkResponse(BaseModel):
     file_size: int
     width: Optional[int]
     height: Optional[int]
+    palette: Optional[str] = None
+    placeholder: Optional[str] = None  # BlurHash of the thumbnail
     hearts: int
     views: int
     is_featured: bool
@@ -84,13 +86,157 @@ class ArtworkListResponse(BaseModel):
     limit: int
 
 
+class ArtworkLookupResult(BaseModel):
+    """Schema for one requested ID of a multi-get"""
+    id: int
+    artwork: Optional[ArtworkResponse] = None
+    error: Optional[str] = None
+
+
+class ArtworkLookupResponse(BaseModel):
+    """Schema for multi-get response, in request order"""
+    results: list[ArtworkLookupResult]
+    found: int
+    missing: int
+
+
+class BatchUploadResult(BaseModel):
+    """Schema for the result of a single file in a batch upload"""
+    index: int
+    filename: Optional[str]
+    success: bool
+    artwork: Optional[ArtworkResponse] = None
+    error: Optional[str] = None
+
+
+class BatchUploadResponse(BaseModel):
+    """Schema for batch upload response"""
+    results: list[BatchUploadResult]
+    created: int
+    failed: int
+
+
+# ============= Draft Schemas =============
+
+class DraftCreate(BaseModel):
+    """Schema for creating a canvas draft"""
+    title: Optional[str] = Field(None, max_length=200)
+    width: Optional[int] = None
+    height: Optional[int] = None
+    canvas_data: Optional[str] = None  # initial state as a JSON string
+
+
+class JsonPatchOperation(BaseModel):
+    """A JSON Patch (RFC 6902) operation"""
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str
+    value: Any = None
+    from_: Optional[str] = Field(None, alias="from")
+
+    class Config:
+        populate_by_name = True
+
+
+class DraftPatch(BaseModel):
+    """Schema for an autosave: strokes to append and/or JSON Patch operations"""
+    base_version: int = Field(..., ge=0)
+    strokes: Optional[list[Any]] = None
+    ops: Optional[list[JsonPatchOperation]] = None
+
+
+class DraftSummary(BaseModel):
+    """Schema for a draft without its canvas state"""
+    id: int
+    title: Optional[str]
+    width: Optional[int]
+    height: Optional[int]
+    version: int
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+class DraftResponse(DraftSummary):
+    """Schema for a draft with its latest canvas state"""
+    canvas_data: str  # JSON string, like Artwork.canvas_data
+
+
+class DraftVersionResponse(BaseModel):
+    """Schema for the result of an autosave"""
+    id: int
+    version: int
+    compacted: bool
+
+
+class DraftDelta(BaseModel):
+    """Schema for one delta of the draft log"""
+    version: int
+    strokes: Optional[list[Any]] = None
+    ops: Optional[list[dict[str, Any]]] = None
+
+
+class DraftDeltasResponse(BaseModel):
+    """Schema for the deltas after a version"""
+    version: int
+    deltas: list[DraftDelta]
+
+
+# ============= Resumable Upload Schemas =============
+
+class UploadCreate(BaseModel):
+    """Schema for starting a resumable upload"""
+    filename: str = Field(..., max_length=255)
+    size: int = Field(..., gt=0)  # total bytes
+
+
+class UploadStatusResponse(BaseModel):
+    """Schema for the progress of a resumable upload"""
+    id: str
+    filename: str
+    size: int
+    offset: int  # bytes received; the next chunk starts here
+    chunk_size: int  # largest chunk accepted per request
+    expires_at: datetime
+
+
+class UploadChunkResponse(BaseModel):
+    """Schema for the result of writing a chunk"""
+    offset: int
+
+
+class UploadComplete(ArtworkCreate):
+    """Schema for completing a resumable upload into an artwork"""
+    sha256: str = Field(..., pattern="^[0-9a-fA-F]{64}$")  # of the whole file
+    draft_id: Optional[int] = None
+
+
 # ============= Gallery Schemas =============
 
+class SpriteTile(BaseModel):
+    """Position of an artwork's thumbnail in a sprite sheet"""
+    id: int  # artwork ID
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class SpriteSheet(BaseModel):
+    """All thumbnails of a gallery page packed into one image"""
+    path: str  # like thumbnail_path
+    width: int
+    height: int
+    tiles: list[SpriteTile]  # artworks missing here use their thumbnail_path
+
+
 class GalleryResponse(BaseModel):
     """Schema for Hall of Fame gallery response"""
     artworks: list[ArtworkResponse]
     featured: list[ArtworkResponse]
     total: int
+    sprite: Optional[SpriteSheet] = None
 
 
 # ============= Generic Responses =============
@@ -0,0 +1,433 @@
+"""
+CanvasQuest maintenance commands.
+
+Usage:
+    python -m app.cli <command> [options]
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from app.core.database import SessionLocal, check_schema, init_db
+from app.services.storage_service import LocalStorage, get_storage
+
+
+def _palette_for(paths: tuple[Optional[str], str]) -> list[tuple[str, float]]:
+    """Worker: extract a palette from the thumbnail, falling back to the original"""
+    from app.services import ColorService
+
+    thumbnail_path, file_path = paths
+    return ColorService.extract_palette_from_file(thumbnail_path) or ColorService.extract_palette_from_file(file_path)
+
+
+def backfill_colors(batch_size: int = 200, workers: Optional[int] = None, force: bool = False) -> int:
+    """
+    Extract dominant color palettes for existing artworks.
+
+    Artworks are processed in id order, one batch per transaction; the image
+    work of each batch is spread across a process pool.
+
+    Args:
+        batch_size: Number of artworks per batch
+        workers: Number of worker processes (defaults to CPU count)
+        force: Recompute palettes that already exist
+
+    Returns:
+        Number of artworks updated
+    """
+    from app.models import Artwork
+    from app.services import ArtworkService
+
+    check_schema()
+    db = SessionLocal()
+    updated = 0
+    last_id = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                query = db.query(Artwork).filter(Artwork.id > last_id)
+                if not force:
+                    query = query.filter(Artwork.palette.is_(None))
+                batch = query.order_by(Artwork.id).limit(batch_size).all()
+
+                if not batch:
+                    break
+
+                paths = [(a.thumbnail_path, a.file_path) for a in batch]
+                for artwork, palette in zip(batch, pool.map(_palette_for, paths)):
+                    if palette:
+                        ArtworkService.apply_palette(artwork, palette)
+                        updated += 1
+
+                db.commit()
+                last_id = batch[-1].id
+                db.expunge_all()
+                print(f"🎨 Processed artworks up to id {last_id} ({updated} updated)")
+    finally:
+        db.close()
+
+    return updated
+
+
+def _placeholder_for(paths: tuple[Optional[str], str]) -> Optional[str]:
+    """Worker: compute a placeholder from the thumbnail, falling back to the original"""
+    from app.services import PlaceholderService
+
+    thumbnail_path, file_path = paths
+    return PlaceholderService.encode_file(thumbnail_path) or PlaceholderService.encode_file(file_path)
+
+
+def backfill_placeholders(batch_size: int = 200, workers: Optional[int] = None, force: bool = False) -> int:
+    """
+    Compute BlurHash placeholders for existing artworks.
+
+    Artworks are processed in id order, one batch per transaction; the image
+    work of each batch is spread across a process pool.
+
+    Args:
+        batch_size: Number of artworks per batch
+        workers: Number of worker processes (defaults to CPU count)
+        force: Recompute placeholders that already exist
+
+    Returns:
+        Number of artworks updated
+    """
+    from app.models import Artwork
+
+    check_schema()
+    db = SessionLocal()
+    updated = 0
+    last_id = 0
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                query = db.query(Artwork).filter(Artwork.id > last_id)
+                if not force:
+                    query = query.filter(Artwork.placeholder.is_(None))
+                batch = query.order_by(Artwork.id).limit(batch_size).all()
+
+                if not batch:
+                    break
+
+                paths = [(a.thumbnail_path, a.file_path) for a in batch]
+                for artwork, placeholder in zip(batch, pool.map(_placeholder_for, paths)):
+                    if placeholder:
+                        artwork.placeholder = placeholder
+                        updated += 1
+
+                db.commit()
+                last_id = batch[-1].id
+                db.expunge_all()
+                print(f"🌫️ Processed artworks up to id {last_id} ({updated} updated)")
+    finally:
+        db.close()
+
+    return updated
+
+
+def export_gallery(output: str, batch_size: int = 1000) -> dict[str, int]:
+    """
+    Export users, artworks and their files to a .tar.gz archive.
+
+    Args:
+        output: Archive path, or "-" for stdout
+        batch_size: Rows fetched per cursor round trip
+
+    Returns:
+        Exported counts per table, plus "files"
+    """
+    from app.services import BackupService
+
+    db = SessionLocal()
+    try:
+        if output == "-":
+            return BackupService.export_gallery(db, sys.stdout.buffer, batch_size)
+        with open(output, "wb") as f:
+            return BackupService.export_gallery(db, f, batch_size)
+    finally:
+        db.close()
+
+
+def import_gallery(source: str, batch_size: int = 1000, restore_files: bool = True) -> dict[str, int]:
+    """
+    Restore an archive written by export_gallery into an empty database.
+
+    Args:
+        source: Archive path, or "-" for stdin
+        batch_size: Rows per insert statement
+        restore_files: Also restore artwork files and thumbnails
+
+    Returns:
+        Restored counts per table, plus "files"
+    """
+    from app.services import BackupService, FileService
+
+    init_db()
+    FileService.ensure_upload_dir()
+    db = SessionLocal()
+    try:
+        if source == "-":
+            return BackupService.import_gallery(db, sys.stdin.buffer, batch_size, restore_files)
+        with open(source, "rb") as f:
+            return BackupService.import_gallery(db, f, batch_size, restore_files)
+    finally:
+        db.close()
+
+
+def _rehome_file(job: tuple) -> tuple[str, Optional[str]]:
+    """
+    Worker: move one file to its sharded key on the target backend.
+
+    Returns:
+        ("moved" | "current" | "missing", new reference or None)
+    """
+    source, target, reference = job
+    key = source.key_from_reference(reference)
+    if key is None:
+        # Not under the source directory: already on the target backend or external
+        return "current", None
+
+    category, filename = key.split("/", 1)[0], key.rsplit("/", 1)[-1]
+    new_key = target.shard_key(category, filename)
+    new_reference = target.reference(new_key)
+    if new_reference == reference:
+        return "current", None
+
+    if not source.exists(key):
+        # Moved by an earlier, interrupted run
+        return ("moved", new_reference) if target.exists(new_key) else ("missing", None)
+
+    if isinstance(target, LocalStorage) and os.path.abspath(target.root) == os.path.abspath(source.root):
+        os.makedirs(os.path.dirname(target.path(new_key)), exist_ok=True)
+        os.replace(source.path(key), target.path(new_key))
+    else:
+        with source.open(key) as f:
+            target.save(new_key, f)
+
+    return "moved", new_reference
+
+
+def migrate_storage(
+    source_dir: Optional[str] = None,
+    batch_size: int = 200,
+    workers: int = 8,
+    keep_source: bool = False
+) -> dict[str, int]:
+    """
+    Rehome files from the flat `uploads/artworks/<file>` layout (or another
+    local upload directory) to sharded keys on the configured backend.
+
+    Files of each id-ordered batch are moved in parallel, then the batch's
+    paths are updated in one transaction. Copied source files are deleted only
+    after the commit, and files already moved by an interrupted run are picked
+    up again, so the command can be re-run safely.
+
+    Args:
+        source_dir: Local directory holding the files (defaults to UPLOAD_DIR)
+        batch_size: Number of artworks per batch
+        workers: Number of parallel file transfers
+        keep_source: Keep source files after copying them to another backend
+
+    Returns:
+        Counts of "moved", "current" and "missing" files
+    """
+    from sqlalchemy import select, update
+
+    from app.core.config import settings
+    from app.models import Artwork
+
+    source = LocalStorage(source_dir or settings.UPLOAD_DIR)
+    target = get_storage()
+    counts = {"moved": 0, "current": 0, "missing": 0}
+
+    check_schema()
+    db = SessionLocal()
+    last_id = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                batch = db.execute(
+                    select(Artwork.id, Artwork.file_path, Artwork.thumbnail_path)
+                    .where(Artwork.id > last_id)
+                    .order_by(Artwork.id)
+                    .limit(batch_size)
+                ).all()
+
+                if not batch:
+                    break
+
+                # Artworks may share files, so each reference is moved once
+                references = list(dict.fromkeys(
+                    ref for row in batch for ref in (row.file_path, row.thumbnail_path) if ref
+                ))
+                jobs = [(source, target, ref) for ref in references]
+                moved = dict(zip(references, pool.map(_rehome_file, jobs)))
+
+                updates = []
+                for row in batch:
+                    values = {"id": row.id}
+                    for name in ("file_path", "thumbnail_path"):
+                        reference = getattr(row, name)
+                        if reference is None:
+                            continue
+                        outcome, new_reference = moved[reference]
+                        counts[outcome] += 1
+                        if new_reference:
+                            values[name] = new_reference
+                    if len(values) > 1:
+                        updates.append(values)
+
+                if updates:
+                    db.execute(update(Artwork), updates)
+                db.commit()
+
+                # Copies are only removed once the new paths are committed
+                if not keep_source and not isinstance(target, LocalStorage):
+                    stale = [source.key_from_reference(ref) for ref, (outcome, new) in moved.items() if new]
+                    list(pool.map(source.delete, filter(None, stale)))
+
+                last_id = batch[-1].id
+                print(f"📦 Migrated artworks up to id {last_id} ({counts['moved']} files moved)")
+    finally:
+        db.close()
+
+    return counts
+
+
+def collect_orphans(
+    grace_hours: Optional[float] = None,
+    quarantine: Optional[bool] = None,
+    dry_run: bool = False
+) -> dict[str, int]:
+    """
+    Delete or quarantine upload files that no artwork references.
+
+    Args:
+        grace_hours: Minimum orphan age (defaults to GC_GRACE_PERIOD_HOURS)
+        quarantine: Quarantine instead of delete (defaults to GC_QUARANTINE)
+        dry_run: Only report what would be collected
+
+    Returns:
+        Collection stats (see CleanupService.collect_orphan_files)
+    """
+    from app.services import CleanupService
+
+    db = SessionLocal()
+    try:
+        return CleanupService.collect_orphan_files(db, grace_hours=grace_hours, quarantine=quarantine, dry_run=dry_run)
+    finally:
+        db.close()
+
+
+def purge_sessions(batch_size: Optional[int] = None) -> dict[str, int]:
+    """
+    Delete expired and inactive sessions in small batches.
+
+    Args:
+        batch_size: Rows per transaction (defaults to SESSION_PURGE_BATCH_SIZE)
+
+    Returns:
+        Number of deleted "expired" and "inactive" sessions
+    """
+    from app.services import AuthService
+
+    check_schema()
+    db = SessionLocal()
+    try:
+        return AuthService.purge_sessions(db, batch_size=batch_size)
+    finally:
+        db.close()
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="CanvasQuest maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    colors = commands.add_parser("backfill-colors", help="Extract dominant colors for existing artworks")
+    colors.add_argument("--batch-size", type=int, default=200)
+    colors.add_argument("--workers", type=int, default=None)
+    colors.add_argument("--force", action="store_true", help="Recompute existing palettes")
+
+    placeholders = commands.add_parser("backfill-placeholders", help="Compute BlurHash placeholders for existing artworks")
+    placeholders.add_argument("--batch-size", type=int, default=200)
+    placeholders.add_argument("--workers", type=int, default=None)
+    placeholders.add_argument("--force", action="store_true", help="Recompute existing placeholders")
+
+    export = commands.add_parser("export", help="Export the gallery to a .tar.gz archive")
+    export.add_argument("output", help='Archive path, or "-" for stdout')
+    export.add_argument("--batch-size", type=int, default=1000)
+
+    restore = commands.add_parser("import", help="Restore a gallery export into an empty database")
+    restore.add_argument("source", help='Archive path, or "-" for stdin')
+    restore.add_argument("--batch-size", type=int, default=1000)
+    restore.add_argument("--skip-files", action="store_true", help="Restore database rows only")
+
+    migrate = commands.add_parser("migrate-storage", help="Move files to the sharded layout of the storage backend")
+    migrate.add_argument("--source-dir", default=None, help="Local upload directory (defaults to UPLOAD_DIR)")
+    migrate.add_argument("--batch-size", type=int, default=200)
+    migrate.add_argument("--workers", type=int, default=8)
+    migrate.add_argument("--keep-source", action="store_true", help="Keep local files after copying them")
+
+    gc = commands.add_parser("gc", help="Collect upload files no artwork references")
+    gc.add_argument("--grace-hours", type=float, default=None, help="Keep orphans younger than this")
+    gc.add_argument("--delete", action="store_const", const=False, dest="quarantine",
+                    help="Delete orphans instead of quarantining them")
+    gc.add_argument("--dry-run", action="store_true", help="Only report what would be collected")
+
+    sessions = commands.add_parser("purge-sessions", help="Delete expired and inactive sessions")
+    sessions.add_argument("--batch-size", type=int, default=None)
+
+    commands.add_parser("migrate", help="Apply pending database migrations (alembic upgrade head)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "migrate":
+        init_db()
+        print("✅ Database migrated")
+
+    elif args.command == "backfill-colors":
+        updated = backfill_colors(batch_size=args.batch_size, workers=args.workers, force=args.force)
+        print(f"✅ Backfilled colors for {updated} artworks")
+
+    elif args.command == "backfill-placeholders":
+        updated = backfill_placeholders(batch_size=args.batch_size, workers=args.workers, force=args.force)
+        print(f"✅ Backfilled placeholders for {updated} artworks")
+
+    elif args.command == "export":
+        counts = export_gallery(args.output, batch_size=args.batch_size)
+        print(f"✅ Exported {counts}", file=sys.stderr)
+
+    elif args.command == "import":
+        counts = import_gallery(args.source, batch_size=args.batch_size, restore_files=not args.skip_files)
+        print(f"✅ Imported {counts}")
+
+    elif args.command == "migrate-storage":
+        counts = migrate_storage(
+            source_dir=args.source_dir,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            keep_source=args.keep_source,
+        )
+        print(f"✅ Migrated storage {counts}")
+
+    elif args.command == "purge-sessions":
+        counts = purge_sessions(batch_size=args.batch_size)
+        print(f"✅ Purged {counts['expired']} expired and {counts['inactive']} inactive sessions")
+
+    elif args.command == "gc":
+        stats = collect_orphans(grace_hours=args.grace_hours, quarantine=args.quarantine, dry_run=args.dry_run)
+        print(
+            f"✅ {'Would collect' if args.dry_run else 'Collected'} "
+            f"{stats['deleted'] + stats['quarantined']} orphans of {stats['scanned']} files, "
+            f"reclaimed {stats['reclaimed_bytes'] / 1024 / 1024:.1f}MB "
+            f"({stats['quarantined_bytes'] / 1024 / 1024:.1f}MB quarantined, {stats['purged']} purged)"
+        )
+
+
+if __name__ == "__main__":
+    main()
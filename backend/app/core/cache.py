@@ -0,0 +1,92 @@
+"""
+In-process cache of serialized JSON responses.
+
+Each entry keeps the uncompressed body together with its compressed
+variants, which are produced on first request for an encoding and reused
+afterwards, so popular pages are serialized and compressed once per TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.compression import choose_encoding, compress
+from app.core.config import settings
+
+
+class CachedPayload:
+    """Serialized JSON body and its compressed variants"""
+
+    __slots__ = ("body", "expires_at", "_encoded")
+
+    def __init__(self, body: bytes, ttl: float):
+        self.body = body
+        self.expires_at = time.monotonic() + ttl
+        self._encoded: dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        data = self._encoded.get(encoding)
+        if data is None:
+            data = self._encoded[encoding] = compress(self.body, encoding)
+        return data
+
+    def to_response(self, request: Request) -> Response:
+        """Build a response, compressed if the client accepts it"""
+        headers = {"Vary": "Accept-Encoding"}
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+
+        if settings.COMPRESSION_ENABLED and encoding and len(self.body) >= settings.COMPRESSION_MIN_SIZE:
+            headers["Content-Encoding"] = encoding
+            return Response(self.encoded(encoding), media_type="application/json", headers=headers)
+
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """Bounded LRU cache of CachedPayload entries with a time-to-live"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, CachedPayload] = OrderedDict()
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[], None]] = []
+
+    def get(self, key: Hashable) -> Optional[CachedPayload]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, body: bytes) -> CachedPayload:
+        entry = CachedPayload(body, self.ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+        for listener in self._listeners:
+            listener()
+
+    def on_invalidate(self, listener: Callable[[], None]):
+        """Call `listener` after every invalidation (e.g. to refresh derived copies)"""
+        self._listeners.append(listener)
+
+
+gallery_cache = ResponseCache(
+    max_entries=settings.GALLERY_CACHE_MAX_ENTRIES,
+    ttl=settings.GALLERY_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,49 @@
+"""
+Response compression helpers (gzip, and brotli when the optional `brotli`
+package is installed).
+"""
+import gzip
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Encodings this server can produce, in order of preference"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick the preferred encoding the client accepts.
+
+    Args:
+        accept_encoding: Value of the Accept-Encoding request header
+
+    Returns:
+        "br", "gzip" or None
+    """
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+
+    for encoding in supported_encodings():
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with the given encoding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=settings.GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
@@ -18,14 +18,136 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    MAX_ACTIVE_SESSIONS_PER_USER: int = 10  # oldest sessions are deactivated beyond this
+    SESSION_PURGE_INTERVAL_HOURS: float = 6.0  # delete expired/inactive sessions; 0 disables
+    SESSION_PURGE_BATCH_SIZE: int = 500  # rows deleted per transaction
 
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./canvasquest.db")
+    DB_AUTO_MIGRATE: bool = os.getenv("DEBUG", "True").lower() == "true"  # else only check the schema version
+
+    # Server (run.py production launcher)
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WORKERS: int = 0  # worker processes; 0 = one per CPU
+    PRELOAD_APP: bool = True  # import the app in the master so workers share its memory
+    WORKER_MAX_REQUESTS: int = 10000  # recycle a worker after this many requests; 0 disables
+    WORKER_MAX_REQUESTS_JITTER: int = 1000  # random extra requests so workers don't recycle together
+    WORKER_TIMEOUT: int = 60  # seconds a worker may stay unresponsive before it is restarted
+    WORKER_GRACEFUL_TIMEOUT: int = 30  # seconds to finish in-flight requests on restart/shutdown
+    WORKER_KEEPALIVE: int = 5  # seconds to hold idle keep-alive connections
+    SCHEDULER_LOCK_FILE: str = ""  # set by the launcher: only the worker holding it runs maintenance jobs
+
+    # Startup
+    LAZY_IMPORTS: bool = False  # import Pillow, NumPy, jose, passlib on first use instead of right after startup
 
     # File Storage
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS: set = {".png", ".jpg", ".jpeg", ".svg"}
+    MAX_IMAGE_PIXELS: int = 64 * 1000 * 1000  # width x height; larger images (decompression bombs) are rejected
+    MAX_BATCH_UPLOAD_FILES: int = 200
+    IMAGE_WORKERS: int = 0  # processes shared by batch uploads for thumbnails; 0 = one per CPU
+    MAX_ARTWORK_IDS_PER_REQUEST: int = 100  # GET /api/artworks?ids=...
+    MAX_RESUMABLE_UPLOAD_SIZE: int = 100 * 1024 * 1024  # 100MB, via /api/uploads
+    UPLOAD_MAX_CHUNK_SIZE: int = 8 * 1024 * 1024  # per PUT of a resumable upload
+    UPLOAD_STAGING_DIR: str = "./upload-staging"  # partial uploads; keep outside UPLOAD_DIR (served publicly)
+    UPLOAD_EXPIRE_HOURS: float = 24.0  # partial uploads without activity are deleted
+    MAX_UPLOADS_IN_PROGRESS: int = 5  # per user
+    UPLOAD_PURGE_INTERVAL_HOURS: float = 1.0  # delete expired partial uploads; 0 disables
+    STORAGE_BACKEND: str = "local"  # "local" or "s3"
+    STORAGE_FANOUT_DEPTH: int = 2  # hash-prefix directory levels, e.g. artworks/3f/a2/<file>
+
+    # S3-compatible storage (STORAGE_BACKEND="s3"; requires boto3)
+    S3_BUCKET: str = "canvasquest"
+    S3_ENDPOINT_URL: Optional[str] = None  # e.g. http://localhost:9000 for MinIO
+    S3_REGION: Optional[str] = None
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_PUBLIC_URL: Optional[str] = None  # base URL clients fetch files from (CDN or bucket URL)
+
+    # Canvas Drafts (autosaved work in progress)
+    MAX_DRAFTS_PER_USER: int = 20
+    DRAFT_MAX_PATCH_BYTES: int = 256 * 1024  # per autosave
+    DRAFT_MAX_STATE_BYTES: int = 5 * 1024 * 1024  # compacted canvas state
+    DRAFT_COMPACT_MAX_DELTAS: int = 100  # fold the delta log into the snapshot after this many deltas
+    DRAFT_COMPACT_MIN_BYTES: int = 64 * 1024  # ...or once the log outgrows the snapshot and this size
+    DRAFT_STATE_CACHE_SIZE: int = 256  # materialized drafts kept in memory per worker
+
+    # Orphaned File Collection
+    GC_GRACE_PERIOD_HOURS: float = 24.0  # unreferenced files younger than this are kept
+    GC_QUARANTINE: bool = True  # move orphans to quarantine/ instead of deleting them
+    GC_QUARANTINE_RETENTION_DAYS: int = 7
+    GC_INTERVAL_HOURS: float = 0.0  # run the collector in the API process; 0 disables
+
+    # Image Analysis
+    PALETTE_SIZE: int = 5  # dominant colors extracted per artwork
+    PALETTE_MIN_SHARE: float = 0.1  # minimum pixel share for a color bucket to be indexed
+    BLURHASH_COMPONENTS_X: int = 4  # placeholder detail; 4x3 gives a 28-character hash
+    BLURHASH_COMPONENTS_Y: int = 3
+
+    # Observability
+    METRICS_ENABLED: bool = True
+    PROFILING_ENABLED: bool = False  # profile every request
+    PROFILING_ALLOW_HEADER: bool = False  # profile requests sending PROFILING_HEADER
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_SECRET: str = ""  # if set, the header's value must equal it
+    SLOW_REQUEST_MS: int = 500
+    N_PLUS_ONE_THRESHOLD: int = 3  # identical statements per request flagged as N+1
+
+    # Logging (JSON lines on stdout, written by a background thread)
+    LOG_FORMAT: str = "json"  # or "text" for development
+    LOG_LEVEL: str = ""  # defaults to DEBUG when DEBUG=True, else INFO
+    LOG_QUEUE_SIZE: int = 10000  # records waiting for the writer; more are dropped, never waited for
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0  # share of requests in the access log; 5xx and slow ones are always logged
+
+    # Load Shedding
+    CONCURRENCY_LIMIT_ENABLED: bool = False
+    CONCURRENCY_INITIAL_LIMIT: int = 20
+    CONCURRENCY_MIN_LIMIT: int = 4
+    CONCURRENCY_MAX_LIMIT: int = 200
+    CONCURRENCY_LATENCY_TOLERANCE: float = 3.0  # x baseline latency before backing off
+    CONCURRENCY_GROUP_SHARES: dict = {"read": 1.0, "write": 0.8, "auth": 0.6, "upload": 0.5}
+    CONCURRENCY_RETRY_AFTER: dict = {"read": 1, "write": 2, "auth": 5, "upload": 10}  # seconds
+
+    # Idempotency Keys (retried uploads and hearts answered from a stored response)
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_KEY_TTL_HOURS: float = 24.0  # how long a completed response is replayed
+    IDEMPOTENCY_LOCK_SECONDS: float = 300.0  # an unfinished request's key is taken over after this
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # a duplicate waits this long for the original before 409
+    IDEMPOTENCY_MAX_RESPONSE_BYTES: int = 256 * 1024  # larger responses are not stored
+    IDEMPOTENCY_MAX_KEYS: int = 100000  # oldest keys beyond this are purged early
+    IDEMPOTENCY_PURGE_INTERVAL_HOURS: float = 1.0  # 0 disables
+
+    # Compression & Caching
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 5
+    GALLERY_CACHE_TTL_SECONDS: float = 5.0  # heart/view counts may lag by this much
+    GALLERY_CACHE_MAX_ENTRIES: int = 256
+
+    # Static Gallery Snapshots (JSON files under <storage>/SNAPSHOT_PREFIX)
+    SNAPSHOTS_ENABLED: bool = False
+    SNAPSHOT_PREFIX: str = "snapshots"
+    SNAPSHOT_GALLERY_PAGES: int = 3  # /gallery/ pages rendered, 50 artworks each
+    SNAPSHOT_DEBOUNCE_SECONDS: float = 2.0  # quiet period after an upload/delete before regenerating
+    SNAPSHOT_MAX_DELAY_SECONDS: float = 10.0  # regenerate at least this often during an upload burst
+    SNAPSHOT_REFRESH_SECONDS: float = 60.0  # refresh heart/view counts; 0 disables
+
+    # Gallery Sprite Sheets (thumbnails of a /gallery/ page in one image)
+    GALLERY_SPRITES_ENABLED: bool = True
+    SPRITE_ROW_WIDTH: int = 3000  # px; thumbnails are packed into rows up to this wide
+    SPRITE_QUALITY: int = 80  # JPEG quality
+    SPRITE_CACHE_SIZE: int = 256  # tile maps kept in memory per worker
+    SPRITE_MAX_AGE_HOURS: float = 24.0  # sheets unused for this long are deleted
+    SPRITE_PURGE_INTERVAL_HOURS: float = 6.0  # 0 disables
+
+    # Real-time Gallery Stream
+    SSE_MAX_CLIENTS: int = 5000  # per worker
+    SSE_CLIENT_BUFFER_SIZE: int = 100  # queued events before a slow client is dropped
+    SSE_HEART_COALESCE_SECONDS: float = 1.0
+    SSE_KEEPALIVE_SECONDS: float = 15.0
 
     # CORS
     @property
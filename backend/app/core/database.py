@@ -1,16 +1,36 @@
-from sqlalchemy import create_engine
+import os
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core import metrics, profiler
 
 # Create SQLAlchemy engine
 # For SQLite, we need to add check_same_thread=False
+engine_options = {}
+if settings.METRICS_ENABLED:
+    # Time checkouts in the dialect's own pool class
+    database_url = make_url(settings.DATABASE_URL)
+    engine_options["poolclass"] = metrics.timed_pool_class(
+        database_url.get_dialect().get_pool_class(database_url)
+    )
+
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    **engine_options
 )
 
+if settings.METRICS_ENABLED:
+    metrics.instrument_engine(engine)
+
+profiler.instrument_engine(engine)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -30,12 +50,58 @@ def get_db():
         db.close()
 
 
+# Alembic revision the code expects; bump it with every new migration
+SCHEMA_REVISION = "0006"
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised when the database schema does not match the code"""
+
+
+def get_schema_revision() -> Optional[str]:
+    """Return the Alembic revision the database is at, or None if unversioned"""
+    with engine.connect() as connection:
+        try:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except (OperationalError, ProgrammingError):
+            return None
+
+
+def check_schema():
+    """
+    Verify the database is migrated to SCHEMA_REVISION (one cheap query).
+    Call this on application startup when migrations run out of band.
+
+    Raises:
+        SchemaVersionError: If the database is at another revision
+    """
+    revision = get_schema_revision()
+    if revision != SCHEMA_REVISION:
+        raise SchemaVersionError(
+            f"Database schema is at revision {revision or '(none)'}, expected {SCHEMA_REVISION}; "
+            f"run `alembic upgrade head` (or `python -m app.cli migrate`)"
+        )
+
+
 def init_db():
     """
-    Initialize database - create all tables.
-    Call this on application startup.
+    Initialize database - apply pending Alembic migrations.
+    Databases created before migrations existed are adopted in place.
     """
-    # Import models to register them with Base
-    from app.models import User, Artwork, Session
+    from alembic import command
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.attributes["configure_logger"] = False
+
+    head = ScriptDirectory.from_config(config).get_current_head()
+    if head != SCHEMA_REVISION:
+        raise SchemaVersionError(f"Latest migration is {head} but SCHEMA_REVISION is {SCHEMA_REVISION}")
 
-    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
@@ -0,0 +1,110 @@
+"""
+In-process event broadcaster for the real-time gallery stream.
+
+Each subscriber gets a bounded queue of preformatted Server-Sent Events
+messages; a subscriber whose queue fills up is dropped instead of slowing
+down publishers. Heart count updates are coalesced and flushed at most once
+per interval. Events only reach subscribers connected to the same worker
+process.
+"""
+import asyncio
+import json
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+def format_event(event: str, data: Any) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class Subscriber:
+    """A connected stream client"""
+
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self, buffer_size: int):
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = False
+
+
+class Broadcaster:
+    """Fan-out of events to stream subscribers"""
+
+    def __init__(self, buffer_size: int, coalesce_interval: float):
+        self.buffer_size = buffer_size
+        self.coalesce_interval = coalesce_interval
+        self._subscribers: set[Subscriber] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending_hearts: dict[int, int] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        """Register a subscriber (must be called from the event loop)"""
+        self._loop = asyncio.get_running_loop()
+        subscriber = Subscriber(self.buffer_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event: str, data: Any):
+        """Send an event to every subscriber; safe to call from any thread"""
+        if not self._subscribers:
+            return
+        self._call_in_loop(self._dispatch, format_event(event, data))
+
+    def publish_hearts(self, artwork_id: int, hearts: int):
+        """Queue a heart count update; updates are coalesced per interval"""
+        if not self._subscribers:
+            return
+        self._call_in_loop(self._queue_hearts, artwork_id, hearts)
+
+    def _call_in_loop(self, callback, *args):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is loop:
+            callback(*args)
+        else:
+            loop.call_soon_threadsafe(callback, *args)
+
+    def _dispatch(self, message: str):
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Slow consumer: drop it rather than buffer without bound
+                subscriber.dropped = True
+                self._subscribers.discard(subscriber)
+
+    def _queue_hearts(self, artwork_id: int, hearts: int):
+        self._pending_hearts[artwork_id] = hearts
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.coalesce_interval, self._flush_hearts)
+
+    def _flush_hearts(self):
+        self._flush_handle = None
+        pending, self._pending_hearts = self._pending_hearts, {}
+        if pending:
+            self._dispatch(format_event("hearts", [
+                {"id": artwork_id, "hearts": hearts} for artwork_id, hearts in pending.items()
+            ]))
+
+
+gallery_events = Broadcaster(
+    buffer_size=settings.SSE_CLIENT_BUFFER_SIZE,
+    coalesce_interval=settings.SSE_HEART_COALESCE_SECONDS,
+)
@@ -0,0 +1,142 @@
+"""
+Header-only image probing for uploads.
+
+Reads the format and dimensions of PNG, JPEG and SVG files from their first
+bytes, without decoding any pixels, so bad or mislabeled uploads can be
+rejected before they are stored or thumbnailed.
+"""
+import re
+import struct
+from typing import NamedTuple, Optional
+
+# Bytes of the file handed to probe_image; headers must fit in this window
+PROBE_BYTES = 1024 * 1024
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8\xff"
+
+# Start-of-frame markers (baseline, progressive, lossless, arithmetic); they hold the dimensions
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# Markers without a length field
+JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+
+# XML declaration, comments, DOCTYPE and whitespace allowed before the root element
+SVG_PROLOG = re.compile(r"\A(?:\s+|<\?xml[^>]*\?>|<!--.*?-->|<!DOCTYPE[^>\[]*(?:\[.*?\])?\s*>)*", re.S)
+SVG_ROOT = re.compile(r"<svg\b([^>]*)>")
+SVG_LENGTH = re.compile(r"^\s*([0-9]*\.?[0-9]+)\s*(px)?\s*$")
+
+
+class ImageProbeError(ValueError):
+    """Raised when a file is not a supported image or its header is invalid"""
+
+
+class ImageInfo(NamedTuple):
+    """Format ("png", "jpg" or "svg") and pixel dimensions of an image"""
+    format: str
+    width: Optional[int]
+    height: Optional[int]
+
+    @property
+    def pixels(self) -> int:
+        return (self.width or 0) * (self.height or 0)
+
+
+def probe_image(head: bytes) -> ImageInfo:
+    """
+    Identify an image from its first bytes.
+
+    Args:
+        head: Start of the file, up to PROBE_BYTES (or the whole file if smaller)
+
+    Returns:
+        ImageInfo; SVG width/height are None when the root element has
+        neither absolute dimensions nor a viewBox
+
+    Raises:
+        ImageProbeError: If the format is not recognized or the header is
+            truncated or invalid
+    """
+    if head.startswith(PNG_SIGNATURE):
+        return _probe_png(head)
+    if head.startswith(JPEG_SIGNATURE):
+        return _probe_jpeg(head)
+    if b"<svg" in head:
+        return _probe_svg(head)
+    raise ImageProbeError("Unrecognized image format")
+
+
+def _probe_png(head: bytes) -> ImageInfo:
+    # The IHDR chunk must come first: length, type, width, height
+    if len(head) < 24 or head[12:16] != b"IHDR":
+        raise ImageProbeError("Invalid PNG header")
+
+    width, height = struct.unpack(">II", head[16:24])
+    if not width or not height:
+        raise ImageProbeError("Invalid PNG dimensions")
+    return ImageInfo("png", width, height)
+
+
+def _probe_jpeg(head: bytes) -> ImageInfo:
+    # Walk the marker segments up to the start-of-frame
+    pos = 2
+    while pos + 4 <= len(head):
+        if head[pos] != 0xFF:
+            raise ImageProbeError("Invalid JPEG marker")
+        marker = head[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker in JPEG_STANDALONE_MARKERS:
+            pos += 2
+            continue
+        if marker in (0xD9, 0xDA):  # end of image / start of scan before any frame
+            raise ImageProbeError("JPEG has no frame header")
+
+        (length,) = struct.unpack(">H", head[pos + 2:pos + 4])
+        if length < 2:
+            raise ImageProbeError("Invalid JPEG segment length")
+        if marker in JPEG_SOF_MARKERS:
+            if pos + 9 > len(head):
+                break
+            height, width = struct.unpack(">HH", head[pos + 5:pos + 9])
+            if not width or not height:
+                raise ImageProbeError("Invalid JPEG dimensions")
+            return ImageInfo("jpg", width, height)
+        pos += 2 + length
+
+    raise ImageProbeError("JPEG frame header not found in the first part of the file")
+
+
+def _probe_svg(head: bytes) -> ImageInfo:
+    text = head.decode("utf-8", errors="replace").lstrip("\ufeff")
+
+    # Entity declarations enable "billion laughs" expansion in XML parsers
+    if "<!ENTITY" in text:
+        raise ImageProbeError("SVG entity declarations are not allowed")
+
+    prolog = SVG_PROLOG.match(text)
+    root = SVG_ROOT.match(text, prolog.end())
+    if root is None:
+        raise ImageProbeError("Invalid SVG: the document must start with an <svg> element")
+
+    attributes = dict(re.findall(r'([\w:-]+)\s*=\s*["\']([^"\']*)["\']', root.group(1)))
+    width = _svg_length(attributes.get("width"))
+    height = _svg_length(attributes.get("height"))
+
+    if width is None or height is None:
+        view_box = attributes.get("viewBox", "").replace(",", " ").split()
+        try:
+            if len(view_box) == 4:
+                width, height = round(float(view_box[2])), round(float(view_box[3]))
+        except ValueError:
+            pass
+
+    if not width or not height:
+        return ImageInfo("svg", None, None)
+    return ImageInfo("svg", width, height)
+
+
+def _svg_length(value: Optional[str]) -> Optional[int]:
+    """Absolute length in pixels; relative units (%, em) are ignored"""
+    match = SVG_LENGTH.match(value) if value else None
+    return round(float(match.group(1))) if match else None
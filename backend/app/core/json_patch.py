@@ -0,0 +1,144 @@
+"""
+Minimal JSON Patch (RFC 6902) implementation used for canvas draft deltas.
+
+Operations are applied in place; on error the document may be partially
+modified, so callers that need atomicity must apply patches to a copy they
+can throw away.
+"""
+import copy
+from typing import Any
+
+OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+
+class JsonPatchError(ValueError):
+    """Raised when a patch cannot be applied to a document"""
+
+
+def _parse_pointer(pointer: str) -> list[str]:
+    """Split a JSON Pointer (RFC 6901) into unescaped reference tokens"""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve(doc: Any, tokens: list[str]) -> Any:
+    for token in tokens:
+        if isinstance(doc, dict):
+            if token not in doc:
+                raise JsonPatchError(f"Path not found: {token!r}")
+            doc = doc[token]
+        elif isinstance(doc, list):
+            doc = doc[_index(doc, token)]
+        else:
+            raise JsonPatchError(f"Cannot traverse into a scalar at {token!r}")
+    return doc
+
+
+def _add(doc: Any, tokens: list[str], value: Any) -> Any:
+    if not tokens:
+        return value
+
+    parent = _resolve(doc, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, key, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to a scalar at {key!r}")
+    return doc
+
+
+def _remove(doc: Any, tokens: list[str]) -> Any:
+    """Remove and return the value at tokens"""
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+
+    parent = _resolve(doc, tokens[:-1])
+    key = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: {key!r}")
+        return parent.pop(key)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, key))
+    raise JsonPatchError(f"Cannot remove from a scalar at {key!r}")
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """Equality of JSON values: like ==, except that booleans never equal numbers"""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[key], b[key]) for key in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def apply_patch(doc: Any, operations: list[dict]) -> Any:
+    """
+    Apply JSON Patch operations to a document.
+
+    Args:
+        doc: Parsed JSON document (modified in place)
+        operations: Operations such as {"op": "add", "path": "/layers/0", "value": {...}}
+
+    Returns:
+        The patched document (a new object only if the root was replaced)
+
+    Raises:
+        JsonPatchError: If an operation is malformed or does not apply
+    """
+    for operation in operations:
+        op = operation.get("op")
+        path = operation.get("path")
+        if op not in OPERATIONS or not isinstance(path, str):
+            raise JsonPatchError(f"Invalid operation: {operation!r}")
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JsonPatchError(f"Operation {op!r} requires a value")
+
+        tokens = _parse_pointer(path)
+        if op in ("move", "copy"):
+            source = operation.get("from")
+            if not isinstance(source, str):
+                raise JsonPatchError(f"Operation {op!r} requires 'from'")
+            from_tokens = _parse_pointer(source)
+
+        if op == "add":
+            doc = _add(doc, tokens, operation["value"])
+        elif op == "remove":
+            _remove(doc, tokens)
+        elif op == "replace":
+            if tokens:
+                _remove(doc, tokens)
+            doc = _add(doc, tokens, operation["value"])
+        elif op == "move":
+            if tokens == from_tokens:
+                _resolve(doc, tokens)
+                continue
+            if tokens[:len(from_tokens)] == from_tokens:
+                raise JsonPatchError("Cannot move a value into one of its children")
+            doc = _add(doc, tokens, _remove(doc, from_tokens))
+        elif op == "copy":
+            doc = _add(doc, tokens, copy.deepcopy(_resolve(doc, from_tokens)))
+        elif op == "test":
+            if not _json_equal(_resolve(doc, tokens), operation["value"]):
+                raise JsonPatchError(f"Test failed at {path!r}")
+
+    return doc
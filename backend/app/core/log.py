@@ -0,0 +1,178 @@
+"""
+Structured logging that never blocks the caller.
+
+Records are put on a bounded queue by the calling thread (the event loop or
+a worker thread) and formatted and written by a background writer thread,
+one JSON object per line:
+
+    {"ts": "2026-10-19T21:04:05.123Z", "level": "info", "logger": "app.access",
+     "message": "GET /api/gallery/ 200", "request_id": "9f1c...", "status": 200, ...}
+
+Structured fields are passed with `extra=`. When the queue is full, records
+are dropped and counted in `log_records_dropped_total` rather than waiting
+for the writer. The writer thread is started on first use in each process,
+so it also runs in forked workers and CLI commands.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import traceback
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core import metrics
+from app.core.config import settings
+
+# ID of the request being handled, added to every record logged while handling it
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RECORD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "request_id"}
+
+
+def _fields(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in record.__dict__.items() if key not in _RECORD_ATTRIBUTES}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, with `extra=` fields at the top level"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.request_id:
+            entry["request_id"] = record.request_id
+        entry.update(_fields(record))
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for development: time, level, message, then key=value fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = _fields(record)
+        if record.request_id:
+            fields["request_id"] = record.request_id
+        line = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:<7} {record.getMessage()}"
+        if fields:
+            line += "  " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to the current sys.stdout, which test runners may replace"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _WriterListener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room at shutdown instead of failing on a full queue
+        self.queue.put(self._sentinel)
+
+
+class BackgroundHandler(QueueHandler):
+    """
+    Handler that only enqueues: the message is rendered and the request ID
+    captured in the calling thread, everything else happens in the writer.
+    """
+
+    def __init__(self, target: logging.Handler, maxsize: int):
+        super().__init__(queue.Queue(maxsize))
+        self.target = target
+        self.maxsize = maxsize
+        self.listener: Optional[QueueListener] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = request_id_var.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.LOG_RECORDS_DROPPED.inc()
+
+    def _start(self):
+        """Start the writer thread of this process (after a fork the parent's is gone)"""
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.Queue(self.maxsize)
+            self.listener = _WriterListener(self.queue, self.target)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def flush(self):
+        """Write everything queued so far and stop the writer (it restarts on the next record)"""
+        with self._start_lock:
+            if self.listener is not None and self._pid == os.getpid():
+                self.listener.stop()
+                self.listener = None
+                self._pid = None
+
+
+_handler: Optional[BackgroundHandler] = None
+
+
+def configure():
+    """
+    Route the application's logs (the "app" logger tree) and uvicorn's
+    through the background writer.
+
+    Safe to call more than once; only the first call has an effect.
+    """
+    global _handler
+    if _handler is not None:
+        return
+
+    target = _StdoutHandler()
+    target.setFormatter(JSONFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+    _handler = BackgroundHandler(target, settings.LOG_QUEUE_SIZE)
+
+    level = settings.LOG_LEVEL or ("DEBUG" if settings.DEBUG else "INFO")
+    for name in ("app", "uvicorn", "uvicorn.error"):
+        logger = logging.getLogger(name)
+        logger.handlers = [_handler]
+        logger.setLevel(level)
+        logger.propagate = False
+
+    # Access lines are written by RequestLogMiddleware, with sampling
+    logging.getLogger("uvicorn.access").disabled = True
+
+    atexit.register(shutdown)
+
+
+def shutdown():
+    """Flush queued records; called at application shutdown and process exit"""
+    if _handler is not None:
+        _handler.flush()
@@ -0,0 +1,259 @@
+"""
+Lightweight Prometheus-style metrics.
+
+Metrics live in process memory and are rendered in the Prometheus text
+exposition format by the /metrics endpoint. With several worker processes
+each worker reports its own values; scrape every worker or aggregate by
+instance.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterator
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_registry: list["_Metric"] = []
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, *labels: str):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, *labels: str):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, amount: float = 1, *labels: str):
+        self.inc(-amount, *labels)
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for labels, state in self._values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), state[:-1]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {state[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+def render() -> str:
+    """Render all registered metrics in the Prometheus text format"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ============= Application Metrics =============
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+DB_QUERIES = Counter(
+    "db_queries_total", "SQL statements executed", ("operation",)
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ("operation",), DB_BUCKETS
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled database connection", (), DB_BUCKETS
+)
+THUMBNAIL_DURATION = Histogram(
+    "thumbnail_duration_seconds", "Thumbnail generation time"
+)
+THUMBNAIL_QUEUE_DEPTH = Gauge(
+    "thumbnail_queue_depth", "Thumbnails waiting for or being generated"
+)
+UPLOAD_BYTES = Counter(
+    "upload_bytes_total", "Bytes of artwork files received"
+)
+CONCURRENCY_LIMIT = Gauge(
+    "concurrency_limit", "Current adaptive concurrency limit"
+)
+REQUESTS_SHED = Counter(
+    "requests_shed_total", "Requests rejected by the concurrency limiter", ("group",)
+)
+ORPHAN_FILES_COLLECTED = Counter(
+    "orphan_files_collected_total", "Unreferenced upload files collected", ("action",)
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full"
+)
+ORPHAN_BYTES_RECLAIMED = Counter(
+    "orphan_bytes_reclaimed_total", "Bytes of storage permanently freed by the orphan collector"
+)
+
+
+# ============= SQLAlchemy Instrumentation =============
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    operation = statement_operation(statement)
+    DB_QUERIES.inc(1, operation)
+    DB_QUERY_DURATION.observe(time.perf_counter() - started, operation)
+
+
+def _handle_error(context):
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def statement_operation(statement: str) -> str:
+    """Classify a SQL statement as SELECT/INSERT/UPDATE/DELETE/OTHER"""
+    words = statement.lstrip()[:16].split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in SQL_OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine):
+    """
+    Record SQL statement counts and durations for an engine.
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def timed_pool_class(pool_class):
+    """
+    Subclass a connection pool to record how long checkouts wait.
+
+    Sessions check out a connection when they first run a statement, so
+    requests that never query are not counted.
+
+    Args:
+        pool_class: SQLAlchemy pool class the engine would use
+
+    Returns:
+        Pool class observing DB_POOL_CHECKOUT_WAIT on every checkout
+    """
+    class TimedPool(pool_class):
+        def _do_get(self):
+            with DB_POOL_CHECKOUT_WAIT.time():
+                return super()._do_get()
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
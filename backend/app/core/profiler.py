@@ -0,0 +1,125 @@
+"""
+Opt-in per-request profiler.
+
+While a request is being profiled, every SQL statement issued through the
+engine and every named phase (auth, serialize, ...) is recorded on a
+RequestProfile held in a context variable. Outside profiled requests the
+hooks cost a single context variable lookup.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+MAX_RECORDED_STATEMENTS = 1000
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """Timing breakdown of a single request"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.statements: list[tuple[str, float]] = []
+        self.statement_count = 0
+        self.db_seconds = 0.0
+        self.phases: dict[str, float] = {}
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def record_statement(self, statement: str, seconds: float):
+        self.statement_count += 1
+        self.db_seconds += seconds
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            self.statements.append((statement, seconds))
+
+    def add_phase(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Find identical statements issued at least `threshold` times.
+
+        Statements use bound parameters, so a query run once per row of a
+        previous result (an N+1 pattern) shows up as repeated identical text.
+
+        Returns:
+            List of (statement, count) tuples, most repeated first
+        """
+        counts = Counter(statement for statement, _ in self.statements)
+        return [(statement, count) for statement, count in counts.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        """Render the breakdown as a Server-Timing header value"""
+        total = self.elapsed
+        entries = [f'db;dur={self.db_seconds * 1000:.2f};desc="{self.statement_count} queries"']
+        entries.extend(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items())
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+def start_profile(method: str, path: str):
+    """Start profiling the current request; returns a token for stop_profile"""
+    return _current_profile.set(RequestProfile(method, path))
+
+
+def stop_profile(token):
+    _current_profile.reset(token)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a named phase of the current request, if it is being profiled"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_phase(name, time.perf_counter() - started)
+
+
+# ============= SQLAlchemy Instrumentation =============
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profile_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is not None and conn.info.get("profile_start_time"):
+        profile.record_statement(statement, time.perf_counter() - conn.info["profile_start_time"].pop())
+
+
+def _handle_error(context):
+    conn = context.connection
+    if conn is not None and conn.info.get("profile_start_time"):
+        conn.info["profile_start_time"].pop()
+
+
+def instrument_engine(engine):
+    """
+    Record SQL statements issued during profiled requests.
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
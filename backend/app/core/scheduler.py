@@ -0,0 +1,121 @@
+"""
+Periodic maintenance jobs run inside the API process.
+
+Each job runs in a worker thread with its own database session, so it never
+blocks the event loop. When SCHEDULER_LOCK_FILE is set (the production
+launcher sets it for its workers), only the worker process holding an
+exclusive lock on that file runs the jobs; the others retry every
+SCHEDULER_LOCK_RETRY_SECONDS, so another worker takes over when the holder
+exits or is recycled. With several instances, enable a job on one instance
+only or run the equivalent `python -m app.cli` command from cron instead.
+"""
+import asyncio
+import logging
+import os
+from typing import Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+try:
+    import fcntl
+except ImportError:  # Windows: no gunicorn workers, so no lock is needed
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_LOCK_RETRY_SECONDS = 30
+
+
+def _run_job(job: Callable):
+    db = SessionLocal()
+    try:
+        return job(db)
+    finally:
+        db.close()
+
+
+async def run_periodically(name: str, interval_seconds: float, job: Callable):
+    """
+    Run `job(db)` every `interval_seconds` until cancelled.
+
+    Args:
+        name: Job name used in log lines
+        interval_seconds: Delay between the end of one run and the next
+        job: Callable taking a database session
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            result = await run_in_threadpool(_run_job, job)
+            logger.info("%s finished", name, extra={"job": name, "result": result})
+        except Exception:
+            logger.exception("%s failed", name, extra={"job": name})
+
+
+def start_jobs(jobs: list[tuple[str, float, Callable]]) -> list[asyncio.Task]:
+    """Start (name, interval_seconds, job) jobs; disabled jobs have interval 0"""
+    return [
+        asyncio.create_task(run_periodically(name, interval, job), name=name)
+        for name, interval, job in jobs
+        if interval > 0
+    ]
+
+
+def _try_lock(path: str) -> Optional[int]:
+    """Take the scheduler lock without waiting; returns the open file descriptor holding it"""
+    fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+async def _run_when_elected(jobs: list[tuple[str, float, Callable]], on_elected: Optional[Callable[[], None]]):
+    """Wait for the scheduler lock, then run the jobs until cancelled (closing the file releases the lock)"""
+    while (fd := _try_lock(settings.SCHEDULER_LOCK_FILE)) is None:
+        await asyncio.sleep(SCHEDULER_LOCK_RETRY_SECONDS)
+
+    logger.info("Running maintenance jobs in this worker", extra={"pid": os.getpid()})
+    tasks = []
+    try:
+        if on_elected is not None:
+            on_elected()
+        tasks = start_jobs(jobs)
+        await asyncio.Event().wait()
+    finally:
+        await stop_jobs(tasks)
+        os.close(fd)
+
+
+def start_scheduler(
+    jobs: list[tuple[str, float, Callable]],
+    on_elected: Optional[Callable[[], None]] = None
+) -> list[asyncio.Task]:
+    """
+    Start the jobs in the one worker elected through SCHEDULER_LOCK_FILE,
+    or right away when no lock file is configured.
+
+    Args:
+        jobs: (name, interval_seconds, job) tuples; disabled jobs have interval 0
+        on_elected: Called once when this process starts running the jobs
+
+    Returns:
+        Tasks to pass to stop_jobs at shutdown
+    """
+    if not settings.SCHEDULER_LOCK_FILE or fcntl is None:
+        if on_elected is not None:
+            on_elected()
+        return start_jobs(jobs)
+    return [asyncio.create_task(_run_when_elected(jobs, on_elected), name="Scheduler election")]
+
+
+async def stop_jobs(tasks: list[asyncio.Task]):
+    """Cancel running jobs and wait for them to finish"""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
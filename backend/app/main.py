@@ -1,13 +1,30 @@
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 from starlette.middleware.base import BaseHTTPMiddleware
+import asyncio
+import importlib
+import logging
 import os
 
 from app.core.config import settings
-from app.core.database import init_db
-from app.api.routes import auth, artworks, gallery
+from app.core.database import check_schema, init_db
+from app.core import log, metrics, scheduler
+from app.core.cache import gallery_cache
+from app.api.middleware import (
+    MetricsMiddleware,
+    ProfilerMiddleware,
+    ConcurrencyLimitMiddleware,
+    CompressionMiddleware,
+    IdempotencyMiddleware,
+    RequestLogMiddleware,
+)
+from app.api.routes import auth, artworks, drafts, gallery, uploads
+
+log.configure()
+logger = logging.getLogger("app")
 
 
 class CORSPreflightMiddleware(BaseHTTPMiddleware):
@@ -15,13 +32,13 @@ class CORSPreflightMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         origin = request.headers.get("origin", "*")
 
-        # Log all requests in debug mode
+        # Log all requests in debug mode (queued, written by the log thread)
         if settings.DEBUG:
-            print(f"🔍 {request.method} {request.url.path} - Origin: {origin}")
+            logger.debug("%s %s", request.method, request.url.path, extra={"origin": origin})
 
         if request.method == "OPTIONS":
             if settings.DEBUG:
-                print(f"✅ Handling OPTIONS preflight for {request.url.path}")
+                logger.debug("Handling OPTIONS preflight for %s", request.url.path)
 
             return Response(
                 status_code=200,
@@ -38,27 +55,68 @@ class CORSPreflightMiddleware(BaseHTTPMiddleware):
         return response
 
 
+# Imported lazily by the services that need them
+HEAVY_MODULES = ("numpy", "PIL.Image", "jose.jwt", "passlib.context")
+
+
+def _preload_heavy_modules():
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager for startup and shutdown events.
     """
     # Startup
-    print("🚀 Starting CanvasQuest API...")
+    logger.info("Starting %s", settings.APP_NAME, extra={"version": settings.APP_VERSION})
 
-    # Initialize database
-    init_db()
-    print("✅ Database initialized")
+    # Initialize database (migrations normally run out of band)
+    if settings.DB_AUTO_MIGRATE:
+        init_db()
+        logger.info("Database migrated")
+    else:
+        check_schema()
+        logger.info("Database schema is up to date")
 
     # Ensure upload directories exist
     from app.services import FileService
     FileService.ensure_upload_dir()
-    print("✅ Upload directories created")
+    logger.info("Upload directories created")
+
+    # Warm heavy imports off the event loop so the first upload or login is fast
+    if not settings.LAZY_IMPORTS:
+        asyncio.get_running_loop().run_in_executor(None, _preload_heavy_modules)
+
+    # Static gallery snapshots, rewritten whenever the gallery cache is invalidated
+    from app.api.rendering import render_snapshots
+    from app.services import SnapshotService
+    from app.services.snapshot_service import snapshot_debouncer
+    SnapshotService.set_renderer(render_snapshots)
+    if settings.SNAPSHOTS_ENABLED:
+        gallery_cache.on_invalidate(SnapshotService.schedule)
+        logger.info("Gallery snapshots enabled")
+
+    # Periodic maintenance, in one worker only (the initial snapshot too)
+    from app.services import AuthService, CleanupService, UploadService, SpriteService, IdempotencyService
+    jobs = scheduler.start_scheduler([
+        ("Session purge", settings.SESSION_PURGE_INTERVAL_HOURS * 3600, AuthService.purge_sessions),
+        ("Orphan file collection", settings.GC_INTERVAL_HOURS * 3600, CleanupService.collect_orphan_files),
+        ("Idempotency key purge", settings.IDEMPOTENCY_PURGE_INTERVAL_HOURS * 3600 if settings.IDEMPOTENCY_ENABLED else 0, IdempotencyService.purge_expired),
+        ("Expired upload cleanup", settings.UPLOAD_PURGE_INTERVAL_HOURS * 3600, UploadService.purge_expired),
+        ("Stale sprite cleanup", settings.SPRITE_PURGE_INTERVAL_HOURS * 3600 if settings.GALLERY_SPRITES_ENABLED else 0, SpriteService.purge_stale),
+        ("Gallery snapshots", settings.SNAPSHOT_REFRESH_SECONDS if settings.SNAPSHOTS_ENABLED else 0, SnapshotService.generate),
+    ], on_elected=SnapshotService.schedule)
 
     yield
 
     # Shutdown
-    print("👋 Shutting down CanvasQuest API...")
+    await scheduler.stop_jobs(jobs)
+    snapshot_debouncer.cancel()
+    FileService.shutdown_pool()
+    logger.info("Shutting down %s", settings.APP_NAME)
+    log.shutdown()
 
 
 # Create FastAPI app
@@ -69,6 +127,17 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Shed load when the adaptive concurrency limit is reached (innermost, so
+# 503 responses still get CORS headers and are counted in metrics)
+if settings.CONCURRENCY_LIMIT_ENABLED:
+    app.add_middleware(ConcurrencyLimitMiddleware)
+
+# Answer retried uploads and hearts from stored responses (outside load
+# shedding, so cheap replays are not shed; inside compression, so stored
+# bodies are uncompressed)
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(IdempotencyMiddleware)
+
 # Add CORS preflight middleware FIRST (processes before route handlers)
 app.add_middleware(CORSPreflightMiddleware)
 
@@ -83,6 +152,21 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Compress JSON and text responses
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Opt-in per-request profiling (Server-Timing header, slow request log)
+app.add_middleware(ProfilerMiddleware)
+
+# Record request metrics
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Request IDs and the sampled access log (outermost, so every log line of a
+# request carries its ID and the access log times the whole stack)
+app.add_middleware(RequestLogMiddleware)
+
 # Mount static files for uploads (if directory exists)
 if os.path.exists(settings.UPLOAD_DIR):
     app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
@@ -90,6 +174,8 @@ if os.path.exists(settings.UPLOAD_DIR):
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(artworks.router, prefix="/api")
+app.include_router(drafts.router, prefix="/api")
+app.include_router(uploads.router, prefix="/api")
 app.include_router(gallery.router, prefix="/api")
 
 
@@ -114,11 +200,19 @@ async def health_check():
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """Prometheus metrics endpoint"""
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.DEBUG
+        # Production should use run.py, which starts several workers
+        reload=settings.DEBUG and settings.ENVIRONMENT == "development"
     )
@@ -1,5 +1,8 @@
 from app.models.user import User
 from app.models.artwork import Artwork
 from app.models.session import Session
+from app.models.artwork_color import ArtworkColor
+from app.models.canvas_draft import CanvasDraft, CanvasDraftDelta
+from app.models.idempotency_key import IdempotencyKey
 
-__all__ = ["User", "Artwork", "Session"]
+__all__ = ["User", "Artwork", "Session", "ArtworkColor", "CanvasDraft", "CanvasDraftDelta", "IdempotencyKey"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -23,6 +23,8 @@ class Artwork(Base):
     width = Column(Integer, nullable=True)
     height = Column(Integer, nullable=True)
     canvas_data = Column(Text, nullable=True)  # JSON string of canvas state
+    palette = Column(String(64), nullable=True)  # comma-separated dominant hex colors
+    placeholder = Column(String(64), nullable=True)  # BlurHash shown while the thumbnail loads
 
     # Engagement metrics
     hearts = Column(Integer, default=0)
@@ -41,6 +43,17 @@ class Artwork(Base):
 
     # Relationships
     artist = relationship("User", back_populates="artworks")
+    colors = relationship("ArtworkColor", back_populates="artwork", cascade="all, delete-orphan")
+
+    # Checked by tests/test_query_plans.py
+    __table_args__ = (
+        # Hall of Fame pages and latest artworks: public, newest first
+        Index("ix_artworks_public_created", "is_public", "created_at"),
+        # Featured spotlight
+        Index("ix_artworks_public_featured_created", "is_public", "is_featured", "created_at"),
+        # Artist pages
+        Index("ix_artworks_artist_created", "artist_id", "created_at"),
+    )
 
     def __repr__(self):
         return f"<Artwork(id={self.id}, title='{self.title}', artist_id={self.artist_id})>"
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+
+
+class ArtworkColor(Base):
+    """Quantized dominant color bucket of an artwork, used for color filtering"""
+
+    __tablename__ = "artwork_colors"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Color bucket name (red, blue, ...) and the representative color
+    bucket = Column(String(16), nullable=False)
+    hex_color = Column(String(7), nullable=False)
+    share = Column(Float, nullable=False)  # fraction of pixels in this bucket
+
+    # Foreign keys
+    artwork_id = Column(Integer, ForeignKey("artworks.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Relationships
+    artwork = relationship("Artwork", back_populates="colors")
+
+    __table_args__ = (
+        Index("ix_artwork_colors_bucket_artwork", "bucket", "artwork_id"),
+    )
+
+    def __repr__(self):
+        return f"<ArtworkColor(artwork_id={self.artwork_id}, bucket='{self.bucket}')>"
@@ -0,0 +1,80 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class CanvasDraft(Base):
+    """
+    Work-in-progress canvas, autosaved as an append-only log of deltas.
+
+    The canvas state is `snapshot` (the state at `snapshot_version`) with the
+    deltas after it applied in order. The log is compacted into a new
+    snapshot once it grows large.
+    """
+
+    __tablename__ = "canvas_drafts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String(200), nullable=True)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+
+    # Version of the latest delta; clients send it back as base_version
+    version = Column(Integer, nullable=False, default=0)
+
+    # Compacted state (JSON) and log bookkeeping; the snapshot is only loaded when needed
+    snapshot = deferred(Column(Text, nullable=True))
+    snapshot_version = Column(Integer, nullable=False, default=0)
+    snapshot_bytes = Column(Integer, nullable=False, default=0)
+    log_bytes = Column(Integer, nullable=False, default=0)  # size of the deltas after the snapshot
+
+    # Foreign keys
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    owner = relationship("User")
+    deltas = relationship(
+        "CanvasDraftDelta",
+        back_populates="draft",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="CanvasDraftDelta.version",
+    )
+
+    # Updates include "WHERE version = <old version>"; the service sets the new version
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
+
+    def __repr__(self):
+        return f"<CanvasDraft(id={self.id}, owner_id={self.owner_id}, version={self.version})>"
+
+
+class CanvasDraftDelta(Base):
+    """One autosave of a canvas draft: appended strokes and/or JSON Patch operations"""
+
+    __tablename__ = "canvas_draft_deltas"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)  # compact JSON {"strokes": [...], "ops": [...]}
+
+    # Foreign keys
+    draft_id = Column(Integer, ForeignKey("canvas_drafts.id", ondelete="CASCADE"), nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    draft = relationship("CanvasDraft", back_populates="deltas")
+
+    __table_args__ = (
+        # Replaying the log in order; concurrent writers of the same version conflict here
+        Index("ix_canvas_draft_deltas_draft_version", "draft_id", "version", unique=True),
+    )
+
+    def __repr__(self):
+        return f"<CanvasDraftDelta(draft_id={self.draft_id}, version={self.version})>"
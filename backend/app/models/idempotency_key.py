@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Response of a request sent with an `Idempotency-Key` header.
+
+    The row is inserted before the request is handled, with no status code,
+    so concurrent duplicates see it in flight; the response is stored once
+    the request succeeds. Keys are scoped to the client's credentials.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    id = Column(Integer, primary_key=True)
+    key = Column(String(255), nullable=False)
+    scope = Column(String(64), nullable=False)  # digest of the Authorization header, or "anon-" + digest of the client address
+    endpoint = Column(String(255), nullable=False)  # "POST /api/artworks/upload"
+
+    # Stored response; status_code is NULL while the request is in flight
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    response_body = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    __table_args__ = (
+        # Claiming a key; a concurrent duplicate conflicts here
+        Index("ix_idempotency_keys_scope_key", "scope", "key", unique=True),
+        # Trimming to the newest IDEMPOTENCY_MAX_KEYS keys
+        Index("ix_idempotency_keys_created_at", "created_at", "id"),
+    )
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key={self.key!r}, endpoint={self.endpoint!r}, status_code={self.status_code})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -24,11 +24,16 @@ class Session(Base):
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     last_activity = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="sessions")
 
+    __table_args__ = (
+        # Per-user active session cap and purging of inactive sessions
+        Index("ix_sessions_active_user", "is_active", "user_id"),
+    )
+
     def __repr__(self):
         return f"<Session(id={self.id}, user_id={self.user_id}, is_active={self.is_active})>"
@@ -1,5 +1,14 @@
 from app.services.auth_service import AuthService
 from app.services.artwork_service import ArtworkService
 from app.services.file_service import FileService
+from app.services.color_service import ColorService
+from app.services.placeholder_service import PlaceholderService
+from app.services.backup_service import BackupService
+from app.services.cleanup_service import CleanupService
+from app.services.snapshot_service import SnapshotService
+from app.services.draft_service import DraftService
+from app.services.upload_service import UploadService
+from app.services.sprite_service import SpriteService
+from app.services.idempotency_service import IdempotencyService
 
-__all__ = ["AuthService", "ArtworkService", "FileService"]
+__all__ = ["AuthService", "ArtworkService", "FileService", "ColorService", "PlaceholderService", "BackupService", "CleanupService", "SnapshotService", "DraftService", "UploadService", "SpriteService", "IdempotencyService"]
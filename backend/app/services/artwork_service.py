@@ -1,8 +1,16 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Optional, List, Sequence
+from sqlalchemy import or_
+from sqlalchemy.orm import Query, Session, joinedload, load_only
 from fastapi import HTTPException, status
 
-from app.models import Artwork, User
+from app.core.cache import gallery_cache
+from app.core.events import gallery_events
+from app.core.image_probe import ImageInfo
+from app.models import Artwork, ArtworkColor, User
+from app.services.color_service import ColorService
+from app.services.draft_service import DraftService
+from app.services.file_service import FileService
+from app.services.placeholder_service import PlaceholderService
 
 
 class ArtworkService:
@@ -20,7 +28,9 @@ class ArtworkService:
         width: Optional[int] = None,
         height: Optional[int] = None,
         canvas_data: Optional[str] = None,
-        thumbnail_path: Optional[str] = None
+        thumbnail_path: Optional[str] = None,
+        palette: Optional[list[tuple[str, float]]] = None,
+        placeholder: Optional[str] = None
     ) -> Artwork:
         """
         Create a new artwork entry.
@@ -37,6 +47,8 @@ class ArtworkService:
             height: Optional canvas height
             canvas_data: Optional JSON canvas state
             thumbnail_path: Optional thumbnail path
+            palette: Optional dominant colors as (hex_color, share) tuples
+            placeholder: Optional BlurHash of the thumbnail
 
         Returns:
             Created Artwork object
@@ -51,15 +63,163 @@ class ArtworkService:
             file_size=file_size,
             width=width,
             height=height,
-            canvas_data=canvas_data
+            canvas_data=canvas_data,
+            placeholder=placeholder
         )
 
+        if palette:
+            ArtworkService.apply_palette(artwork, palette)
+
         db.add(artwork)
         db.commit()
         db.refresh(artwork)
 
+        gallery_cache.invalidate()
+        ArtworkService.publish_created(artwork)
+
         return artwork
 
+    @staticmethod
+    def create_from_stored_file(
+        db: Session,
+        artist_id: int,
+        file_path: str,
+        file_size: int,
+        image: ImageInfo,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        canvas_data: Optional[str] = None,
+        draft_id: Optional[int] = None
+    ) -> Artwork:
+        """
+        Create an artwork entry for a file already saved to storage.
+
+        Builds the thumbnail, then extracts the palette and blur placeholder
+        from it. Blocks on image processing, so call it from a worker thread.
+
+        Args:
+            db: Database session
+            artist_id: ID of the artist/user
+            file_path: Storage reference of the saved file
+            file_size: File size in bytes
+            image: Format and dimensions read from the file
+            title: Optional artwork title
+            description: Optional artwork description
+            width: Canvas width, used when the file does not declare one
+            height: Canvas height, used when the file does not declare one
+            canvas_data: Optional JSON canvas state
+            draft_id: Optional draft of the artist's, deleted with the insert
+
+        Returns:
+            Created Artwork object
+        """
+        thumbnail_path = FileService.create_thumbnail(file_path)
+        palette = ColorService.extract_palette_from_file(thumbnail_path)
+        placeholder = PlaceholderService.encode_file(thumbnail_path)
+
+        # Consume the draft in the same transaction as the artwork insert
+        if draft_id is not None:
+            DraftService.discard_draft(db, draft_id, artist_id)
+
+        artwork = ArtworkService.create_artwork(
+            db=db,
+            artist_id=artist_id,
+            file_path=file_path,
+            file_format=image.format,
+            file_size=file_size,
+            title=title,
+            description=description,
+            width=image.width or width,
+            height=image.height or height,
+            canvas_data=canvas_data,
+            thumbnail_path=thumbnail_path,
+            palette=palette,
+            placeholder=placeholder
+        )
+
+        return artwork
+
+    @staticmethod
+    def create_artworks(db: Session, artist_id: int, items: List[dict]) -> List[Artwork]:
+        """
+        Create many artwork entries in a single transaction.
+
+        Args:
+            db: Database session
+            artist_id: ID of the artist/user
+            items: One dict per artwork with the keyword arguments accepted by
+                create_artwork (file_path, file_format, file_size, title, ...)
+
+        Returns:
+            Created Artwork objects, in the order of items
+        """
+        artworks = []
+        for item in items:
+            item = dict(item)
+            palette = item.pop("palette", None)
+
+            artwork = Artwork(artist_id=artist_id, **item)
+            if palette:
+                ArtworkService.apply_palette(artwork, palette)
+            artworks.append(artwork)
+
+        db.add_all(artworks)
+        db.flush()
+        ids = [artwork.id for artwork in artworks]
+        db.commit()
+
+        # Reload server-generated columns with one query instead of a refresh per row
+        loaded = {
+            artwork.id: artwork
+            for artwork in db.query(Artwork).options(joinedload(Artwork.artist)).filter(Artwork.id.in_(ids))
+        }
+        artworks = [loaded[artwork_id] for artwork_id in ids]
+        gallery_cache.invalidate()
+        for artwork in artworks:
+            ArtworkService.publish_created(artwork)
+
+        return artworks
+
+    @staticmethod
+    def publish_created(artwork: Artwork) -> None:
+        """
+        Announce a new public artwork on the gallery stream.
+
+        Args:
+            artwork: Newly created Artwork object
+        """
+        if not artwork.is_public or not gallery_events.subscriber_count:
+            return
+
+        gallery_events.publish("artwork_created", {
+            "id": artwork.id,
+            "title": artwork.title,
+            "file_path": artwork.file_path,
+            "thumbnail_path": artwork.thumbnail_path,
+            "palette": artwork.palette,
+            "placeholder": artwork.placeholder,
+            "artist_id": artwork.artist_id,
+            "artist_name": artwork.artist.artist_name,
+            "created_at": artwork.created_at,
+        })
+
+    @staticmethod
+    def apply_palette(artwork: Artwork, palette: list[tuple[str, float]]) -> None:
+        """
+        Store a dominant color palette on an artwork (does not commit).
+
+        Args:
+            artwork: Artwork object
+            palette: Dominant colors as (hex_color, share) tuples
+        """
+        artwork.palette = ",".join(hex_color for hex_color, _ in palette)
+        artwork.colors = [
+            ArtworkColor(bucket=bucket, hex_color=hex_color, share=share)
+            for bucket, (hex_color, share) in ColorService.palette_buckets(palette).items()
+        ]
+
     @staticmethod
     def get_artwork(db: Session, artwork_id: int) -> Optional[Artwork]:
         """
@@ -82,7 +242,50 @@ class ArtworkService:
         return artwork
 
     @staticmethod
-    def get_artworks_by_artist(db: Session, artist_id: int, skip: int = 0, limit: int = 100) -> List[Artwork]:
+    def get_artworks_by_ids(db: Session, artwork_ids: List[int], viewer_id: Optional[int] = None) -> dict[int, Artwork]:
+        """
+        Get many artworks with their artists and count a view for each one
+        the viewer may see.
+
+        Views are counted with one UPDATE and the artworks are loaded with one
+        IN query afterwards, so the returned rows include the new counts.
+
+        Args:
+            db: Database session
+            artwork_ids: Artwork IDs (without duplicates)
+            viewer_id: ID of the requesting user, if authenticated
+
+        Returns:
+            Dict of Artwork objects by ID; private artworks of other artists
+            are included (without a counted view) so callers can tell them
+            apart from missing ones
+        """
+        if not artwork_ids:
+            return {}
+
+        visible = Artwork.is_public == True
+        if viewer_id is not None:
+            visible = or_(visible, Artwork.artist_id == viewer_id)
+
+        db.query(Artwork).filter(Artwork.id.in_(artwork_ids), visible).update(
+            {Artwork.views: Artwork.views + 1}, synchronize_session=False
+        )
+        db.commit()
+
+        return {
+            artwork.id: artwork
+            for artwork in db.query(Artwork).options(joinedload(Artwork.artist)).filter(Artwork.id.in_(artwork_ids))
+        }
+
+    @staticmethod
+    def get_artworks_by_artist(
+        db: Session,
+        artist_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[str]] = None,
+        artist_columns: Sequence[str] = ()
+    ) -> List[Artwork]:
         """
         Get all artworks by a specific artist.
 
@@ -91,14 +294,25 @@ class ArtworkService:
             artist_id: Artist/User ID
             skip: Number of records to skip
             limit: Maximum number of records to return
+            columns: Artwork columns to load (all if None)
+            artist_columns: User columns to load with a join (none: the artist is not joined)
 
         Returns:
             List of Artwork objects
         """
-        return db.query(Artwork).filter(Artwork.artist_id == artist_id).offset(skip).limit(limit).all()
+        query = ArtworkService._load_columns(db.query(Artwork), columns, artist_columns)
+        return query.filter(Artwork.artist_id == artist_id).offset(skip).limit(limit).all()
 
     @staticmethod
-    def get_gallery_artworks(db: Session, skip: int = 0, limit: int = 100, featured_only: bool = False) -> List[Artwork]:
+    def get_gallery_artworks(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        featured_only: bool = False,
+        color: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        artist_columns: Sequence[str] = ()
+    ) -> List[Artwork]:
         """
         Get artworks for the Hall of Fame gallery.
 
@@ -107,17 +321,39 @@ class ArtworkService:
             skip: Number of records to skip
             limit: Maximum number of records to return
             featured_only: If True, only return featured artworks
+            color: Optional color bucket name or hex color to filter by
+            columns: Artwork columns to load (all if None)
+            artist_columns: User columns to load with a join (none: the artist is not joined)
 
         Returns:
             List of Artwork objects sorted by creation date (newest first)
         """
-        query = db.query(Artwork).filter(Artwork.is_public == True)
+        query = ArtworkService._load_columns(db.query(Artwork), columns, artist_columns)
+        query = query.filter(Artwork.is_public == True)
 
         if featured_only:
             query = query.filter(Artwork.is_featured == True)
 
+        if color:
+            bucket = ColorService.resolve_bucket(color)
+            # EXISTS keeps the walk down the created_at index; IN (...) made SQLite sort every match
+            query = query.filter(
+                db.query(ArtworkColor.id)
+                .filter(ArtworkColor.artwork_id == Artwork.id, ArtworkColor.bucket == bucket)
+                .exists()
+            )
+
         return query.order_by(Artwork.created_at.desc()).offset(skip).limit(limit).all()
 
+    @staticmethod
+    def _load_columns(query: Query, columns: Optional[Sequence[str]], artist_columns: Sequence[str]) -> Query:
+        """Narrow an Artwork query to the given columns, joining the artist only if needed"""
+        if columns is not None:
+            query = query.options(load_only(*(getattr(Artwork, name) for name in columns)))
+        if artist_columns:
+            query = query.options(joinedload(Artwork.artist).load_only(*(getattr(User, name) for name in artist_columns)))
+        return query
+
     @staticmethod
     def add_heart(db: Session, artwork_id: int) -> Artwork:
         """
@@ -145,6 +381,9 @@ class ArtworkService:
         db.commit()
         db.refresh(artwork)
 
+        if artwork.is_public:
+            gallery_events.publish_hearts(artwork.id, artwork.hearts)
+
         return artwork
 
     @staticmethod
@@ -177,7 +416,18 @@ class ArtworkService:
                 detail="Not authorized to delete this artwork"
             )
 
+        was_public = artwork.is_public
+        file_paths = [artwork.file_path, artwork.thumbnail_path]
+
         db.delete(artwork)
         db.commit()
 
+        # Files left behind by a failure here are reclaimed by the orphan collector
+        for path in filter(None, file_paths):
+            FileService.delete_file(path)
+
+        gallery_cache.invalidate()
+        if was_public:
+            gallery_events.publish("artwork_deleted", {"id": artwork_id})
+
         return True
@@ -1,8 +1,10 @@
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.core.config import settings
 from app.models import User, Session as SessionModel
 from app.core.security import create_access_token, verify_password, get_password_hash
 
@@ -85,6 +87,9 @@ class AuthService:
         """
         Create a new session for a user.
 
+        Only the newest MAX_ACTIVE_SESSIONS_PER_USER sessions of a user stay
+        active; older ones are deactivated and later removed by purge_sessions.
+
         Args:
             db: Database session
             user_id: User ID
@@ -94,11 +99,11 @@ class AuthService:
         Returns:
             Tuple of (access_token, session_object)
         """
-        # Create JWT token
-        access_token = create_access_token(data={"sub": str(user_id)})
+        # Create JWT token (the jti keeps tokens issued in the same second unique)
+        access_token = create_access_token(data={"sub": str(user_id), "jti": uuid.uuid4().hex})
 
-        # Calculate expiration (7 days from now)
-        expires_at = datetime.utcnow() + timedelta(days=7)
+        # Calculate expiration (matches the token lifetime)
+        expires_at = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
         # Create session record
         session = SessionModel(
@@ -110,16 +115,70 @@ class AuthService:
         )
 
         db.add(session)
+        db.flush()
+
+        # Deactivate sessions beyond the per-user cap, oldest first
+        stale_ids = [
+            session_id for (session_id,) in db.query(SessionModel.id)
+            .filter(SessionModel.user_id == user_id, SessionModel.is_active == True)
+            .order_by(SessionModel.id.desc())
+            .offset(settings.MAX_ACTIVE_SESSIONS_PER_USER)
+            .all()
+        ]
+        if stale_ids:
+            db.query(SessionModel).filter(SessionModel.id.in_(stale_ids)).update(
+                {SessionModel.is_active: False}, synchronize_session=False
+            )
+
         db.commit()
         db.refresh(session)
 
         return access_token, session
 
+    @staticmethod
+    def purge_sessions(db: Session, batch_size: Optional[int] = None) -> dict[str, int]:
+        """
+        Delete expired and inactive sessions.
+
+        Rows are deleted in small batches, each in its own transaction, so the
+        sessions table is never locked for long.
+
+        Args:
+            db: Database session
+            batch_size: Rows per transaction (defaults to SESSION_PURGE_BATCH_SIZE)
+
+        Returns:
+            Number of deleted "expired" and "inactive" sessions
+        """
+        batch_size = batch_size or settings.SESSION_PURGE_BATCH_SIZE
+        now = datetime.utcnow()
+        counts = {"expired": 0, "inactive": 0}
+
+        conditions = (("expired", SessionModel.expires_at < now), ("inactive", SessionModel.is_active == False))
+        for name, condition in conditions:
+            while True:
+                ids = [session_id for (session_id,) in db.query(SessionModel.id).filter(condition).limit(batch_size).all()]
+                if not ids:
+                    break
+
+                db.query(SessionModel).filter(SessionModel.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+                counts[name] += len(ids)
+
+                if len(ids) < batch_size:
+                    break
+
+        return counts
+
     @staticmethod
     def get_current_user(db: Session, token: str) -> Optional[User]:
         """
         Get current user from JWT token.
 
+        The token must also belong to an active, unexpired session, so
+        logged-out tokens and sessions deactivated by the per-user cap stop
+        working before the JWT itself expires.
+
         Args:
             db: Database session
             token: JWT access token
@@ -138,8 +197,13 @@ class AuthService:
         if not user_id:
             return None
 
-        # Get user from database
-        user = db.query(User).filter(User.id == int(user_id)).first()
+        # Get user from database, through its session (one lookup on the unique token index)
+        user = db.query(User).join(SessionModel, SessionModel.user_id == User.id).filter(
+            SessionModel.session_token == token,
+            SessionModel.is_active == True,
+            SessionModel.expires_at > datetime.utcnow(),
+            User.id == int(user_id)
+        ).first()
         return user
 
     @staticmethod
@@ -0,0 +1,241 @@
+import io
+import json
+import os
+import posixpath
+import tarfile
+import tempfile
+import time
+from datetime import datetime
+from typing import BinaryIO, Optional
+
+from sqlalchemy import DateTime, insert, select, text
+from sqlalchemy.orm import Session
+
+from app import __version__
+from app.core.config import settings
+from app.models import Artwork, ArtworkColor, User
+from app.services.storage_service import StorageError, get_storage
+
+EXPORT_FORMAT_VERSION = 1
+
+# Tables in the order they must be restored (parents first)
+EXPORT_TABLES = (User.__table__, Artwork.__table__, ArtworkColor.__table__)
+
+
+class BackupService:
+    """Service for streaming gallery exports and restores"""
+
+    @staticmethod
+    def export_gallery(db: Session, fileobj: BinaryIO, batch_size: int = 1000) -> dict[str, int]:
+        """
+        Write a gzipped tar snapshot of the gallery to a stream.
+
+        The archive holds `meta.json`, one `<table>.ndjson` manifest per
+        exported table, and the artwork files and thumbnails under `files/`.
+        Rows are read through a server-side cursor inside one transaction and
+        the archive is written in stream mode, so memory use is bounded
+        regardless of gallery size.
+
+        Args:
+            db: Database session
+            fileobj: Writable binary stream (a file or stdout)
+            batch_size: Rows fetched per cursor round trip
+
+        Returns:
+            Mapping of table name -> exported row count, plus "files"
+        """
+        counts: dict[str, int] = {}
+        storage = get_storage()
+
+        if db.get_bind().dialect.name == "postgresql":
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+        with tarfile.open(fileobj=fileobj, mode="w|gz") as archive:
+            meta = {
+                "format_version": EXPORT_FORMAT_VERSION,
+                "app_version": __version__,
+                "exported_at": datetime.utcnow().isoformat(),
+                "tables": [table.name for table in EXPORT_TABLES],
+                "upload_dir": settings.UPLOAD_DIR,
+                "storage_prefix": storage.reference_prefix,
+            }
+            BackupService._add_bytes(archive, "meta.json", json.dumps(meta).encode())
+
+            with tempfile.TemporaryFile() as artworks_manifest:
+                for table in EXPORT_TABLES:
+                    manifest = artworks_manifest if table is Artwork.__table__ else tempfile.TemporaryFile()
+                    try:
+                        counts[table.name] = BackupService._write_manifest(db, table, manifest, batch_size)
+                        BackupService._add_stream(archive, f"{table.name}.ndjson", manifest)
+                    finally:
+                        if manifest is not artworks_manifest:
+                            manifest.close()
+
+                # Stream files referenced by the exported artworks
+                counts["files"] = 0
+                artworks_manifest.seek(0)
+                for line in artworks_manifest:
+                    record = json.loads(line)
+                    for path in (record["file_path"], record["thumbnail_path"]):
+                        key = storage.key_from_reference(path)
+                        if not key:
+                            continue
+                        try:
+                            with storage.open(key) as f:
+                                BackupService._add_stream(archive, f"files/{key}", f)
+                        except StorageError:
+                            continue
+                        counts["files"] += 1
+
+        db.rollback()
+        return counts
+
+    @staticmethod
+    def import_gallery(
+        db: Session,
+        fileobj: BinaryIO,
+        batch_size: int = 1000,
+        restore_files: bool = True
+    ) -> dict[str, int]:
+        """
+        Restore a snapshot written by export_gallery.
+
+        Rows are inserted with batched executemany statements in a single
+        transaction; files are streamed straight from the archive to the
+        configured storage backend. The target tables are expected to be empty.
+
+        Args:
+            db: Database session
+            fileobj: Readable binary stream of the archive
+            batch_size: Rows per insert statement
+            restore_files: Also restore artwork files and thumbnails
+
+        Returns:
+            Mapping of table name -> restored row count, plus "files"
+
+        Raises:
+            ValueError: If the archive is not a gallery export
+        """
+        tables = {table.name: table for table in EXPORT_TABLES}
+        counts: dict[str, int] = {"files": 0}
+        storage = get_storage()
+        source_prefix = storage.reference_prefix
+
+        try:
+            with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+                for member in archive:
+                    if member.name == "meta.json":
+                        meta = json.load(archive.extractfile(member))
+                        if meta.get("format_version") != EXPORT_FORMAT_VERSION:
+                            raise ValueError(f"Unsupported export format: {meta.get('format_version')}")
+                        source_prefix = meta.get("storage_prefix", meta.get("upload_dir", source_prefix))
+
+                    elif member.name.endswith(".ndjson") and member.name[:-7] in tables:
+                        table = tables[member.name[:-7]]
+                        counts[table.name] = BackupService._insert_manifest(
+                            db, table, archive.extractfile(member), batch_size, source_prefix
+                        )
+
+                    elif member.name.startswith("files/") and member.isfile() and restore_files:
+                        key = BackupService._safe_key(member.name[len("files/"):])
+                        if key:
+                            storage.save(key, archive.extractfile(member))
+                            counts["files"] += 1
+
+            if not any(name in counts for name in tables):
+                raise ValueError("Archive does not contain a gallery export")
+
+            BackupService._reset_sequences(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return counts
+
+    @staticmethod
+    def _write_manifest(db: Session, table, manifest: BinaryIO, batch_size: int) -> int:
+        """Write the rows of one table as NDJSON using a server-side cursor"""
+        count = 0
+        rows = db.execute(select(table).order_by(table.c.id).execution_options(yield_per=batch_size))
+        for row in rows.mappings():
+            manifest.write(json.dumps(dict(row), default=BackupService._json_default).encode() + b"\n")
+            count += 1
+
+        return count
+
+    @staticmethod
+    def _insert_manifest(db: Session, table, manifest: BinaryIO, batch_size: int, source_prefix: str) -> int:
+        """Insert the NDJSON rows of one table in batches, rebasing file references"""
+        storage = get_storage()
+        datetime_columns = [c.name for c in table.columns if isinstance(c.type, DateTime)]
+        path_columns = [name for name in ("file_path", "thumbnail_path") if name in table.c]
+
+        count = 0
+        batch = []
+        for line in manifest:
+            row = json.loads(line)
+            for name in datetime_columns:
+                if row.get(name):
+                    row[name] = datetime.fromisoformat(row[name])
+            for name in path_columns:
+                key = storage.key_from_reference(row.get(name), source_prefix)
+                if key:
+                    row[name] = storage.reference(key)
+            batch.append(row)
+
+            if len(batch) >= batch_size:
+                db.execute(insert(table), batch)
+                count += len(batch)
+                batch = []
+
+        if batch:
+            db.execute(insert(table), batch)
+            count += len(batch)
+
+        return count
+
+    @staticmethod
+    def _reset_sequences(db: Session):
+        """Move PostgreSQL id sequences past the restored ids"""
+        if db.get_bind().dialect.name != "postgresql":
+            return
+
+        for table in EXPORT_TABLES:
+            db.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table.name}), 0) + 1, false)"
+            ))
+
+    @staticmethod
+    def _safe_key(relative: str) -> Optional[str]:
+        """Normalize a storage key from an archive, rejecting traversal"""
+        key = posixpath.normpath(relative)
+        if key in (".", "..") or key.startswith("../") or posixpath.isabs(key):
+            return None
+
+        return key
+
+    @staticmethod
+    def _add_bytes(archive: tarfile.TarFile, name: str, data: bytes):
+        """Add an in-memory member to a tar archive"""
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        archive.addfile(info, io.BytesIO(data))
+
+    @staticmethod
+    def _add_stream(archive: tarfile.TarFile, name: str, f: BinaryIO):
+        """Add a seekable file object as a tar member"""
+        info = tarfile.TarInfo(name)
+        info.size = f.seek(0, os.SEEK_END)
+        f.seek(0)
+        info.mtime = int(time.time())
+        archive.addfile(info, f)
+
+    @staticmethod
+    def _json_default(value):
+        """Serialize datetimes in manifests"""
+        if isinstance(value, datetime):
+            return value.isoformat()
+        raise TypeError(f"Cannot serialize {type(value).__name__}")
@@ -0,0 +1,192 @@
+import heapq
+import logging
+import time
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Iterator, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.models import Artwork
+from app.services.storage_service import StorageBackend, get_storage
+
+logger = logging.getLogger(__name__)
+
+# Key prefixes holding files referenced by artworks
+COLLECTED_PREFIXES = ("artworks/", "thumbnails/")
+
+QUARANTINE_PREFIX = "quarantine"
+
+
+class CleanupService:
+    """Service for reclaiming storage that is no longer referenced"""
+
+    @staticmethod
+    def collect_orphan_files(
+        db: Session,
+        grace_hours: Optional[float] = None,
+        quarantine: Optional[bool] = None,
+        dry_run: bool = False,
+        batch_size: int = 1000
+    ) -> dict[str, int]:
+        """
+        Remove upload files that no artwork references.
+
+        The storage listing and the referenced `file_path` / `thumbnail_path`
+        values are both streamed in sorted order and merge-joined, so memory
+        use does not grow with the number of files. Orphans modified within
+        the grace period are kept, since their upload may not be committed
+        yet. Quarantined files are purged after GC_QUARANTINE_RETENTION_DAYS.
+
+        Args:
+            db: Database session
+            grace_hours: Minimum orphan age (defaults to GC_GRACE_PERIOD_HOURS)
+            quarantine: Move orphans to quarantine/ instead of deleting them
+                (defaults to GC_QUARANTINE)
+            dry_run: Only report what would be collected
+            batch_size: References fetched per cursor round trip
+
+        Returns:
+            Counts of scanned, referenced, recent, deleted and quarantined
+            files, plus reclaimed_bytes (permanently freed, including purged
+            quarantine) and quarantined_bytes
+
+        Raises:
+            ValueError: If artworks reference files outside the storage backend
+        """
+        grace_hours = settings.GC_GRACE_PERIOD_HOURS if grace_hours is None else grace_hours
+        quarantine = settings.GC_QUARANTINE if quarantine is None else quarantine
+
+        storage = get_storage()
+        CleanupService._check_references(db, storage)
+
+        stats = {
+            "scanned": 0, "referenced": 0, "recent": 0, "deleted": 0, "quarantined": 0,
+            "purged": 0, "reclaimed_bytes": 0, "quarantined_bytes": 0,
+        }
+        cutoff = time.time() - grace_hours * 3600
+        quarantine_dir = f"{QUARANTINE_PREFIX}/{datetime.utcnow():%Y%m%d}"
+
+        references = CleanupService._referenced_keys(db, storage, batch_size)
+        listing = chain.from_iterable(storage.list(prefix) for prefix in COLLECTED_PREFIXES)
+        reference = next(references, None)
+
+        try:
+            for key, size, modified in listing:
+                stats["scanned"] += 1
+
+                while reference is not None and reference < key:
+                    reference = next(references, None)
+
+                if reference == key:
+                    stats["referenced"] += 1
+                    continue
+                if modified > cutoff:
+                    stats["recent"] += 1
+                    continue
+                if dry_run:
+                    stats["quarantined" if quarantine else "deleted"] += 1
+                    stats["quarantined_bytes" if quarantine else "reclaimed_bytes"] += size
+                    continue
+
+                try:
+                    if quarantine:
+                        storage.move(key, f"{quarantine_dir}/{key}")
+                    elif not storage.delete(key):
+                        continue
+                except Exception as e:
+                    # Removed concurrently, e.g. by another collector
+                    logger.warning("Failed to collect orphan file", extra={"key": key, "error": str(e)})
+                    continue
+
+                action = "quarantined" if quarantine else "deleted"
+                stats[action] += 1
+                stats["quarantined_bytes" if quarantine else "reclaimed_bytes"] += size
+                metrics.ORPHAN_FILES_COLLECTED.inc(1, action)
+                if not quarantine:
+                    metrics.ORPHAN_BYTES_RECLAIMED.inc(size)
+        finally:
+            db.rollback()
+
+        purged, purged_bytes = CleanupService.purge_quarantine(storage, dry_run=dry_run)
+        stats["purged"] = purged
+        stats["reclaimed_bytes"] += purged_bytes
+
+        return stats
+
+    @staticmethod
+    def purge_quarantine(storage: StorageBackend, dry_run: bool = False) -> tuple[int, int]:
+        """
+        Delete quarantined files older than GC_QUARANTINE_RETENTION_DAYS.
+
+        Args:
+            storage: Storage backend
+            dry_run: Only report what would be purged
+
+        Returns:
+            Tuple of (files purged, bytes freed)
+        """
+        expired_before = f"{datetime.utcnow() - timedelta(days=settings.GC_QUARANTINE_RETENTION_DAYS):%Y%m%d}"
+        purged = purged_bytes = 0
+
+        # Keys are quarantine/<YYYYMMDD>/..., so the listing is in date order
+        for key, size, _ in storage.list(f"{QUARANTINE_PREFIX}/"):
+            if key.split("/")[1] >= expired_before:
+                break
+            if dry_run or storage.delete(key):
+                purged += 1
+                purged_bytes += size
+                if not dry_run:
+                    metrics.ORPHAN_BYTES_RECLAIMED.inc(size)
+
+        return purged, purged_bytes
+
+    @staticmethod
+    def _check_references(db: Session, storage: StorageBackend):
+        """Refuse to run while artworks reference files outside the backend"""
+        prefix = storage.reference_prefix + "/"
+        foreign = 0
+        for column in (Artwork.file_path, Artwork.thumbnail_path):
+            foreign += db.query(func.count(Artwork.id)).filter(
+                column.isnot(None), ~column.startswith(prefix, autoescape=True)
+            ).scalar()
+
+        if foreign:
+            raise ValueError(
+                f"{foreign} file references do not start with {prefix}; "
+                f"run `python -m app.cli migrate-storage` first"
+            )
+
+    @staticmethod
+    def _referenced_keys(db: Session, storage: StorageBackend, batch_size: int) -> Iterator[str]:
+        """Stream the distinct keys referenced by artworks in code point order"""
+        prefix_length = len(storage.reference_prefix) + 1
+        streams = []
+        for column in (Artwork.file_path, Artwork.thumbnail_path):
+            rows = db.execute(
+                select(column)
+                .where(column.isnot(None))
+                .order_by(CleanupService._binary_order(db, column))
+                .execution_options(yield_per=batch_size)
+            )
+            streams.append(row[0][prefix_length:] for row in rows)
+
+        last = None
+        for key in heapq.merge(*streams):
+            if key != last:
+                yield key
+                last = key
+
+    @staticmethod
+    def _binary_order(db: Session, column):
+        """Order a string column by code point, matching storage listings"""
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return column.collate("C")
+        if dialect == "mysql":
+            return column.collate("utf8mb4_bin")
+        # SQLite compares text with the BINARY collation by default
+        return column
@@ -0,0 +1,219 @@
+import colorsys
+import logging
+import re
+from typing import TYPE_CHECKING, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+# NumPy and Pillow are imported on first use to keep application startup fast
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Named color buckets that the gallery can be filtered by
+COLOR_BUCKETS = (
+    "red", "orange", "yellow", "green", "teal", "blue",
+    "purple", "pink", "brown", "black", "gray", "white",
+)
+
+HEX_COLOR_RE = re.compile(r"^#?([0-9a-fA-F]{6})$")
+
+
+class ColorService:
+    """Service for extracting and quantizing dominant artwork colors"""
+
+    @staticmethod
+    def extract_palette(img: "Image.Image", size: int = 5, iterations: int = 8) -> list[tuple[str, float]]:
+        """
+        Extract the dominant colors of an image with k-means.
+
+        Expects an already downsampled image (e.g. a thumbnail); it is reduced
+        further to at most 64x64 pixels before clustering.
+
+        Args:
+            img: PIL image
+            size: Number of clusters (palette size)
+            iterations: Number of k-means iterations
+
+        Returns:
+            List of (hex_color, share) tuples sorted by share, largest first
+        """
+        import numpy as np
+        from PIL import Image
+
+        img = img.convert("RGB")
+        img.thumbnail((64, 64), Image.Resampling.BILINEAR)
+
+        pixels = np.asarray(img, dtype=np.float32).reshape(-1, 3)
+        if pixels.size == 0:
+            return []
+
+        k = min(size, len(pixels))
+
+        # Deterministic initialization: evenly spaced pixels ordered by luminance
+        luminance = pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        order = np.argsort(luminance, kind="stable")
+        centers = pixels[order[np.linspace(0, len(order) - 1, k).astype(int)]].copy()
+
+        labels = np.zeros(len(pixels), dtype=np.intp)
+        for _ in range(iterations):
+            distances = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+            labels = distances.argmin(axis=1)
+
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, pixels)
+
+            occupied = counts > 0
+            new_centers = centers.copy()
+            new_centers[occupied] = sums[occupied] / counts[occupied, None]
+
+            if np.allclose(new_centers, centers, atol=0.5):
+                centers = new_centers
+                break
+            centers = new_centers
+
+        counts = np.bincount(labels, minlength=k)
+        shares = counts / counts.sum()
+
+        palette = []
+        for index in np.argsort(-shares, kind="stable"):
+            if counts[index] == 0:
+                continue
+            r, g, b = (int(round(c)) for c in np.clip(centers[index], 0, 255))
+            palette.append((f"#{r:02x}{g:02x}{b:02x}", float(shares[index])))
+
+        return palette
+
+    @staticmethod
+    def extract_palette_from_file(image_path: Optional[str], size: Optional[int] = None) -> list[tuple[str, float]]:
+        """
+        Extract the dominant colors of an image file.
+
+        Args:
+            image_path: Storage reference of the image (ideally the thumbnail)
+            size: Palette size (defaults to settings.PALETTE_SIZE)
+
+        Returns:
+            Palette as returned by extract_palette, or an empty list if the
+            image cannot be read
+        """
+        if not image_path or image_path.lower().endswith(".svg"):
+            return []
+
+        from PIL import Image
+
+        from app.services.file_service import FileService
+
+        try:
+            with FileService.open_file(image_path) as f, Image.open(f) as img:
+                img.draft("RGB", (128, 128))
+                return ColorService.extract_palette(img, size or settings.PALETTE_SIZE)
+        except Exception as e:
+            logger.warning("Failed to extract palette", extra={"path": image_path, "error": str(e)})
+            return []
+
+    @staticmethod
+    def bucket_for_hex(hex_color: str) -> str:
+        """
+        Quantize a color into one of the named COLOR_BUCKETS.
+
+        Args:
+            hex_color: Color as "#rrggbb"
+
+        Returns:
+            Bucket name
+        """
+        value = hex_color.lstrip("#")
+        r, g, b = (int(value[i:i + 2], 16) / 255 for i in (0, 2, 4))
+        h, s, v = colorsys.rgb_to_hsv(r, g, b)
+        hue = h * 360
+
+        if v < 0.2:
+            return "black"
+        if s < 0.15:
+            if v > 0.85:
+                return "white"
+            return "gray"
+
+        if hue < 15 or hue >= 345:
+            bucket = "red"
+        elif hue < 45:
+            bucket = "orange"
+        elif hue < 70:
+            bucket = "yellow"
+        elif hue < 165:
+            bucket = "green"
+        elif hue < 195:
+            bucket = "teal"
+        elif hue < 255:
+            bucket = "blue"
+        elif hue < 290:
+            bucket = "purple"
+        else:
+            bucket = "pink"
+
+        if bucket in ("red", "orange") and v < 0.6:
+            return "brown"
+
+        return bucket
+
+    @staticmethod
+    def palette_buckets(palette: list[tuple[str, float]]) -> dict[str, tuple[str, float]]:
+        """
+        Group a palette into color buckets.
+
+        Buckets whose combined share is below settings.PALETTE_MIN_SHARE are
+        dropped so that specks of color don't match a filter.
+
+        Args:
+            palette: List of (hex_color, share) tuples
+
+        Returns:
+            Mapping of bucket -> (most prominent hex color, combined share)
+        """
+        buckets: dict[str, tuple[str, float]] = {}
+        for hex_color, share in palette:
+            bucket = ColorService.bucket_for_hex(hex_color)
+            if bucket in buckets:
+                representative, total = buckets[bucket]
+                buckets[bucket] = (representative, total + share)
+            else:
+                buckets[bucket] = (hex_color, share)
+
+        return {
+            bucket: (hex_color, round(share, 4))
+            for bucket, (hex_color, share) in buckets.items()
+            if share >= settings.PALETTE_MIN_SHARE
+        }
+
+    @staticmethod
+    def resolve_bucket(color: str) -> str:
+        """
+        Resolve a color filter value to a bucket name.
+
+        Args:
+            color: Bucket name (e.g. "blue") or hex color (e.g. "#1e90ff")
+
+        Returns:
+            Bucket name
+
+        Raises:
+            HTTPException: If the color is not recognized
+        """
+        value = color.strip().lower()
+
+        if value in COLOR_BUCKETS:
+            return value
+
+        match = HEX_COLOR_RE.match(value)
+        if match:
+            return ColorService.bucket_for_hex(match.group(1))
+
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown color '{color}'. Use a hex color or one of: {', '.join(COLOR_BUCKETS)}"
+        )
@@ -0,0 +1,453 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.json_patch import JsonPatchError, apply_patch
+from app.models import CanvasDraft, CanvasDraftDelta
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _identity(draft: CanvasDraft) -> tuple:
+    """
+    Attributes that never change for the lifetime of a draft row. The ID
+    alone is not enough: a deleted draft's ID can be reused (SQLite hands out
+    the highest rowid again), and other workers still cache its state.
+    """
+    return draft.owner_id, draft.created_at
+
+
+class _CachedState:
+    __slots__ = ("identity", "version", "state", "serialized")
+
+    def __init__(self, identity: tuple, version: int, state: Any, serialized: Optional[str]):
+        self.identity = identity
+        self.version = version
+        self.state = state
+        self.serialized = serialized
+
+    def matches(self, draft: CanvasDraft, version: int) -> bool:
+        return self.version == version and self.identity == _identity(draft)
+
+
+class DraftStateCache:
+    """
+    Materialized canvas states of recently used drafts (per worker).
+
+    A patch takes the state out of the cache, applies the delta in place and
+    puts it back only once the delta is committed, so a failed patch never
+    leaves a half-applied state behind and readers never see one mid-update.
+    Entries are checked against the draft's owner and creation time, so a
+    draft reusing a deleted draft's ID never gets its state.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, _CachedState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, draft: CanvasDraft, version: int) -> Optional[Any]:
+        """Remove and return the state at `version`, or None if not cached"""
+        with self._lock:
+            entry = self._entries.pop(draft.id, None)
+        return entry.state if entry is not None and entry.matches(draft, version) else None
+
+    def put(self, draft: CanvasDraft, version: int, state: Any, serialized: Optional[str] = None):
+        with self._lock:
+            self._entries[draft.id] = _CachedState(_identity(draft), version, state, serialized)
+            self._entries.move_to_end(draft.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def serialized(self, draft: CanvasDraft, version: int) -> Optional[str]:
+        """JSON of the state at `version`, or None if not cached"""
+        with self._lock:
+            entry = self._entries.get(draft.id)
+            if entry is None or not entry.matches(draft, version):
+                return None
+            if entry.serialized is None:
+                entry.serialized = _dumps(entry.state)
+            self._entries.move_to_end(draft.id)
+            return entry.serialized
+
+    def discard(self, draft_id: int):
+        with self._lock:
+            self._entries.pop(draft_id, None)
+
+
+draft_states = DraftStateCache(settings.DRAFT_STATE_CACHE_SIZE)
+
+
+class DraftService:
+    """Service for autosaved canvas drafts stored as a snapshot plus a delta log"""
+
+    @staticmethod
+    def create_draft(
+        db: Session,
+        owner_id: int,
+        title: Optional[str] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        canvas_data: Optional[str] = None
+    ) -> CanvasDraft:
+        """
+        Create a new draft.
+
+        Args:
+            db: Database session
+            owner_id: ID of the user drawing the canvas
+            title: Optional title
+            width: Optional canvas width
+            height: Optional canvas height
+            canvas_data: Optional initial canvas state as a JSON string
+
+        Returns:
+            Created CanvasDraft object
+
+        Raises:
+            HTTPException: If the user has too many drafts or canvas_data is invalid
+        """
+        if db.query(CanvasDraft).filter(CanvasDraft.owner_id == owner_id).count() >= settings.MAX_DRAFTS_PER_USER:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many drafts. Maximum per user: {settings.MAX_DRAFTS_PER_USER}"
+            )
+
+        try:
+            state = json.loads(canvas_data) if canvas_data else {}
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="canvas_data must be valid JSON"
+            )
+
+        snapshot = _dumps(state)
+        DraftService._check_state_size(snapshot)
+
+        draft = CanvasDraft(
+            owner_id=owner_id,
+            title=title,
+            width=width,
+            height=height,
+            version=0,
+            snapshot=snapshot,
+            snapshot_version=0,
+            snapshot_bytes=len(snapshot),
+            log_bytes=0
+        )
+        db.add(draft)
+        db.commit()
+        db.refresh(draft)
+
+        draft_states.put(draft, 0, state, snapshot)
+        return draft
+
+    @staticmethod
+    def list_drafts(db: Session, owner_id: int) -> List[CanvasDraft]:
+        """
+        Get a user's drafts, most recently created first.
+
+        Args:
+            db: Database session
+            owner_id: User ID
+
+        Returns:
+            List of CanvasDraft objects (snapshots are not loaded)
+        """
+        return db.query(CanvasDraft).filter(CanvasDraft.owner_id == owner_id).order_by(CanvasDraft.id.desc()).all()
+
+    @staticmethod
+    def get_draft(db: Session, draft_id: int, owner_id: int, for_update: bool = False) -> CanvasDraft:
+        """
+        Get a draft owned by a user.
+
+        Args:
+            db: Database session
+            draft_id: Draft ID
+            owner_id: ID of the requesting user
+            for_update: Lock the row until the transaction ends
+
+        Returns:
+            CanvasDraft object
+
+        Raises:
+            HTTPException: If the draft does not exist or belongs to someone else
+        """
+        query = db.query(CanvasDraft).filter(CanvasDraft.id == draft_id)
+        if for_update:
+            query = query.with_for_update()
+        draft = query.first()
+
+        if not draft:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Draft not found"
+            )
+
+        if draft.owner_id != owner_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this draft"
+            )
+
+        return draft
+
+    @staticmethod
+    def get_canvas_data(db: Session, draft: CanvasDraft) -> str:
+        """
+        Get the latest canvas state of a draft.
+
+        Served from memory when the draft was used recently; otherwise the
+        snapshot is loaded and the (at most DRAFT_COMPACT_MAX_DELTAS) deltas
+        after it are replayed.
+
+        Args:
+            db: Database session
+            draft: CanvasDraft object
+
+        Returns:
+            Canvas state as a JSON string
+        """
+        serialized = draft_states.serialized(draft, draft.version)
+        if serialized is None:
+            state = DraftService._materialize(db, draft)
+            serialized = _dumps(state)
+            draft_states.put(draft, draft.version, state, serialized)
+        return serialized
+
+    @staticmethod
+    def apply_patch(
+        db: Session,
+        draft_id: int,
+        owner_id: int,
+        base_version: int,
+        strokes: Optional[list] = None,
+        ops: Optional[list[dict]] = None
+    ) -> tuple[CanvasDraft, bool]:
+        """
+        Append a delta to a draft.
+
+        Args:
+            db: Database session
+            draft_id: Draft ID
+            owner_id: ID of the requesting user
+            base_version: Version the client's changes are based on
+            strokes: Strokes appended to the state's "strokes" list
+            ops: JSON Patch operations applied after the strokes
+
+        Returns:
+            Tuple of (updated CanvasDraft, whether the log was compacted)
+
+        Raises:
+            HTTPException: If the draft changed since base_version (409), the
+                patch does not apply (422) or the canvas grows too large (413)
+        """
+        payload = {}
+        if strokes:
+            payload["strokes"] = strokes
+        if ops:
+            payload["ops"] = ops
+        if not payload:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Patch must contain strokes or ops"
+            )
+        encoded = _dumps(payload)
+
+        if len(encoded) > settings.DRAFT_MAX_PATCH_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Patch too large. Maximum size: {settings.DRAFT_MAX_PATCH_BYTES} bytes"
+            )
+
+        draft = DraftService.get_draft(db, draft_id, owner_id, for_update=True)
+        DraftService._check_version(draft, base_version)
+
+        # The state is owned by this request until it is put back after commit
+        state = draft_states.take(draft, draft.version)
+        if state is None:
+            state = DraftService._materialize(db, draft)
+
+        try:
+            state = DraftService._apply_delta(state, payload)
+        except JsonPatchError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Patch does not apply: {e}"
+            )
+
+        # The UPDATE only matches while the row is still at base_version
+        # (version_id_col), so concurrent writers cannot both succeed
+        version = draft.version + 1
+        draft.version = version
+
+        snapshot = None
+        if DraftService._compaction_due(draft, len(encoded)):
+            # Fold the log and this delta into a new snapshot
+            snapshot = _dumps(state)
+            DraftService._check_state_size(snapshot)
+
+            db.query(CanvasDraftDelta).filter(
+                CanvasDraftDelta.draft_id == draft.id,
+                CanvasDraftDelta.version < version
+            ).delete(synchronize_session=False)
+            draft.snapshot = snapshot
+            draft.snapshot_version = version
+            draft.snapshot_bytes = len(snapshot)
+            draft.log_bytes = 0
+        else:
+            db.add(CanvasDraftDelta(draft_id=draft.id, version=version, payload=encoded))
+            draft.log_bytes += len(encoded)
+
+        try:
+            db.commit()
+        except (IntegrityError, StaleDataError):
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Draft was modified concurrently, reload it and retry"
+            )
+        db.refresh(draft)
+
+        draft_states.put(draft, version, state, snapshot)
+        return draft, snapshot is not None
+
+    @staticmethod
+    def get_deltas(db: Session, draft: CanvasDraft, since: int) -> List[dict]:
+        """
+        Get the deltas after a version, for clients that hold an older state.
+
+        Args:
+            db: Database session
+            draft: CanvasDraft object
+            since: Version the client has
+
+        Returns:
+            List of {"version", "strokes", "ops"} dicts in version order
+
+        Raises:
+            HTTPException: If the deltas were already compacted away (410)
+        """
+        if since < draft.snapshot_version:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Deltas were compacted, fetch the full draft instead"
+            )
+
+        deltas = db.query(CanvasDraftDelta).filter(
+            CanvasDraftDelta.draft_id == draft.id,
+            CanvasDraftDelta.version > since
+        ).order_by(CanvasDraftDelta.version).all()
+
+        return [{"version": delta.version, **json.loads(delta.payload)} for delta in deltas]
+
+    @staticmethod
+    def delete_draft(db: Session, draft_id: int, owner_id: int) -> bool:
+        """
+        Delete a draft and its delta log.
+
+        Args:
+            db: Database session
+            draft_id: Draft ID
+            owner_id: ID of the requesting user
+
+        Returns:
+            True if successful
+
+        Raises:
+            HTTPException: If the draft does not exist or belongs to someone else
+        """
+        draft = DraftService.get_draft(db, draft_id, owner_id)
+
+        db.query(CanvasDraftDelta).filter(CanvasDraftDelta.draft_id == draft.id).delete(synchronize_session=False)
+        db.delete(draft)
+        db.commit()
+
+        draft_states.discard(draft_id)
+        return True
+
+    @staticmethod
+    def discard_draft(db: Session, draft_id: int, owner_id: int) -> bool:
+        """
+        Delete a draft and its delta log as part of the caller's transaction.
+
+        Unlike delete_draft this does not commit, and a draft that is already
+        gone (e.g. consumed by a concurrent request) is not an error.
+
+        Args:
+            db: Database session
+            draft_id: Draft ID
+            owner_id: ID of the requesting user
+
+        Returns:
+            True if the draft was deleted
+        """
+        owned = select(CanvasDraft.id).where(CanvasDraft.id == draft_id, CanvasDraft.owner_id == owner_id)
+        db.query(CanvasDraftDelta).filter(CanvasDraftDelta.draft_id.in_(owned)).delete(synchronize_session=False)
+        deleted = db.query(CanvasDraft).filter(
+            CanvasDraft.id == draft_id, CanvasDraft.owner_id == owner_id
+        ).delete(synchronize_session=False)
+
+        draft_states.discard(draft_id)
+        return bool(deleted)
+
+    @staticmethod
+    def _materialize(db: Session, draft: CanvasDraft) -> Any:
+        """Rebuild the state from the snapshot and the deltas after it"""
+        state = json.loads(draft.snapshot) if draft.snapshot else {}
+
+        deltas = db.query(CanvasDraftDelta.payload).filter(
+            CanvasDraftDelta.draft_id == draft.id,
+            CanvasDraftDelta.version > draft.snapshot_version
+        ).order_by(CanvasDraftDelta.version)
+
+        for (payload,) in deltas:
+            state = DraftService._apply_delta(state, json.loads(payload))
+        return state
+
+    @staticmethod
+    def _apply_delta(state: Any, payload: dict) -> Any:
+        strokes = payload.get("strokes")
+        if strokes:
+            if not isinstance(state, dict) or not isinstance(state.setdefault("strokes", []), list):
+                raise JsonPatchError("Canvas state has no 'strokes' list to append to")
+            state["strokes"].extend(strokes)
+
+        ops = payload.get("ops")
+        if ops:
+            state = apply_patch(state, ops)
+        return state
+
+    @staticmethod
+    def _compaction_due(draft: CanvasDraft, delta_bytes: int) -> bool:
+        # Replaying the log should never cost much more than loading a snapshot
+        return (
+            draft.version - draft.snapshot_version >= settings.DRAFT_COMPACT_MAX_DELTAS
+            or draft.log_bytes + delta_bytes >= max(draft.snapshot_bytes, settings.DRAFT_COMPACT_MIN_BYTES)
+        )
+
+    @staticmethod
+    def _check_version(draft: CanvasDraft, base_version: int):
+        if base_version != draft.version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Draft is at version {draft.version}, not {base_version}; reload it and retry",
+                headers={"X-Draft-Version": str(draft.version)}
+            )
+
+    @staticmethod
+    def _check_state_size(snapshot: str):
+        if len(snapshot) > settings.DRAFT_MAX_STATE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Canvas too large. Maximum size: {settings.DRAFT_MAX_STATE_BYTES} bytes"
+            )
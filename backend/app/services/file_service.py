@@ -1,11 +1,42 @@
+import logging
+import multiprocessing
 import os
+import threading
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 from fastapi import UploadFile, HTTPException, status
-from PIL import Image
 
 from app.core.config import settings
+from app.core import metrics
+from app.core.image_probe import PROBE_BYTES, ImageInfo, ImageProbeError, probe_image
+from app.services.storage_service import LocalStorage, StorageError, get_storage
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Image format (as reported by the probe) -> accepted file extensions
+FORMAT_EXTENSIONS = {"png": (".png",), "jpg": (".jpg", ".jpeg"), "svg": (".svg",)}
+
+# Image processing pool shared by all batch uploads of this process
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _pillow_image():
+    """Import PIL.Image, capping the pixels it decodes (once per process)"""
+    from PIL import Image
+
+    # Uploads are probed, but files stored earlier may not have been
+    Image.MAX_IMAGE_PIXELS = settings.MAX_IMAGE_PIXELS
+    return Image
 
 
 class FileService:
@@ -15,8 +46,6 @@ class FileService:
     def ensure_upload_dir():
         """Ensure upload directory exists"""
         Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
-        Path(f"{settings.UPLOAD_DIR}/artworks").mkdir(parents=True, exist_ok=True)
-        Path(f"{settings.UPLOAD_DIR}/thumbnails").mkdir(parents=True, exist_ok=True)
 
     @staticmethod
     def validate_file(file: UploadFile) -> tuple[str, str]:
@@ -51,50 +80,103 @@ class FileService:
         return file_ext, file.content_type or "application/octet-stream"
 
     @staticmethod
-    async def save_artwork_file(file: UploadFile) -> tuple[str, int, str]:
+    def check_image(head: bytes, file_ext: str) -> tuple[ImageInfo, str]:
         """
-        Save an artwork file to disk.
+        Check the content of an upload from its first bytes.
 
         Args:
-            file: Uploaded file object
+            head: First PROBE_BYTES of the file (or the whole file if smaller)
+            file_ext: Extension of the uploaded file name
 
         Returns:
-            Tuple of (file_path, file_size, file_format)
+            Tuple of (image_info, file_ext); the extension is corrected when
+            the content is a different allowed format than the name says
 
         Raises:
-            HTTPException: If file is invalid or save fails
+            HTTPException: If the content is not an allowed image or has too
+                many pixels
         """
-        FileService.ensure_upload_dir()
-
-        # Validate file
-        file_ext, _ = FileService.validate_file(file)
-
-        # Generate unique filename
-        unique_filename = f"{uuid.uuid4()}{file_ext}"
-        file_path = f"{settings.UPLOAD_DIR}/artworks/{unique_filename}"
+        try:
+            info = probe_image(head)
+        except ImageProbeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid image file: {str(e)}"
+            )
 
-        # Read file content
-        content = await file.read()
-        file_size = len(content)
+        extensions = FORMAT_EXTENSIONS[info.format]
+        if file_ext not in extensions:
+            file_ext = extensions[0]
+        if file_ext not in settings.ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File type {file_ext} not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
+            )
 
-        # Check file size
-        if file_size > settings.MAX_UPLOAD_SIZE:
+        # SVGs are never rasterized here, so only raster images can be bombs
+        if info.format != "svg" and info.pixels > settings.MAX_IMAGE_PIXELS:
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+                detail=f"Image too large: {info.width}x{info.height} pixels. Maximum: {settings.MAX_IMAGE_PIXELS} pixels"
             )
 
-        # Save file
+        return info, file_ext
+
+    @staticmethod
+    async def save_artwork_file(file: UploadFile) -> tuple[str, int, ImageInfo]:
+        """
+        Save an artwork file to the configured storage backend.
+
+        The file's header is checked before anything is stored.
+
+        Args:
+            file: Uploaded file object
+
+        Returns:
+            Tuple of (file_path, file_size, image_info), where file_path is
+            the storage reference saved on the artwork and image_info holds
+            the format and dimensions read from the file
+
+        Raises:
+            HTTPException: If file is invalid or save fails
+        """
+        # Validate file name and content
+        file_ext, _ = FileService.validate_file(file)
+        head = await file.read(PROBE_BYTES)
+        info, file_ext = FileService.check_image(head, file_ext)
+
+        # Generate unique filename
+        storage = get_storage()
+        key = storage.shard_key("artworks", f"{uuid.uuid4()}{file_ext}")
+
+        # Stream file content to storage in chunks; nothing is stored on error
+        file_size = 0
+        chunk = head
         try:
-            with open(file_path, "wb") as f:
-                f.write(content)
+            with storage.writer(key) as f:
+                while chunk:
+                    file_size += len(chunk)
+
+                    # Check file size
+                    if file_size > settings.MAX_UPLOAD_SIZE:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB"
+                        )
+
+                    f.write(chunk)
+                    chunk = await file.read(UPLOAD_CHUNK_SIZE)
+
+            metrics.UPLOAD_BYTES.inc(file_size)
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to save file: {str(e)}"
             )
 
-        return file_path, file_size, file_ext.lstrip('.')
+        return storage.reference(key), file_size, info
 
     @staticmethod
     def create_thumbnail(source_path: str, max_size: tuple[int, int] = (300, 300)) -> Optional[str]:
@@ -102,21 +184,31 @@ class FileService:
         Create a thumbnail from an image file.
 
         Args:
-            source_path: Path to source image
+            source_path: Storage reference of the source image
             max_size: Maximum thumbnail dimensions (width, height)
 
         Returns:
-            Path to thumbnail file or None if failed
+            Storage reference of the thumbnail or None if failed
         """
+        metrics.THUMBNAIL_QUEUE_DEPTH.inc()
         try:
-            FileService.ensure_upload_dir()
+            with metrics.THUMBNAIL_DURATION.time():
+                return FileService._create_thumbnail(source_path, max_size)
+        finally:
+            metrics.THUMBNAIL_QUEUE_DEPTH.dec()
+
+    @staticmethod
+    def _create_thumbnail(source_path: str, max_size: tuple[int, int]) -> Optional[str]:
+        """Create a thumbnail (see create_thumbnail)"""
+        Image = _pillow_image()
 
+        try:
             # Skip SVG files (can't create thumbnails easily)
             if source_path.lower().endswith('.svg'):
                 return None
 
             # Open image
-            with Image.open(source_path) as img:
+            with FileService.open_file(source_path) as source, Image.open(source) as img:
                 # Convert RGBA to RGB if necessary
                 if img.mode in ('RGBA', 'LA', 'P'):
                     background = Image.new('RGB', img.size, (255, 255, 255))
@@ -129,34 +221,149 @@ class FileService:
                 img.thumbnail(max_size, Image.Resampling.LANCZOS)
 
                 # Generate thumbnail filename
+                storage = get_storage()
                 source_filename = os.path.basename(source_path)
-                thumb_filename = f"thumb_{os.path.splitext(source_filename)[0]}.jpg"
-                thumb_path = f"{settings.UPLOAD_DIR}/thumbnails/{thumb_filename}"
+                thumb_key = storage.shard_key("thumbnails", FileService.thumbnail_filename(source_filename))
 
                 # Save thumbnail
-                img.save(thumb_path, "JPEG", quality=85)
+                with storage.writer(thumb_key) as f:
+                    img.save(f, "JPEG", quality=85)
 
-                return thumb_path
+                return storage.reference(thumb_key)
 
         except Exception as e:
-            print(f"Failed to create thumbnail: {e}")
+            logger.warning("Failed to create thumbnail", extra={"path": source_path, "error": str(e)})
             return None
 
+    @staticmethod
+    def process_images(source_paths: list[str]) -> list[tuple[Optional[str], list[tuple[str, float]], Optional[str]]]:
+        """
+        Create thumbnails, extract palettes and compute placeholders for many
+        images in parallel.
+
+        Args:
+            source_paths: Storage references of source images
+
+        Returns:
+            List of (thumbnail_path, palette, placeholder) tuples in the order
+            of source_paths
+        """
+        if len(source_paths) <= 1:
+            from app.services.color_service import ColorService
+            from app.services.placeholder_service import PlaceholderService
+
+            thumbnail_paths = [FileService.create_thumbnail(path) for path in source_paths]
+            return [
+                (path, ColorService.extract_palette_from_file(path), PlaceholderService.encode_file(path))
+                for path in thumbnail_paths
+            ]
+
+        # Thumbnails are built in worker processes, so record their metrics here
+        metrics.THUMBNAIL_QUEUE_DEPTH.inc(len(source_paths))
+        results = []
+        try:
+            pool = FileService._get_pool()
+            for thumbnail_path, palette, placeholder, seconds in pool.map(_process_image, source_paths):
+                metrics.THUMBNAIL_DURATION.observe(seconds)
+                metrics.THUMBNAIL_QUEUE_DEPTH.dec()
+                results.append((thumbnail_path, palette, placeholder))
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory): start a new pool for the next batch
+            FileService.shutdown_pool()
+            raise
+        finally:
+            metrics.THUMBNAIL_QUEUE_DEPTH.dec(len(source_paths) - len(results))
+
+        return results
+
+    @staticmethod
+    def _get_pool() -> ProcessPoolExecutor:
+        """
+        The image processing pool of this process, created on first use.
+
+        Its IMAGE_WORKERS processes are shared by concurrent batch uploads,
+        which queue for them instead of starting processes of their own. They
+        are started by a fork server where available, never forked from a
+        request thread of this (multi-threaded) process.
+        """
+        global _pool, _pool_pid
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.IMAGE_WORKERS or os.cpu_count() or 1,
+                    mp_context=context
+                )
+                _pool_pid = os.getpid()
+            return _pool
+
+    @staticmethod
+    def shutdown_pool():
+        """Stop the image processing pool (at application shutdown); it restarts on next use"""
+        global _pool
+        with _pool_lock:
+            if _pool is not None and _pool_pid == os.getpid():
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+    @staticmethod
+    def thumbnail_filename(source_filename: str) -> str:
+        """File name of the thumbnail of an artwork file"""
+        return f"thumb_{os.path.splitext(source_filename)[0]}.jpg"
+
+    @staticmethod
+    def open_file(file_path: str) -> BinaryIO:
+        """
+        Open a stored file for reading.
+
+        Args:
+            file_path: Storage reference (artwork file_path or thumbnail_path)
+
+        Returns:
+            Binary file object
+
+        Raises:
+            StorageError: If the file does not exist
+        """
+        storage = get_storage()
+        key = storage.key_from_reference(file_path)
+        if key is None:
+            # Files stored before the current backend was configured
+            if not isinstance(storage, LocalStorage) and os.path.isfile(file_path):
+                return open(file_path, "rb")
+            raise StorageError(f"File not found: {file_path}")
+        return storage.open(key)
+
     @staticmethod
     def delete_file(file_path: str) -> bool:
         """
-        Delete a file from disk.
+        Delete a file from storage.
 
         Args:
-            file_path: Path to file to delete
+            file_path: Storage reference of the file to delete
 
         Returns:
             True if successful, False otherwise
         """
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+        storage = get_storage()
+        key = storage.key_from_reference(file_path)
+        if key is None:
             return True
-        except Exception as e:
-            print(f"Failed to delete file: {e}")
-            return False
+        return storage.delete(key)
+
+
+def _process_image(source_path: str) -> tuple[Optional[str], list[tuple[str, float]], Optional[str], float]:
+    """Worker: create the thumbnail of an image, then its palette and placeholder"""
+    from app.services.color_service import ColorService
+    from app.services.placeholder_service import PlaceholderService
+
+    started = time.perf_counter()
+    thumbnail_path = FileService._create_thumbnail(source_path, (300, 300))
+    seconds = time.perf_counter() - started
+    return (
+        thumbnail_path,
+        ColorService.extract_palette_from_file(thumbnail_path),
+        PlaceholderService.encode_file(thumbnail_path),
+        seconds,
+    )
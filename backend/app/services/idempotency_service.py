@@ -0,0 +1,171 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import IdempotencyKey
+
+
+class IdempotencyService:
+    """Service storing responses of requests sent with an Idempotency-Key header"""
+
+    @staticmethod
+    def scope_for(authorization: Optional[str], client_host: Optional[str] = None) -> str:
+        """
+        Scope of a client's keys: a digest of its credentials, so one client
+        can never replay another's responses.
+
+        Anonymous requests are scoped to the client address instead. Clients
+        behind one NAT or proxy (without proxy headers) share that scope, so
+        they must still send random keys.
+
+        Args:
+            authorization: Authorization header of the request, if any
+            client_host: Client address, for anonymous requests
+
+        Returns:
+            Scope string
+        """
+        if not authorization:
+            return "anon-" + hashlib.sha256((client_host or "").encode()).hexdigest()[:32]
+        return hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def claim(db: Session, scope: str, key: str, endpoint: str) -> Optional[IdempotencyKey]:
+        """
+        Claim a key before handling its request.
+
+        A key whose request never finished (the worker crashed) is taken over
+        once its IDEMPOTENCY_LOCK_SECONDS have passed, as is an expired one.
+        The key is looked up first, so replays and waiting duplicates cost one
+        SELECT; only an absent key is inserted.
+
+        Args:
+            db: Database session
+            scope: Scope of the client (see scope_for)
+            key: Idempotency-Key header value
+            endpoint: Method and path of the request
+
+        Returns:
+            None if the key was claimed, otherwise the existing record: a
+            stored response, or a request still in flight
+        """
+        query = db.query(IdempotencyKey).filter(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+
+        for _ in range(3):
+            # Expiry is compared by the database (stored datetimes may be naive or aware)
+            row = db.query(IdempotencyKey, IdempotencyKey.expires_at > datetime.utcnow()).filter(
+                IdempotencyKey.scope == scope, IdempotencyKey.key == key
+            ).first()
+            if row is not None:
+                existing, live = row
+                if live:
+                    return existing
+
+                # Take over an expired key (unless another request just did)
+                query.filter(IdempotencyKey.expires_at < datetime.utcnow()).delete(synchronize_session=False)
+                db.commit()
+
+            db.add(IdempotencyKey(
+                key=key,
+                scope=scope,
+                endpoint=endpoint,
+                expires_at=datetime.utcnow() + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+            ))
+            try:
+                db.commit()
+                return None
+            except IntegrityError:
+                # A concurrent request claimed it first
+                db.rollback()
+
+        return query.first()
+
+    @staticmethod
+    def complete(db: Session, scope: str, key: str, status_code: int, content_type: Optional[str], body: bytes):
+        """
+        Store the response of a claimed key for IDEMPOTENCY_KEY_TTL_HOURS.
+
+        Args:
+            db: Database session
+            scope: Scope of the client
+            key: Idempotency-Key header value
+            status_code: Response status code
+            content_type: Response Content-Type header
+            body: Response body (JSON)
+        """
+        db.query(IdempotencyKey).filter(IdempotencyKey.scope == scope, IdempotencyKey.key == key).update({
+            IdempotencyKey.status_code: status_code,
+            IdempotencyKey.content_type: content_type,
+            IdempotencyKey.response_body: body.decode("utf-8"),
+            IdempotencyKey.expires_at: datetime.utcnow() + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+        }, synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def release(db: Session, scope: str, key: str):
+        """
+        Give up a claimed key after a failed request, so a retry runs again.
+
+        Args:
+            db: Database session
+            scope: Scope of the client
+            key: Idempotency-Key header value
+        """
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+            IdempotencyKey.status_code.is_(None)
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def purge_expired(db: Session, batch_size: Optional[int] = None) -> dict[str, int]:
+        """
+        Delete expired keys, then the oldest keys beyond IDEMPOTENCY_MAX_KEYS.
+
+        Args:
+            db: Database session
+            batch_size: Rows per transaction (defaults to SESSION_PURGE_BATCH_SIZE)
+
+        Returns:
+            Number of deleted "expired" and "overflow" keys
+        """
+        batch_size = batch_size or settings.SESSION_PURGE_BATCH_SIZE
+        counts = {
+            "expired": IdempotencyService._delete_batches(db, IdempotencyKey.expires_at < datetime.utcnow(), batch_size),
+            "overflow": 0,
+        }
+
+        # Keep the newest IDEMPOTENCY_MAX_KEYS keys: the first key beyond them,
+        # in (created_at, id) order, is where deletion starts. Ids may have gaps
+        # (failed inserts use up sequence values), so they are not counted on.
+        order = tuple_(IdempotencyKey.created_at, IdempotencyKey.id)
+        cutoff = db.query(IdempotencyKey.created_at, IdempotencyKey.id).order_by(
+            IdempotencyKey.created_at.desc(), IdempotencyKey.id.desc()
+        ).offset(settings.IDEMPOTENCY_MAX_KEYS).first()
+        if cutoff is not None:
+            counts["overflow"] = IdempotencyService._delete_batches(db, order <= tuple_(*cutoff), batch_size)
+
+        return counts
+
+    @staticmethod
+    def _delete_batches(db: Session, condition, batch_size: int) -> int:
+        """Delete matching rows in batches, one transaction each"""
+        deleted = 0
+        while True:
+            ids = [key_id for (key_id,) in db.query(IdempotencyKey.id).filter(condition).limit(batch_size).all()]
+            if not ids:
+                break
+
+            db.query(IdempotencyKey).filter(IdempotencyKey.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            deleted += len(ids)
+
+            if len(ids) < batch_size:
+                break
+
+        return deleted
@@ -0,0 +1,110 @@
+import logging
+from typing import TYPE_CHECKING, Optional
+
+from app.core.config import settings
+
+# NumPy and Pillow are imported on first use to keep application startup fast
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+BASE83_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+class PlaceholderService:
+    """Service for computing BlurHash placeholders shown while thumbnails load"""
+
+    @staticmethod
+    def encode(img: "Image.Image", components_x: Optional[int] = None, components_y: Optional[int] = None) -> str:
+        """
+        Encode an image as a BlurHash (https://blurha.sh).
+
+        Expects an already downsampled image (e.g. a thumbnail); it is reduced
+        further to at most 32x32 pixels, which does not change the result
+        noticeably. With 4x3 components the hash is 28 characters.
+
+        Args:
+            img: PIL image
+            components_x: Horizontal components, 1-9 (defaults to BLURHASH_COMPONENTS_X)
+            components_y: Vertical components, 1-9 (defaults to BLURHASH_COMPONENTS_Y)
+
+        Returns:
+            BlurHash string
+        """
+        import numpy as np
+        from PIL import Image
+
+        components_x = components_x or settings.BLURHASH_COMPONENTS_X
+        components_y = components_y or settings.BLURHASH_COMPONENTS_Y
+
+        img = img.convert("RGB")
+        img.thumbnail((32, 32), Image.Resampling.BILINEAR)
+        width, height = img.size
+
+        # sRGB -> linear light
+        pixels = np.asarray(img, dtype=np.float64) / 255.0
+        linear = np.where(pixels <= 0.04045, pixels / 12.92, ((pixels + 0.055) / 1.055) ** 2.4)
+
+        # factors[j, i] = normalization * mean(cos(pi*i*x/w) * cos(pi*j*y/h) * pixel)
+        basis_x = np.cos(np.pi * np.outer(np.arange(components_x), np.arange(width)) / width)
+        basis_y = np.cos(np.pi * np.outer(np.arange(components_y), np.arange(height)) / height)
+        normalization = np.full((components_y, components_x, 1), 2.0)
+        normalization[0, 0] = 1.0
+        factors = np.einsum("jy,ix,yxc->jic", basis_y, basis_x, linear) * normalization / (width * height)
+
+        factors = factors.reshape(-1, 3)
+        dc, ac = factors[0], factors[1:]
+
+        result = PlaceholderService._base83((components_x - 1) + (components_y - 1) * 9, 1)
+
+        if len(ac):
+            quantised_max = int(np.clip(np.floor(np.abs(ac).max() * 166 - 0.5), 0, 82))
+            maximum = (quantised_max + 1) / 166
+            result += PlaceholderService._base83(quantised_max, 1)
+        else:
+            maximum = 1.0
+            result += PlaceholderService._base83(0, 1)
+
+        # DC: average color in sRGB
+        srgb = np.clip(dc, 0, 1)
+        srgb = np.where(srgb <= 0.0031308, srgb * 12.92, 1.055 * srgb ** (1 / 2.4) - 0.055)
+        r, g, b = (int(round(c)) for c in np.clip(srgb * 255, 0, 255))
+        result += PlaceholderService._base83((r << 16) + (g << 8) + b, 4)
+
+        # AC: sign-preserving square root, quantized to 19 levels per channel
+        quantised = np.clip(np.floor(np.sign(ac) * np.sqrt(np.abs(ac / maximum)) * 9 + 9.5), 0, 18).astype(int)
+        for r, g, b in quantised:
+            result += PlaceholderService._base83(r * 19 * 19 + g * 19 + b, 2)
+
+        return result
+
+    @staticmethod
+    def encode_file(image_path: Optional[str]) -> Optional[str]:
+        """
+        Compute the BlurHash of an image file.
+
+        Args:
+            image_path: Storage reference of the image (ideally the thumbnail)
+
+        Returns:
+            BlurHash string, or None if the image cannot be read
+        """
+        if not image_path or image_path.lower().endswith(".svg"):
+            return None
+
+        from PIL import Image
+
+        from app.services.file_service import FileService
+
+        try:
+            with FileService.open_file(image_path) as f, Image.open(f) as img:
+                img.draft("RGB", (64, 64))
+                return PlaceholderService.encode(img)
+        except Exception as e:
+            logger.warning("Failed to compute placeholder", extra={"path": image_path, "error": str(e)})
+            return None
+
+    @staticmethod
+    def _base83(value: int, length: int) -> str:
+        return "".join(BASE83_ALPHABET[value // 83 ** (length - i - 1) % 83] for i in range(length))
@@ -0,0 +1,164 @@
+"""
+Static JSON snapshots of the Hall of Fame.
+
+The first pages of `/api/gallery/`, `/api/gallery/featured` and
+`/api/gallery/latest` are rendered with their default parameters (by the
+renderer the API layer sets, app.api.rendering.render_snapshots) and written
+through the storage backend under SNAPSHOT_PREFIX, each next to a
+precompressed `.gz` copy:
+
+    snapshots/gallery/1.json ... gallery/<SNAPSHOT_GALLERY_PAGES>.json
+    snapshots/featured.json
+    snapshots/latest.json
+
+so nginx, a CDN or the `/uploads` static mount can serve anonymous gallery
+traffic without running the application. Uploads and deletes schedule a
+regeneration that is debounced, so a burst of uploads is rendered once, and
+only files whose content changed are rewritten. Heart and view counts are
+brought up to date every SNAPSHOT_REFRESH_SECONDS.
+"""
+import hashlib
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.compression import compress
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.storage_service import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+class _Debouncer:
+    """
+    Run a callback once activity has been quiet for `delay` seconds, but no
+    later than `max_delay` seconds after the first trigger of a burst.
+    """
+
+    def __init__(self, delay: float, max_delay: float, callback: Callable[[], None]):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.callback = callback
+        self._first_trigger: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def trigger(self):
+        """Schedule the callback; safe to call from any thread"""
+        with self._lock:
+            now = time.monotonic()
+            if self._first_trigger is None:
+                self._first_trigger = now
+            if self._timer is not None:
+                self._timer.cancel()
+
+            wait = min(self.delay, self._first_trigger + self.max_delay - now)
+            self._timer = threading.Timer(max(wait, 0.0), self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            self._first_trigger = None
+
+    def _fire(self):
+        with self._lock:
+            self._timer = None
+            self._first_trigger = None
+        try:
+            self.callback()
+        except Exception:
+            logger.exception("Gallery snapshot generation failed")
+
+
+class SnapshotService:
+    """Service writing rendered gallery responses as static snapshots"""
+
+    # Digest of the last body written per key, so unchanged files are skipped
+    _digests: dict[str, str] = {}
+    _write_lock = threading.Lock()
+
+    # Renders every snapshot: set by the API layer (app.api.rendering), which owns the response schemas
+    _render: Optional[Callable[[Session], dict[str, bytes]]] = None
+
+    @staticmethod
+    def set_renderer(render: Callable[[Session], dict[str, bytes]]):
+        """
+        Set the function rendering the snapshots.
+
+        Args:
+            render: Callable taking a database session and returning a dict
+                of storage key to JSON body
+        """
+        SnapshotService._render = render
+
+    @staticmethod
+    def generate(db: Session) -> dict:
+        """
+        Render the snapshots and write the ones that changed.
+
+        Each file is replaced atomically, so readers never see a partial
+        snapshot.
+
+        Raises:
+            RuntimeError: If no renderer was set
+
+        Args:
+            db: Database session
+
+        Returns:
+            Dict with "written" and "unchanged" file counts
+        """
+        if SnapshotService._render is None:
+            raise RuntimeError("No snapshot renderer set (SnapshotService.set_renderer)")
+
+        storage = get_storage()
+        written = unchanged = 0
+
+        # Concurrent regenerations would race on the digests
+        with SnapshotService._write_lock:
+            for key, body in SnapshotService._render(db).items():
+                digest = hashlib.sha256(body).hexdigest()
+                if SnapshotService._digests.get(key) == digest:
+                    unchanged += 1
+                    continue
+
+                # The compressed copy goes first so it is never older than the JSON
+                with storage.writer(key + ".gz") as f:
+                    f.write(compress(body, "gzip"))
+                with storage.writer(key) as f:
+                    f.write(body)
+
+                SnapshotService._digests[key] = digest
+                written += 1
+
+        return {"written": written, "unchanged": unchanged}
+
+    @staticmethod
+    def regenerate():
+        """Regenerate the snapshots with a new database session"""
+        db = SessionLocal()
+        try:
+            SnapshotService.generate(db)
+        finally:
+            db.close()
+
+    @staticmethod
+    def schedule():
+        """Request a debounced regeneration after the gallery changed"""
+        if settings.SNAPSHOTS_ENABLED:
+            snapshot_debouncer.trigger()
+
+
+snapshot_debouncer = _Debouncer(
+    delay=settings.SNAPSHOT_DEBOUNCE_SECONDS,
+    max_delay=settings.SNAPSHOT_MAX_DELAY_SECONDS,
+    callback=SnapshotService.regenerate,
+)
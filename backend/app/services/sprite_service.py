@@ -0,0 +1,245 @@
+"""
+Thumbnail sprite sheets for gallery pages.
+
+The thumbnails of a page are packed into one JPEG so the browser paints the
+page with a single image request. A sheet is named after a digest of the
+artwork IDs and thumbnail paths it contains, so it is built once per page
+content and changes whenever the page does:
+
+    sprites/<digest>.jpg   the sheet
+    sprites/<digest>.json  tile coordinates, written after the sheet
+
+Sheets are loaded and built by a background thread, never by the request
+that needs them: a gallery request whose sheet is not ready gets `sprite:
+null` and the gallery cache is invalidated once the sheet exists. The
+snapshot job, which runs in the background already, waits for its sheets.
+
+Each worker keeps recently used tile maps in memory. Sheets whose map has not
+been rewritten for SPRITE_MAX_AGE_HOURS are purged; a worker rewrites the map
+when it starts using a sheet, and again after half that time.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from app.core.cache import gallery_cache
+from app.core.config import settings
+from app.models import Artwork
+from app.services.file_service import FileService
+from app.services.storage_service import StorageError, get_storage
+
+logger = logging.getLogger(__name__)
+
+SPRITE_PREFIX = "sprites"
+
+# Bump when the layout changes, so existing sheets are not reused
+LAYOUT_VERSION = 1
+
+
+class SpriteService:
+    """Service building thumbnail sprite sheets for gallery pages"""
+
+    # Tile maps by digest, with the time the map was last written
+    _sheets: "OrderedDict[str, tuple[float, Optional[dict]]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    # Loads and builds in progress by digest, and digests a request is waiting for
+    _pending: dict[str, Future] = {}
+    _notify: set[str] = set()
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_pid: Optional[int] = None
+
+    @staticmethod
+    def get_sheet(artworks: list[Artwork], wait: bool = False) -> Optional[dict]:
+        """
+        Get the sprite sheet for a page of artworks.
+
+        A sheet that is not in memory is loaded or built by the background
+        thread. Without `wait`, None is returned meanwhile and the gallery
+        cache is invalidated when the sheet is ready.
+
+        Args:
+            artworks: Artworks of the page, in display order (duplicates and
+                artworks without a thumbnail are skipped)
+            wait: Block until the sheet is ready (for background jobs only)
+
+        Returns:
+            Dict with the sheet's "path", "width", "height" and "tiles"
+            ({"id", "x", "y", "width", "height"} per artwork), or None if the
+            page has fewer than two thumbnails, the sheet is not ready yet or
+            cannot be built
+        """
+        seen = set()
+        tiles = []
+        for artwork in artworks:
+            if artwork.thumbnail_path and artwork.id not in seen:
+                seen.add(artwork.id)
+                tiles.append((artwork.id, artwork.thumbnail_path))
+        if len(tiles) < 2:
+            return None
+
+        digest = SpriteService.digest(tiles)
+        with SpriteService._lock:
+            entry = SpriteService._sheets.get(digest)
+            if entry:
+                SpriteService._sheets.move_to_end(digest)
+                if time.time() - entry[0] < settings.SPRITE_MAX_AGE_HOURS * 3600 / 2:
+                    return entry[1]
+
+            future = SpriteService._pending.get(digest)
+            if future is None:
+                future = SpriteService._get_executor().submit(SpriteService._resolve, digest, tiles)
+                SpriteService._pending[digest] = future
+            if not wait:
+                SpriteService._notify.add(digest)
+
+        if wait:
+            return future.result()
+        # A map due for refreshing is still valid meanwhile
+        return entry[1] if entry else None
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        """The background thread of this process (a forked worker does not inherit the parent's)"""
+        if SpriteService._executor_pid != os.getpid():
+            SpriteService._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sprites")
+            SpriteService._pending = {}
+            SpriteService._executor_pid = os.getpid()
+        return SpriteService._executor
+
+    @staticmethod
+    def _resolve(digest: str, tiles: list[tuple[int, str]]) -> Optional[dict]:
+        """Load or build a sheet in the background thread and remember it"""
+        try:
+            sheet = SpriteService._load(digest) or SpriteService._build(digest, tiles)
+        except Exception as e:
+            logger.warning("Failed to build sprite sheet", extra={"digest": digest, "error": str(e)})
+            sheet = None
+
+        # Pages without enough readable thumbnails are remembered too (as None)
+        with SpriteService._lock:
+            SpriteService._sheets[digest] = (time.time(), sheet)
+            SpriteService._sheets.move_to_end(digest)
+            while len(SpriteService._sheets) > settings.SPRITE_CACHE_SIZE:
+                SpriteService._sheets.popitem(last=False)
+            SpriteService._pending.pop(digest, None)
+            notify = digest in SpriteService._notify
+            SpriteService._notify.discard(digest)
+
+        # Cached gallery responses rendered while the sheet was missing lack it
+        if notify and sheet is not None:
+            gallery_cache.invalidate()
+        return sheet
+
+    @staticmethod
+    def digest(tiles: list[tuple[int, str]]) -> str:
+        """Content version of a page: its (artwork_id, thumbnail_path) pairs and the layout"""
+        payload = json.dumps([LAYOUT_VERSION, settings.SPRITE_ROW_WIDTH, settings.SPRITE_QUALITY, tiles])
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def purge_stale(db=None) -> dict:
+        """
+        Delete sprite sheets that no worker has used for SPRITE_MAX_AGE_HOURS.
+
+        Args:
+            db: Unused; accepted so this can run as a scheduler job
+
+        Returns:
+            Dict with the number of "deleted" files and "bytes" freed
+        """
+        storage = get_storage()
+        cutoff = time.time() - settings.SPRITE_MAX_AGE_HOURS * 3600
+        stats = {"deleted": 0, "bytes": 0}
+
+        def collect(key: str, size: int, modified: float):
+            if modified < cutoff and storage.delete(key):
+                stats["deleted"] += 1
+                stats["bytes"] += size
+
+        # Keys are listed in order, so <digest>.jpg comes right before its
+        # <digest>.json. A sheet lives as long as its map; a sheet without a
+        # map was never finished.
+        sheet = None
+        for key, size, modified in storage.list(f"{SPRITE_PREFIX}/"):
+            if sheet is not None:
+                sheet_key, sheet_size, sheet_modified = sheet
+                if key == sheet_key[:-len(".jpg")] + ".json":
+                    sheet_modified = max(sheet_modified, modified)
+                collect(sheet_key, sheet_size, sheet_modified)
+                sheet = None
+
+            if key.endswith(".jpg"):
+                sheet = (key, size, modified)
+            else:
+                collect(key, size, modified)
+
+        if sheet is not None:
+            collect(*sheet)
+
+        return stats
+
+    @staticmethod
+    def _load(digest: str) -> Optional[dict]:
+        """Reuse a sheet built earlier (possibly by another worker), refreshing its map"""
+        storage = get_storage()
+        meta_key = f"{SPRITE_PREFIX}/{digest}.json"
+        try:
+            with storage.open(meta_key) as f:
+                sheet = json.load(f)
+        except StorageError:
+            return None
+
+        SpriteService._write_meta(meta_key, sheet)
+        return sheet
+
+    @staticmethod
+    def _build(digest: str, tiles: list[tuple[int, str]]) -> Optional[dict]:
+        """Pack the thumbnails into rows of at most SPRITE_ROW_WIDTH pixels"""
+        from PIL import Image
+
+        images = []
+        for artwork_id, thumbnail_path in tiles:
+            try:
+                with FileService.open_file(thumbnail_path) as f, Image.open(f) as img:
+                    images.append((artwork_id, img.convert("RGB")))
+            except Exception:
+                continue  # missing or unreadable thumbnails are loaded individually
+        if len(images) < 2:
+            return None
+
+        # Shelf packing: left to right, a new row when the next thumbnail does not fit
+        placed = []
+        x = y = row_height = width = 0
+        for artwork_id, img in images:
+            if x and x + img.width > settings.SPRITE_ROW_WIDTH:
+                x, y, row_height = 0, y + row_height, 0
+            placed.append({"id": artwork_id, "x": x, "y": y, "width": img.width, "height": img.height})
+            x += img.width
+            row_height = max(row_height, img.height)
+            width = max(width, x)
+        height = y + row_height
+
+        sheet_image = Image.new("RGB", (width, height), (255, 255, 255))
+        for tile, (_, img) in zip(placed, images):
+            sheet_image.paste(img, (tile["x"], tile["y"]))
+
+        storage = get_storage()
+        key = f"{SPRITE_PREFIX}/{digest}.jpg"
+        with storage.writer(key) as f:
+            sheet_image.save(f, "JPEG", quality=settings.SPRITE_QUALITY, optimize=True, progressive=True)
+
+        sheet = {"path": storage.reference(key), "width": width, "height": height, "tiles": placed}
+        SpriteService._write_meta(f"{SPRITE_PREFIX}/{digest}.json", sheet)
+        return sheet
+
+    @staticmethod
+    def _write_meta(meta_key: str, sheet: dict):
+        with get_storage().writer(meta_key) as f:
+            f.write(json.dumps(sheet, separators=(",", ":")).encode())
@@ -0,0 +1,320 @@
+import hashlib
+import logging
+import mimetypes
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import BinaryIO, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Read once: os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class StorageError(Exception):
+    """Raised when a storage backend operation fails"""
+
+
+class StorageBackend:
+    """
+    Interface for artwork file storage.
+
+    Files are addressed by keys such as `artworks/3f/a2/<uuid>.png`. The
+    database stores a *reference* for each key (a path under UPLOAD_DIR for
+    local storage, a URL for S3), which is what API clients use to fetch it.
+    """
+
+    #: Prefix of the references produced by this backend
+    reference_prefix: str = ""
+
+    @staticmethod
+    def shard_key(category: str, filename: str) -> str:
+        """
+        Build a key that fans files out over hash-prefix directories.
+
+        Args:
+            category: Top-level folder ("artworks", "thumbnails")
+            filename: File name
+
+        Returns:
+            Key like `artworks/3f/a2/<filename>`
+        """
+        digest = hashlib.sha1(filename.encode()).hexdigest()
+        parts = [digest[i * 2:i * 2 + 2] for i in range(settings.STORAGE_FANOUT_DEPTH)]
+        return "/".join([category, *parts, filename])
+
+    def reference(self, key: str) -> str:
+        """Reference stored in the database for a key"""
+        return f"{self.reference_prefix}/{key}"
+
+    def key_from_reference(self, reference: Optional[str], prefix: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve a database reference back to a key.
+
+        Args:
+            reference: Stored file_path / thumbnail_path value
+            prefix: Reference prefix to strip (defaults to this backend's)
+
+        Returns:
+            Key, or None if the reference does not belong to the prefix
+        """
+        if not reference:
+            return None
+
+        prefix = (prefix or self.reference_prefix).rstrip("/")
+        if "://" in prefix:
+            if not reference.startswith(prefix + "/"):
+                return None
+            key = reference[len(prefix) + 1:]
+        else:
+            key = os.path.relpath(reference, prefix).replace(os.sep, "/")
+
+        if not key or key.startswith("../") or key == ".." or os.path.isabs(key):
+            return None
+        return key
+
+    @contextmanager
+    def writer(self, key: str) -> Iterator[BinaryIO]:
+        """
+        Open a key for writing. The file becomes visible when the block
+        exits successfully; on error nothing is stored.
+        """
+        raise NotImplementedError
+
+    def save(self, key: str, fileobj: BinaryIO) -> int:
+        """Store the contents of a file object; returns the size in bytes"""
+        with self.writer(key) as f:
+            shutil.copyfileobj(fileobj, f)
+            return f.tell()
+
+    def open(self, key: str) -> BinaryIO:
+        """Open a key for reading"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        """Delete a key; returns True if it no longer exists"""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def move(self, key: str, new_key: str):
+        """Rename a key, replacing new_key if it exists"""
+        raise NotImplementedError
+
+    def list(self, prefix: str = "") -> Iterator[tuple[str, int, float]]:
+        """
+        Iterate over stored files without loading the listing into memory.
+
+        Keys are yielded in ascending code point order (the order of S3
+        listings), so a listing can be merge-joined with sorted references.
+
+        Args:
+            prefix: Directory prefix, e.g. "artworks/"
+
+        Yields:
+            (key, size_in_bytes, modified_timestamp) tuples
+        """
+        raise NotImplementedError
+
+
+class LocalStorage(StorageBackend):
+    """Stores files on the local disk under a root directory"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.reference_prefix = root.rstrip("/")
+
+    def path(self, key: str) -> str:
+        """Filesystem path of a key"""
+        return os.path.join(self.root, *key.split("/"))
+
+    @contextmanager
+    def writer(self, key: str) -> Iterator[BinaryIO]:
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write to a temporary file in the target directory, then rename
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            # mkstemp creates owner-only files; use the usual umask-based mode
+            # so a web server running as another user can read them
+            os.chmod(temp_path, 0o666 & ~_UMASK)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return open(self.path(key), "rb")
+        except FileNotFoundError as e:
+            raise StorageError(f"File not found: {key}") from e
+
+    def delete(self, key: str) -> bool:
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Failed to delete file", extra={"key": key, "error": str(e)})
+            return False
+        return True
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.path(key))
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(self.path(key))
+
+    def move(self, key: str, new_key: str):
+        new_path = self.path(new_key)
+        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+        os.replace(self.path(key), new_path)
+
+    def list(self, prefix: str = "") -> Iterator[tuple[str, int, float]]:
+        directory = prefix.rstrip("/")
+        if not os.path.isdir(self.path(directory) if directory else self.root):
+            return
+        yield from self._walk(directory)
+
+    def _walk(self, directory: str) -> Iterator[tuple[str, int, float]]:
+        """Depth-first walk, one directory listing in memory per level"""
+        with os.scandir(self.path(directory) if directory else self.root) as scan:
+            # Sorting directories as "name/" keeps the walk in full key order
+            entries = sorted(
+                ((entry.name + "/" if entry.is_dir(follow_symlinks=False) else entry.name), entry)
+                for entry in scan
+            )
+
+        for name, entry in entries:
+            key = f"{directory}/{entry.name}" if directory else entry.name
+            if name.endswith("/"):
+                yield from self._walk(key)
+            elif entry.is_file(follow_symlinks=False) and not entry.name.startswith(".tmp-"):
+                stat = entry.stat()
+                yield key, stat.st_size, stat.st_mtime
+
+
+class S3Storage(StorageBackend):
+    """
+    Stores files in an S3-compatible bucket (AWS S3, MinIO, ...).
+
+    Requires the optional `boto3` package.
+    """
+
+    # Keys per ListObjectsV2 request (the S3 maximum)
+    list_page_size = 1000
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        public_url: Optional[str] = None
+    ):
+        try:
+            import boto3
+        except ImportError as e:
+            raise StorageError("S3 storage requires the boto3 package") from e
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+        if public_url:
+            self.reference_prefix = public_url.rstrip("/")
+        elif endpoint_url:
+            self.reference_prefix = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.reference_prefix = f"https://{bucket}.s3.amazonaws.com"
+
+    @contextmanager
+    def writer(self, key: str) -> Iterator[BinaryIO]:
+        # Spool to memory (or disk for large files) and upload on success
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as f:
+            yield f
+            f.seek(0)
+            content_type, encoding = mimetypes.guess_type(key)
+            extra_args = {"ContentType": content_type} if content_type else {}
+            if encoding:
+                extra_args["ContentEncoding"] = encoding
+            self.client.upload_fileobj(f, self.bucket, key, ExtraArgs=extra_args or None)
+
+    def open(self, key: str) -> BinaryIO:
+        f = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        try:
+            self.client.download_fileobj(self.bucket, key, f)
+        except Exception as e:
+            f.close()
+            raise StorageError(f"File not found: {key}") from e
+        f.seek(0)
+        return f
+
+    def delete(self, key: str) -> bool:
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            logger.warning("Failed to delete file", extra={"key": key, "error": str(e)})
+            return False
+        return True
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except Exception:
+            return False
+        return True
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    def move(self, key: str, new_key: str):
+        self.client.copy({"Bucket": self.bucket, "Key": key}, self.bucket, new_key)
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list(self, prefix: str = "") -> Iterator[tuple[str, int, float]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=self.bucket, Prefix=prefix, PaginationConfig={"PageSize": self.list_page_size}
+        ):
+            for item in page.get("Contents", []):
+                yield item["Key"], item["Size"], item["LastModified"].timestamp()
+
+
+@lru_cache(maxsize=None)
+def get_storage() -> StorageBackend:
+    """Return the storage backend configured by STORAGE_BACKEND"""
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(settings.UPLOAD_DIR)
+
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            public_url=settings.S3_PUBLIC_URL,
+        )
+
+    raise StorageError(f"Unknown storage backend: {settings.STORAGE_BACKEND}")
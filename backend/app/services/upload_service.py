@@ -0,0 +1,387 @@
+"""
+Resumable chunked uploads.
+
+An upload session is a staging file plus a small JSON sidecar under
+UPLOAD_STAGING_DIR/<owner_id>/. Chunks are appended at the offset the client
+sends, which must equal the bytes received so far (the staging file size), so
+a client that lost its connection asks for the offset and continues from
+there. Completing the upload verifies the SHA-256 of the whole file while
+copying it to the storage backend.
+
+Staging is local to one host: behind a load balancer with several hosts the
+staging directory must be shared, or uploads pinned to one host.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterator
+
+import anyio
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.image_probe import PROBE_BYTES, ImageInfo
+from app.services.file_service import FileService
+from app.services.storage_service import get_storage
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Fallback when fcntl is unavailable; only serializes within one process
+_process_locks: dict[str, threading.Lock] = {}
+_process_locks_guard = threading.Lock()
+
+
+class UploadService:
+    """Service for resumable chunked uploads"""
+
+    @staticmethod
+    def create_upload(owner_id: int, filename: str, size: int) -> dict:
+        """
+        Start a resumable upload.
+
+        Args:
+            owner_id: ID of the uploading user
+            filename: Original file name (its extension must be allowed)
+            size: Total file size in bytes
+
+        Returns:
+            Upload status dict (see get_status)
+
+        Raises:
+            HTTPException: If the file type or size is not allowed, or the
+                user has too many uploads in progress
+        """
+        file_ext = os.path.splitext(filename)[1].lower()
+        if file_ext not in settings.ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File type {file_ext} not allowed. Allowed types: {settings.ALLOWED_EXTENSIONS}"
+            )
+
+        if size > settings.MAX_RESUMABLE_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {settings.MAX_RESUMABLE_UPLOAD_SIZE / 1024 / 1024}MB"
+            )
+
+        directory = UploadService._owner_dir(owner_id)
+        os.makedirs(directory, exist_ok=True)
+        in_progress = sum(1 for name in os.listdir(directory) if name.endswith(".json"))
+        if in_progress >= settings.MAX_UPLOADS_IN_PROGRESS:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Too many uploads in progress. Maximum: {settings.MAX_UPLOADS_IN_PROGRESS}"
+            )
+
+        upload_id = uuid.uuid4().hex
+        meta = {"filename": filename, "file_ext": file_ext, "size": size}
+        part_path, meta_path = UploadService._paths(owner_id, upload_id)
+
+        open(part_path, "wb").close()
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+
+        return UploadService._status(upload_id, meta, part_path)
+
+    @staticmethod
+    def get_status(owner_id: int, upload_id: str) -> dict:
+        """
+        Get the progress of an upload.
+
+        Args:
+            owner_id: ID of the uploading user
+            upload_id: Upload ID
+
+        Returns:
+            Dict with id, filename, size, offset, chunk_size and expires_at
+
+        Raises:
+            HTTPException: If the upload does not exist or expired
+        """
+        meta, part_path = UploadService._load(owner_id, upload_id)
+        return UploadService._status(upload_id, meta, part_path)
+
+    @staticmethod
+    async def write_chunk(
+        owner_id: int,
+        upload_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes],
+        sha256: str | None = None
+    ) -> int:
+        """
+        Append a chunk to an upload, streaming it into the staging file.
+
+        A chunk is stored completely or not at all. Once the first
+        PROBE_BYTES have arrived the file's header is checked, so a bad file
+        is rejected before the rest is sent.
+
+        Args:
+            owner_id: ID of the uploading user
+            upload_id: Upload ID
+            offset: Position of the chunk; must equal the bytes received so far
+            chunks: Request body stream
+            sha256: Optional hex SHA-256 of the chunk
+
+        Returns:
+            New offset
+
+        Raises:
+            HTTPException: If the offset is wrong (409), another chunk is being
+                written (409), the chunk is too large (413) or corrupt (400),
+            or the file is not an allowed image (400/413)
+        """
+        meta, part_path = UploadService._load(owner_id, upload_id)
+
+        with UploadService._locked(part_path, upload_id) as f:
+            current = os.fstat(f.fileno()).st_size
+            if offset != current:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Upload is at offset {current}, not {offset}",
+                    headers={"Upload-Offset": str(current)}
+                )
+
+            digest = hashlib.sha256()
+            received = 0
+            f.seek(offset)
+            try:
+                async for data in chunks:
+                    received += len(data)
+                    if received > settings.UPLOAD_MAX_CHUNK_SIZE or offset + received > meta["size"]:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail="Chunk too large or past the end of the file"
+                        )
+                    digest.update(data)
+                    await run_in_threadpool(f.write, data)
+
+                if sha256 and digest.hexdigest() != sha256.lower():
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Chunk checksum mismatch"
+                    )
+                await run_in_threadpool(f.flush)
+
+                probe_end = min(PROBE_BYTES, meta["size"])
+                if offset < probe_end <= offset + received:
+                    f.seek(0)
+                    head = await run_in_threadpool(f.read, probe_end)
+                    FileService.check_image(head, meta["file_ext"])
+            except BaseException:
+                # Drop the partial chunk, the client resends it from `offset`;
+                # shielded so a disconnect cannot skip it
+                with anyio.CancelScope(shield=True):
+                    await run_in_threadpool(f.truncate, offset)
+                raise
+
+        metrics.UPLOAD_BYTES.inc(received)
+        return offset + received
+
+    @staticmethod
+    def finish_upload(owner_id: int, upload_id: str, sha256: str) -> tuple[str, int, ImageInfo]:
+        """
+        Verify a completed upload and move it to the storage backend.
+
+        The checksum is computed while copying, so the file is read once; on
+        a mismatch nothing is stored and the staged data is kept for the
+        client to inspect or abort.
+
+        Args:
+            owner_id: ID of the uploading user
+            upload_id: Upload ID
+            sha256: Hex SHA-256 of the whole file
+
+        Returns:
+            Tuple of (file_path, file_size, image_info), like
+            FileService.save_artwork_file
+
+        Raises:
+            HTTPException: If the upload is incomplete, the checksum does not
+                match or the file is not an allowed image
+        """
+        meta, part_path = UploadService._load(owner_id, upload_id)
+        storage = get_storage()
+
+        with UploadService._locked(part_path, upload_id) as f:
+            size = os.fstat(f.fileno()).st_size
+            if size != meta["size"]:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Upload incomplete: {size} of {meta['size']} bytes received",
+                    headers={"Upload-Offset": str(size)}
+                )
+
+            head = f.read(PROBE_BYTES)
+            info, file_ext = FileService.check_image(head, meta["file_ext"])
+            key = storage.shard_key("artworks", f"{uuid.uuid4()}{file_ext}")
+
+            digest = hashlib.sha256()
+            f.seek(0)
+            with storage.writer(key) as out:
+                while data := f.read(COPY_BUFFER_SIZE):
+                    digest.update(data)
+                    out.write(data)
+
+                if digest.hexdigest() != sha256.lower():
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Checksum mismatch, the file was corrupted in transit"
+                    )
+
+        UploadService._remove(part_path)
+        return storage.reference(key), size, info
+
+    @staticmethod
+    def abort_upload(owner_id: int, upload_id: str) -> bool:
+        """
+        Cancel an upload and delete its staged data.
+
+        Args:
+            owner_id: ID of the uploading user
+            upload_id: Upload ID
+
+        Returns:
+            True if successful
+
+        Raises:
+            HTTPException: If the upload does not exist
+        """
+        _, part_path = UploadService._load(owner_id, upload_id)
+        with UploadService._locked(part_path, upload_id):
+            pass  # 409 while a chunk is being written
+        UploadService._remove(part_path)
+        return True
+
+    @staticmethod
+    def purge_expired(db=None) -> dict:
+        """
+        Delete uploads without activity for UPLOAD_EXPIRE_HOURS.
+
+        Args:
+            db: Unused; accepted so this can run as a scheduler job
+
+        Returns:
+            Dict with the number of "expired" uploads and "bytes" freed
+        """
+        expired = freed = 0
+        root = settings.UPLOAD_STAGING_DIR
+        if not os.path.isdir(root):
+            return {"expired": 0, "bytes": 0}
+
+        cutoff = time.time() - settings.UPLOAD_EXPIRE_HOURS * 3600
+        for owner in os.listdir(root):
+            directory = os.path.join(root, owner)
+            if not os.path.isdir(directory):
+                continue
+
+            for name in os.listdir(directory):
+                if not name.endswith(".json"):
+                    continue
+                part_path = os.path.join(directory, name[:-len(".json")] + ".part")
+                try:
+                    stat = os.stat(part_path)
+                except FileNotFoundError:
+                    stat = os.stat(os.path.join(directory, name))
+                if stat.st_mtime < cutoff:
+                    UploadService._remove(part_path)
+                    expired += 1
+                    freed += stat.st_size
+
+        return {"expired": expired, "bytes": freed}
+
+    @staticmethod
+    def _owner_dir(owner_id: int) -> str:
+        return os.path.join(settings.UPLOAD_STAGING_DIR, str(owner_id))
+
+    @staticmethod
+    def _paths(owner_id: int, upload_id: str) -> tuple[str, str]:
+        base = os.path.join(UploadService._owner_dir(owner_id), upload_id)
+        return base + ".part", base + ".json"
+
+    @staticmethod
+    def _load(owner_id: int, upload_id: str) -> tuple[dict, str]:
+        """Return (meta, part_path); uploads of other users are not found"""
+        if len(upload_id) != 32 or not upload_id.isalnum():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+
+        part_path, meta_path = UploadService._paths(owner_id, upload_id)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            expired = os.stat(part_path).st_mtime < time.time() - settings.UPLOAD_EXPIRE_HOURS * 3600
+        except FileNotFoundError:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+
+        if expired:
+            UploadService._remove(part_path)
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload expired")
+        return meta, part_path
+
+    @staticmethod
+    def _status(upload_id: str, meta: dict, part_path: str) -> dict:
+        stat = os.stat(part_path)
+        return {
+            "id": upload_id,
+            "filename": meta["filename"],
+            "size": meta["size"],
+            "offset": stat.st_size,
+            "chunk_size": settings.UPLOAD_MAX_CHUNK_SIZE,
+            "expires_at": datetime.fromtimestamp(stat.st_mtime + settings.UPLOAD_EXPIRE_HOURS * 3600, timezone.utc),
+        }
+
+    @staticmethod
+    @contextmanager
+    def _locked(part_path: str, upload_id: str) -> Iterator:
+        """Open the staging file exclusively; a concurrent writer gets a 409"""
+        try:
+            f = open(part_path, "r+b")
+        except FileNotFoundError:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+
+        with f:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    raise UploadService._busy()
+                yield f
+                return
+
+            with _process_locks_guard:
+                lock = _process_locks.setdefault(upload_id, threading.Lock())
+            if not lock.acquire(blocking=False):
+                raise UploadService._busy()
+            try:
+                yield f
+            finally:
+                lock.release()
+                with _process_locks_guard:
+                    _process_locks.pop(upload_id, None)
+
+    @staticmethod
+    def _busy() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Another chunk of this upload is being written"
+        )
+
+    @staticmethod
+    def _remove(part_path: str):
+        for path in (part_path, part_path[:-len(".part")] + ".json"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,4 @@
+"""
+CanvasQuest API benchmarks.
+See benchmarks/README.md for usage.
+"""
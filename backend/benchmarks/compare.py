@@ -0,0 +1,68 @@
+"""
+Compare two benchmark reports written by benchmarks.run.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Exits with status 1 if any endpoint's p95 latency regressed by more than
+--threshold percent.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def change(before: float, after: float) -> float:
+    """Percent change from before to after"""
+    if not before:
+        return 0.0
+    return (after - before) / before * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95 regression in percent")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())
+    candidate = json.loads(args.candidate.read_text())
+
+    if baseline["meta"]["scale"] != candidate["meta"]["scale"]:
+        print("⚠️  Reports were seeded at different scales; comparison may be meaningless")
+
+    regressions = []
+    for mode, endpoints in candidate["results"].items():
+        if mode not in baseline["results"]:
+            continue
+
+        print(f"\n{mode}")
+        print(f"  {'endpoint':10s}" + "".join(f"{metric:>24s}" for metric in METRICS))
+
+        for endpoint, after in endpoints.items():
+            before = baseline["results"][mode].get(endpoint)
+            if not before:
+                continue
+
+            cells = []
+            for metric in METRICS:
+                delta = change(before[metric], after[metric])
+                cells.append(f"{before[metric]:>9.1f} → {after[metric]:>7.1f} ({delta:+5.1f}%)")
+            print(f"  {endpoint:10s}" + "".join(f"{cell:>24s}" for cell in cells))
+
+            if change(before["p95_ms"], after["p95_ms"]) > args.threshold:
+                regressions.append(f"{mode}/{endpoint}")
+
+    if regressions:
+        print(f"\n❌ p95 regressed by more than {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+    print("\n✅ No p95 regressions")
+
+
+if __name__ == "__main__":
+    main()
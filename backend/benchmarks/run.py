@@ -0,0 +1,259 @@
+"""
+Load-test the hot CanvasQuest API endpoints and write a JSON report.
+
+Usage (from the backend directory):
+    python -m benchmarks.run --users 200 --artworks 5000 --requests 500 \
+        --concurrency 16 --mode both --output bench-results.json
+
+The benchmark runs against its own SQLite database and upload directory in
+--workdir (a fresh one unless --reuse is given), so it never touches
+canvasquest.db. Set DATABASE_URL to benchmark against another database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+ENDPOINTS = ("gallery", "artwork", "heart", "upload", "login")
+
+
+def configure_environment(workdir: Path, reuse: bool):
+    """Point the app at the benchmark database and upload directory (before importing it)"""
+    if workdir.exists() and not reuse:
+        shutil.rmtree(workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir / 'bench.db'}")
+    os.environ["UPLOAD_DIR"] = str(workdir / "uploads")
+    os.environ["DEBUG"] = "False"
+
+
+def percentile_summary(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """Summarize latencies (seconds) into throughput and percentiles (milliseconds)"""
+    values = np.array(latencies) * 1000 if latencies else np.array([0.0])
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(float(values.mean()), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
+
+
+class Scenario:
+    """Builds the request for each hot endpoint from the seeded dataset"""
+
+    def __init__(self, dataset: dict, upload_body: bytes, token: str, rng: random.Random):
+        self.dataset = dataset
+        self.upload_body = upload_body
+        self.token = token
+        self.rng = rng
+
+    def request(self, endpoint: str) -> tuple[str, str, dict]:
+        artwork_id = self.rng.choice(self.dataset["public_artwork_ids"])
+
+        if endpoint == "gallery":
+            return "GET", "/api/gallery/", {"params": {"skip": self.rng.randint(0, 200), "limit": 50}}
+        if endpoint == "artwork":
+            return "GET", f"/api/artworks/{artwork_id}", {}
+        if endpoint == "heart":
+            return "POST", f"/api/artworks/{artwork_id}/heart", {}
+        if endpoint == "upload":
+            return "POST", "/api/artworks/upload", {
+                "headers": {"Authorization": f"Bearer {self.token}"},
+                "files": {"file": ("bench.png", self.upload_body, "image/png")},
+                "data": {"title": "Benchmark upload"},
+            }
+        if endpoint == "login":
+            from benchmarks.seed import BENCH_PASSWORD
+            return "POST", "/api/auth/login", {
+                "json": {"artist_name": self.rng.choice(self.dataset["artist_names"]), "password": BENCH_PASSWORD},
+            }
+        raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+async def drive(client, scenario: Scenario, endpoint: str, requests: int, concurrency: int, warmup: int) -> dict:
+    """Send `requests` requests to one endpoint from `concurrency` workers"""
+    for _ in range(warmup):
+        method, url, kwargs = scenario.request(endpoint)
+        await client.request(method, url, **kwargs)
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, kwargs = scenario.request(endpoint)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return percentile_summary(latencies, errors, time.perf_counter() - started)
+
+
+async def login_token(client, dataset: dict) -> str:
+    from benchmarks.seed import BENCH_PASSWORD
+
+    response = await client.post(
+        "/api/auth/login",
+        json={"artist_name": dataset["artist_names"][0], "password": BENCH_PASSWORD},
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def run_endpoints(client, dataset: dict, args) -> dict:
+    from benchmarks.seed import make_image_bytes
+
+    upload_body = make_image_bytes(np.random.default_rng(args.seed))
+    token = await login_token(client, dataset)
+    scenario = Scenario(dataset, upload_body, token, random.Random(args.seed))
+
+    results = {}
+    for endpoint in args.endpoints:
+        requests = args.requests if endpoint not in ("upload", "login") else max(1, args.requests // 10)
+        results[endpoint] = await drive(client, scenario, endpoint, requests, args.concurrency, args.warmup)
+        print(f"  {endpoint:8s} {results[endpoint]['throughput_rps']:>9.1f} req/s  "
+              f"p50 {results[endpoint]['p50_ms']:.1f}ms  p95 {results[endpoint]['p95_ms']:.1f}ms  "
+              f"p99 {results[endpoint]['p99_ms']:.1f}ms  errors {results[endpoint]['errors']}")
+    return results
+
+
+async def run_inprocess(dataset: dict, args) -> dict:
+    """Drive the ASGI app directly, without a network socket"""
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return await run_endpoints(client, dataset, args)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(dataset: dict, args) -> dict:
+    """Drive a local uvicorn server over HTTP"""
+    import httpx
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    if (await client.get("/api/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start within 30s")
+                await asyncio.sleep(0.2)
+
+            return await run_endpoints(client, dataset, args)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the CanvasQuest API")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--artworks", type=int, default=2000)
+    parser.add_argument("--images", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=300, help="Requests per read endpoint (writes get 1/10)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn", "both"), default="both")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", type=Path, default=BACKEND_DIR / ".bench")
+    parser.add_argument("--reuse", action="store_true", help="Reuse the workdir instead of reseeding from scratch")
+    parser.add_argument("--output", type=Path, default=Path("bench-results.json"))
+    args = parser.parse_args()
+
+    configure_environment(args.workdir, args.reuse)
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from benchmarks.seed import seed
+    dataset = seed(args.users, args.artworks, args.images, args.seed)
+    print(f"🌱 Seeded {args.users} users / {args.artworks} artworks in {dataset['seconds']}s")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "database": os.environ["DATABASE_URL"].split("@")[-1],
+            "scale": {"users": args.users, "artworks": args.artworks, "images": args.images},
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "seed": args.seed,
+            "seed_seconds": dataset["seconds"],
+        },
+        "results": {},
+    }
+
+    if args.mode in ("inprocess", "both"):
+        print("⚡ In-process ASGI")
+        report["results"]["inprocess"] = asyncio.run(run_inprocess(dataset, args))
+
+    if args.mode in ("uvicorn", "both"):
+        print("🌐 Local uvicorn")
+        report["results"]["uvicorn"] = asyncio.run(run_uvicorn(dataset, args))
+
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"📄 Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Seed a synthetic CanvasQuest dataset for benchmarking.
+
+Usage:
+    DATABASE_URL=sqlite:///./bench.db UPLOAD_DIR=./bench_uploads \
+        python -m benchmarks.seed --users 1000 --artworks 20000 --images 100
+"""
+import argparse
+import io
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+from PIL import Image
+from sqlalchemy import func, insert
+
+BENCH_PASSWORD = "benchmark-password"
+BENCH_ARTIST_PREFIX = "bench_artist_"
+
+
+def make_image_bytes(rng: np.random.Generator, size: tuple[int, int] = (512, 512)) -> bytes:
+    """
+    Render a PNG with a few blocks of color and noise, so compression and
+    thumbnailing behave like real drawings rather than flat fills.
+    """
+    width, height = size
+    pixels = np.full((height, width, 3), 255, dtype=np.uint8)
+
+    for _ in range(8):
+        x0, y0 = rng.integers(0, width - 32), rng.integers(0, height - 32)
+        x1, y1 = x0 + rng.integers(32, width - x0 + 1), y0 + rng.integers(32, height - y0 + 1)
+        pixels[y0:y1, x0:x1] = rng.integers(0, 256, size=3, dtype=np.uint8)
+
+    noise = rng.integers(-12, 13, size=pixels.shape)
+    pixels = np.clip(pixels.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, "RGB").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def seed(users: int, artworks: int, images: int, seed_value: int = 42, batch_size: int = 5000) -> dict:
+    """
+    Seed users, artworks and image files with bulk inserts.
+
+    Artworks reuse a pool of `images` real files (with thumbnails) so large
+    row counts don't require as many files on disk.
+
+    Returns:
+        Dictionary describing the seeded dataset
+    """
+    from app.core.database import SessionLocal, init_db
+    from app.core.security import get_password_hash
+    from app.models import Artwork, User
+    from app.services import FileService
+    from app.services.storage_service import get_storage
+
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed_value)
+    random.seed(seed_value)
+
+    init_db()
+    FileService.ensure_upload_dir()
+    db = SessionLocal()
+
+    try:
+        first_user_id = (db.query(func.max(User.id)).scalar() or 0) + 1
+
+        # Users share one password hash: bcrypt per row would dominate seeding
+        hashed_password = get_password_hash(BENCH_PASSWORD)
+        user_rows = [
+            {
+                "artist_name": f"{BENCH_ARTIST_PREFIX}{first_user_id + i}",
+                "hashed_password": hashed_password,
+                "is_active": True,
+                "is_verified": False,
+            }
+            for i in range(users)
+        ]
+        for start in range(0, len(user_rows), batch_size):
+            db.execute(insert(User.__table__), user_rows[start:start + batch_size])
+        db.commit()
+
+        user_ids = [row[0] for row in db.query(User.id).filter(User.id >= first_user_id).all()]
+
+        # Image pool
+        storage = get_storage()
+        files = []
+        for _ in range(images):
+            content = make_image_bytes(rng)
+            key = storage.shard_key("artworks", f"{uuid.uuid4()}.png")
+            with storage.writer(key) as f:
+                f.write(content)
+            file_path = storage.reference(key)
+            files.append((file_path, FileService.create_thumbnail(file_path), len(content)))
+
+        # Artworks, spread over the last year
+        now = datetime.utcnow()
+        batch = []
+        for i in range(artworks):
+            file_path, thumbnail_path, file_size = files[i % len(files)]
+            batch.append({
+                "title": f"Benchmark artwork {i}",
+                "description": "Synthetic artwork for benchmarking",
+                "file_path": file_path,
+                "thumbnail_path": thumbnail_path,
+                "file_format": "png",
+                "file_size": file_size,
+                "width": 512,
+                "height": 512,
+                "hearts": random.randint(0, 500),
+                "views": random.randint(0, 5000),
+                "is_featured": random.random() < 0.05,
+                "is_public": random.random() < 0.9,
+                "artist_id": random.choice(user_ids),
+                "created_at": now - timedelta(seconds=random.randint(0, 365 * 24 * 3600)),
+            })
+            if len(batch) >= batch_size:
+                db.execute(insert(Artwork.__table__), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Artwork.__table__), batch)
+        db.commit()
+
+        artwork_ids = [
+            row[0] for row in db.query(Artwork.id).filter(Artwork.is_public == True).order_by(Artwork.id.desc()).limit(1000)
+        ]
+    finally:
+        db.close()
+
+    return {
+        "users": users,
+        "artworks": artworks,
+        "images": images,
+        "seed": seed_value,
+        "artist_names": [f"{BENCH_ARTIST_PREFIX}{first_user_id + i}" for i in range(min(users, 100))],
+        "public_artwork_ids": artwork_ids,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a synthetic CanvasQuest dataset")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--artworks", type=int, default=2000)
+    parser.add_argument("--images", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    info = seed(args.users, args.artworks, args.images, args.seed)
+    print(f"✅ Seeded {info['users']} users, {info['artworks']} artworks, {info['images']} images in {info['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
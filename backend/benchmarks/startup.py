@@ -0,0 +1,139 @@
+"""
+Measure CanvasQuest cold start: import time and time-to-first-request.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup --runs 10 --output startup-results.json
+
+Each run starts a fresh interpreter, so nothing is cached in memory between
+runs (the OS file cache stays warm). The database in --workdir is migrated
+once up front; servers then start with the schema-version check only, as in
+production. The report uses the format of benchmarks.run, so two reports can
+be compared with benchmarks.compare.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.run import BACKEND_DIR, free_port, git_revision, percentile_summary
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def measure_import(env: dict) -> float:
+    """Seconds to import app.main in a fresh interpreter"""
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env, text=True)
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_server(env: dict, timeout: float = 30.0) -> tuple[float, float]:
+    """
+    Start uvicorn and time the first successful requests.
+
+    Returns:
+        Tuple of (seconds from process start to the first 200 from
+        /api/health, seconds taken by the first login)
+    """
+    import httpx
+
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+            while True:
+                try:
+                    if client.get("/api/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+                if time.perf_counter() - started > timeout:
+                    raise RuntimeError(f"uvicorn did not start within {timeout:.0f}s")
+                time.sleep(0.005)
+            first_request = time.perf_counter() - started
+
+            # Exercises the lazily imported JWT and password hashing modules
+            login_started = time.perf_counter()
+            response = client.post("/api/auth/claim-art", json={"artist_name": f"startup-{port}-{os.getpid()}"})
+            response.raise_for_status()
+            first_login = time.perf_counter() - login_started
+
+        return first_request, first_login
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CanvasQuest API cold start")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--lazy-imports", action="store_true", help="Defer heavy imports until first use")
+    parser.add_argument("--auto-migrate", action="store_true", help="Apply migrations on startup (development mode)")
+    parser.add_argument("--workdir", type=Path, default=BACKEND_DIR / ".bench-startup")
+    parser.add_argument("--output", type=Path, default=Path("startup-results.json"))
+    args = parser.parse_args()
+
+    if args.workdir.exists():
+        shutil.rmtree(args.workdir)
+    args.workdir.mkdir(parents=True)
+
+    env = os.environ.copy()
+    env.setdefault("DATABASE_URL", f"sqlite:///{args.workdir / 'bench.db'}")
+    env.update(
+        UPLOAD_DIR=str(args.workdir / "uploads"),
+        DEBUG="False",
+        DB_AUTO_MIGRATE=str(args.auto_migrate),
+        LAZY_IMPORTS=str(args.lazy_imports),
+    )
+    subprocess.run([sys.executable, "-m", "app.cli", "migrate"], cwd=BACKEND_DIR, env=env, check=True)
+
+    imports, first_requests, first_logins = [], [], []
+    for run in range(args.runs):
+        imports.append(measure_import(env))
+        first_request, first_login = measure_server(env)
+        first_requests.append(first_request)
+        first_logins.append(first_login)
+        print(f"⏱️  Run {run + 1}: import {imports[-1] * 1000:.0f}ms, "
+              f"first request {first_request * 1000:.0f}ms, first login {first_login * 1000:.0f}ms")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "database": env["DATABASE_URL"].split("@")[-1],
+            "runs": args.runs,
+            "lazy_imports": args.lazy_imports,
+            "auto_migrate": args.auto_migrate,
+        },
+        "results": {
+            "startup": {
+                "import": percentile_summary(imports, 0, sum(imports)),
+                "first_request": percentile_summary(first_requests, 0, sum(first_requests)),
+                "first_login": percentile_summary(first_logins, 0, sum(first_logins)),
+            },
+        },
+    }
+
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"📄 Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
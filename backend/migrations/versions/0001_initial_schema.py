@@ -0,0 +1,141 @@
+"""initial schema
+
+Schema of the application when migrations were introduced. Databases created
+earlier with Base.metadata.create_all are adopted in place: only missing
+tables, columns and indexes are created.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_table(name: str, *columns) -> None:
+    """Create a table, or add the columns missing from an existing one"""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(name):
+        op.create_table(name, *columns)
+        return
+
+    existing = {column["name"] for column in inspector.get_columns(name)}
+    missing = [c for c in columns if isinstance(c, sa.Column) and c.name not in existing]
+    if missing:
+        with op.batch_alter_table(name) as batch_op:
+            for column in missing:
+                batch_op.add_column(column)
+
+
+def _create_index(name: str, table: str, columns: list, unique: bool = False) -> None:
+    """Create an index unless it already exists"""
+    existing = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+    if name not in existing:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade() -> None:
+    _create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('artist_name', sa.String(length=100), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('hashed_password', sa.String(length=255), nullable=True),
+    sa.Column('bio', sa.String(length=500), nullable=True),
+    sa.Column('avatar_url', sa.String(length=500), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_users_artist_name', 'users', ['artist_name'], unique=True)
+    _create_index('ix_users_email', 'users', ['email'], unique=True)
+    _create_index('ix_users_id', 'users', ['id'])
+
+    _create_table('artworks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('file_path', sa.String(length=500), nullable=False),
+    sa.Column('thumbnail_path', sa.String(length=500), nullable=True),
+    sa.Column('file_format', sa.String(length=10), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=False),
+    sa.Column('width', sa.Integer(), nullable=True),
+    sa.Column('height', sa.Integer(), nullable=True),
+    sa.Column('canvas_data', sa.Text(), nullable=True),
+    sa.Column('palette', sa.String(length=64), nullable=True),
+    sa.Column('hearts', sa.Integer(), nullable=True),
+    sa.Column('views', sa.Integer(), nullable=True),
+    sa.Column('is_featured', sa.Boolean(), nullable=True),
+    sa.Column('is_public', sa.Boolean(), nullable=True),
+    sa.Column('artist_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['artist_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_artworks_id', 'artworks', ['id'])
+
+    _create_table('sessions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_token', sa.String(length=500), nullable=False),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('user_agent', sa.String(length=500), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_activity', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_sessions_active_user', 'sessions', ['is_active', 'user_id'])
+    _create_index('ix_sessions_expires_at', 'sessions', ['expires_at'])
+    _create_index('ix_sessions_id', 'sessions', ['id'])
+    _create_index('ix_sessions_session_token', 'sessions', ['session_token'], unique=True)
+
+    _create_table('artwork_colors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.String(length=16), nullable=False),
+    sa.Column('hex_color', sa.String(length=7), nullable=False),
+    sa.Column('share', sa.Float(), nullable=False),
+    sa.Column('artwork_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['artwork_id'], ['artworks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_index('ix_artwork_colors_artwork_id', 'artwork_colors', ['artwork_id'])
+    _create_index('ix_artwork_colors_bucket_artwork', 'artwork_colors', ['bucket', 'artwork_id'])
+    _create_index('ix_artwork_colors_id', 'artwork_colors', ['id'])
+
+
+
+def downgrade() -> None:
+    op.drop_index('ix_artwork_colors_id', table_name='artwork_colors')
+    op.drop_index('ix_artwork_colors_bucket_artwork', table_name='artwork_colors')
+    op.drop_index('ix_artwork_colors_artwork_id', table_name='artwork_colors')
+
+    op.drop_table('artwork_colors')
+    op.drop_index('ix_sessions_session_token', table_name='sessions')
+    op.drop_index('ix_sessions_id', table_name='sessions')
+    op.drop_index('ix_sessions_expires_at', table_name='sessions')
+    op.drop_index('ix_sessions_active_user', table_name='sessions')
+
+    op.drop_table('sessions')
+    op.drop_index('ix_artworks_id', table_name='artworks')
+
+    op.drop_table('artworks')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_index('ix_users_artist_name', table_name='users')
+
+    op.drop_table('users')
@@ -0,0 +1,61 @@
+"""canvas drafts
+
+Work-in-progress canvases stored as a snapshot plus an append-only delta log.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 18:22:19.015447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('canvas_drafts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=True),
+    sa.Column('width', sa.Integer(), nullable=True),
+    sa.Column('height', sa.Integer(), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('snapshot', sa.Text(), nullable=True),
+    sa.Column('snapshot_version', sa.Integer(), nullable=False),
+    sa.Column('snapshot_bytes', sa.Integer(), nullable=False),
+    sa.Column('log_bytes', sa.Integer(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_canvas_drafts_id', 'canvas_drafts', ['id'])
+    op.create_index('ix_canvas_drafts_owner_id', 'canvas_drafts', ['owner_id'])
+
+    op.create_table('canvas_draft_deltas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('draft_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['draft_id'], ['canvas_drafts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_canvas_draft_deltas_draft_version', 'canvas_draft_deltas', ['draft_id', 'version'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_canvas_draft_deltas_draft_version', table_name='canvas_draft_deltas')
+    op.drop_table('canvas_draft_deltas')
+
+    op.drop_index('ix_canvas_drafts_owner_id', table_name='canvas_drafts')
+    op.drop_index('ix_canvas_drafts_id', table_name='canvas_drafts')
+    op.drop_table('canvas_drafts')
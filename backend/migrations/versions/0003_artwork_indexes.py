@@ -0,0 +1,32 @@
+"""artwork indexes
+
+Indexes for the gallery, featured and artist queries, which scanned and
+sorted the whole artworks table. Checked by tests/test_query_plans.py.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 20:41:07.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_artworks_public_created', 'artworks', ['is_public', 'created_at'])
+    op.create_index('ix_artworks_public_featured_created', 'artworks', ['is_public', 'is_featured', 'created_at'])
+    op.create_index('ix_artworks_artist_created', 'artworks', ['artist_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_artworks_artist_created', table_name='artworks')
+    op.drop_index('ix_artworks_public_featured_created', table_name='artworks')
+    op.drop_index('ix_artworks_public_created', table_name='artworks')
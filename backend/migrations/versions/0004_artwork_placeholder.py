@@ -0,0 +1,30 @@
+"""artwork placeholder
+
+BlurHash of the thumbnail, shown while the thumbnail loads. Existing rows
+are filled in by `python -m app.cli backfill-placeholders`.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 22:12:45.108362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('artworks', sa.Column('placeholder', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('artworks') as batch_op:
+        batch_op.drop_column('placeholder')
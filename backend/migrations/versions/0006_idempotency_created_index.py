@@ -0,0 +1,27 @@
+"""idempotency key creation index
+
+Trims the idempotency key store to its newest keys by creation order.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-20 10:12:47.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_idempotency_keys_created_at', 'idempotency_keys', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_idempotency_keys_created_at', table_name='idempotency_keys')
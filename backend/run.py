@@ -1,29 +1,160 @@
 #!/usr/bin/env python
 """
-Simple script to run the CanvasQuest backend server.
+Run the CanvasQuest backend server.
+
+In development (DEBUG=True and ENVIRONMENT=development, the defaults) this
+starts a single uvicorn process with auto-reload. Everywhere else it starts
+the production launcher: a gunicorn master supervising WORKERS uvicorn worker
+processes, with the app preloaded in the master so workers share its memory,
+workers recycled after WORKER_MAX_REQUESTS requests, and graceful rolling
+restarts on SIGHUP. The launcher applies migrations once before starting the
+workers, and only one worker at a time runs the maintenance jobs.
+
+    python run.py                  # pick the mode from the settings
+    python run.py --reload         # force the development server
+    python run.py --workers 4      # force the production launcher
 """
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import tempfile
+
 import uvicorn
 from app.core.config import settings
 
-if __name__ == "__main__":
+
+def _event_loop() -> str:
+    """uvloop when installed (it is part of uvicorn[standard], except on Windows)"""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def _http_protocol() -> str:
+    """httptools when installed, otherwise the pure-Python h11 parser"""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def _worker_count() -> int:
+    return settings.WORKERS or multiprocessing.cpu_count()
+
+
+def _prepare_workers(port: int):
+    """
+    Work done once for all workers: migrate the database here instead of in
+    every worker's startup, and have the workers elect one scheduler through
+    a lock file. Both are set in the environment too, for spawned workers.
+    """
+    if settings.DB_AUTO_MIGRATE:
+        from app.core.database import init_db
+        init_db()
+        print("✅ Database migrated")
+        settings.DB_AUTO_MIGRATE = False
+        os.environ["DB_AUTO_MIGRATE"] = "False"
+
+    if not settings.SCHEDULER_LOCK_FILE:
+        settings.SCHEDULER_LOCK_FILE = os.path.join(tempfile.gettempdir(), f"canvasquest-scheduler-{port}.lock")
+        os.environ["SCHEDULER_LOCK_FILE"] = settings.SCHEDULER_LOCK_FILE
+
+
+def _banner(mode: str, host: str, port: int):
     print(f"""
     🎨 CanvasQuest API Server
     ========================
 
-    Starting {settings.APP_NAME} v{settings.APP_VERSION}
+    Starting {settings.APP_NAME} v{settings.APP_VERSION} ({mode})
 
     Server will be available at:
-    - API: http://localhost:8000
-    - Docs: http://localhost:8000/docs
-    - ReDoc: http://localhost:8000/redoc
+    - API: http://localhost:{port}
+    - Docs: http://localhost:{port}/docs
+    - ReDoc: http://localhost:{port}/redoc
 
     Press CTRL+C to stop the server.
     """)
 
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=settings.DEBUG,
-        log_level="info"
-    )
+
+def run_development(host: str, port: int):
+    """Single process with auto-reload"""
+    _banner("development, auto-reload", host, port)
+    uvicorn.run("app.main:app", host=host, port=port, reload=True, log_level="info",
+                access_log=False)
+
+
+def run_production(host: str, port: int, workers: int):
+    """
+    Supervised worker processes.
+
+    Uses gunicorn with uvicorn workers. Without gunicorn (it does not run on
+    Windows) this falls back to uvicorn's own process manager, which cannot
+    preload the app, recycle workers or restart them one at a time.
+    """
+    loop, http = _event_loop(), _http_protocol()
+    _banner(f"{workers} workers, {loop} + {http}", host, port)
+    _prepare_workers(port)
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("⚠️  gunicorn is not installed: workers are not preloaded or recycled")
+        uvicorn.run(
+            "app.main:app", host=host, port=port, workers=workers,
+            loop=loop, http=http, log_level="info", proxy_headers=True,
+            access_log=False,
+        )
+        return
+
+    def post_fork(server, worker):
+        # Connections opened in the master must not be shared between processes
+        from app.core.database import engine
+        engine.dispose(close=False)
+
+    class Launcher(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                # Picks uvloop and httptools when installed, like _event_loop/_http_protocol
+                "worker_class": "uvicorn.workers.UvicornWorker",
+                "preload_app": settings.PRELOAD_APP,
+                "max_requests": settings.WORKER_MAX_REQUESTS,
+                # Spread recycling out so workers don't all restart at once
+                "max_requests_jitter": settings.WORKER_MAX_REQUESTS_JITTER,
+                "timeout": settings.WORKER_TIMEOUT,
+                "graceful_timeout": settings.WORKER_GRACEFUL_TIMEOUT,
+                "keepalive": settings.WORKER_KEEPALIVE,
+                "post_fork": post_fork,
+                # Access lines come from RequestLogMiddleware (sampled, with request IDs)
+                "accesslog": None,
+                "errorlog": "-",
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app, _preload_heavy_modules
+
+            if settings.PRELOAD_APP and not settings.LAZY_IMPORTS:
+                # Imported once in the master and shared copy-on-write by the workers
+                _preload_heavy_modules()
+            return app
+
+    Launcher().run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the CanvasQuest API server")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--reload", action="store_true", help="Single process with auto-reload (development)")
+    mode.add_argument("--workers", type=int, help="Worker processes (default: WORKERS, or one per CPU)")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    args = parser.parse_args()
+
+    development = settings.DEBUG and settings.ENVIRONMENT == "development"
+    if args.reload or (development and args.workers is None):
+        run_development(args.host, args.port)
+    else:
+        run_production(args.host, args.port, args.workers or _worker_count())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Shared fixtures: the API running against a throwaway SQLite database and
+upload directory, seeded with enough rows for realistic query plans.
+"""
+import io
+import os
+import random
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+# Settings are read at import time, so point them at scratch storage first
+TEST_DIR = tempfile.mkdtemp(prefix="canvasquest-tests-")
+os.environ.update({
+    "DEBUG": "False",
+    "DB_AUTO_MIGRATE": "True",
+    "DATABASE_URL": f"sqlite:///{TEST_DIR}/test.db",
+    "UPLOAD_DIR": os.path.join(TEST_DIR, "uploads"),
+    "UPLOAD_STAGING_DIR": os.path.join(TEST_DIR, "upload-staging"),
+    "SNAPSHOTS_ENABLED": "False",
+})
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+SEED_USERS = 200
+SEED_ARTWORKS = 5000
+SEED_SESSIONS = 2000
+OWNER_NAME = "plan_owner"
+OWNER_PASSWORD = "plan-owner-password"
+
+
+def make_png(size: tuple[int, int] = (64, 48)) -> bytes:
+    """Small solid-color PNG for upload requests"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (220, 40, 40)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def seeded(client) -> dict:
+    """
+    Seed users, artworks, color buckets and sessions with bulk inserts, plus
+    one owner created through the API, then ANALYZE so the planner sees
+    realistic statistics.
+
+    Returns:
+        Dict with the owner's "token" (the newest of its sessions), "owner_id",
+        "owner_artwork_ids", and "artist_id" / "artwork_id" of seeded public rows
+    """
+    from sqlalchemy import insert, text
+
+    from app.core.database import SessionLocal
+    from app.models import Artwork, ArtworkColor, Session as SessionModel, User
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    response = client.post(
+        "/api/auth/claim-art",
+        json={"artist_name": OWNER_NAME, "password": OWNER_PASSWORD}
+    )
+    assert response.status_code == 201, response.text
+    token = response.json()["access_token"]
+    owner_id = response.json()["user"]["id"]
+
+    owner_artwork_ids = []
+    for i in range(3):
+        response = client.post(
+            "/api/artworks/upload",
+            files={"file": (f"owned_{i}.png", make_png())},
+            data={"title": f"Owned {i}"},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 201, response.text
+        owner_artwork_ids.append(response.json()["id"])
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(User.__table__), [
+            {"artist_name": f"seed_artist_{i}", "is_active": True, "is_verified": False}
+            for i in range(SEED_USERS)
+        ])
+        user_ids = [user_id for (user_id,) in db.query(User.id).filter(User.id != owner_id)]
+
+        db.execute(insert(Artwork.__table__), [
+            {
+                "title": f"Seeded artwork {i}",
+                "file_path": f"/seed/artworks/{i}.png",
+                "thumbnail_path": f"/seed/thumbnails/thumb_{i}.jpg",
+                "file_format": "png",
+                "file_size": 1024,
+                "width": 512,
+                "height": 512,
+                "palette": "#dc1414",
+                "hearts": rng.randint(0, 500),
+                "views": rng.randint(0, 5000),
+                "is_featured": rng.random() < 0.05,
+                "is_public": rng.random() < 0.9,
+                "artist_id": rng.choice(user_ids),
+                "created_at": now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600)),
+            }
+            for i in range(SEED_ARTWORKS)
+        ])
+        artwork_ids = [artwork_id for (artwork_id,) in db.query(Artwork.id)]
+
+        buckets = ["red", "orange", "yellow", "green", "blue", "purple", "gray", "black", "white"]
+        db.execute(insert(ArtworkColor.__table__), [
+            {"artwork_id": artwork_id, "bucket": bucket, "hex_color": "#dc1414", "share": 0.5}
+            for artwork_id in artwork_ids
+            for bucket in rng.sample(buckets, 2)
+        ])
+
+        # Active, expired and logged-out sessions; the owner is over the active session cap
+        db.execute(insert(SessionModel.__table__), [
+            {
+                "session_token": f"seed-session-{i}",
+                "user_id": owner_id if i % 10 == 0 else rng.choice(user_ids),
+                "is_active": rng.random() < 0.7,
+                "expires_at": now + timedelta(days=rng.randint(-30, 30)),
+            }
+            for i in range(SEED_SESSIONS)
+        ])
+        db.commit()
+
+        public_artwork = db.query(Artwork).filter(Artwork.is_public == True, Artwork.artist_id != owner_id).first()
+        db.execute(text("ANALYZE"))
+        db.commit()
+
+        # The owner's seeded sessions are newer than its first one, so the session
+        # cap deactivates that one on the next login: use a fresh token instead
+        response = client.post("/api/auth/login", json={"artist_name": OWNER_NAME, "password": OWNER_PASSWORD})
+        assert response.status_code == 200, response.text
+        token = response.json()["access_token"]
+
+        return {
+            "token": token,
+            "owner_id": owner_id,
+            "owner_artwork_ids": owner_artwork_ids,
+            "artist_id": public_artwork.artist_id,
+            "artwork_id": public_artwork.id,
+        }
+    finally:
+        db.close()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
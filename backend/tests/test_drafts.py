@@ -0,0 +1,24 @@
+"""
+Materialized draft states cached per worker.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services.draft_service import DraftStateCache
+
+
+def test_reused_draft_id_misses_cache():
+    cache = DraftStateCache(max_entries=10)
+    created = datetime(2026, 1, 1, 12, 0, 0)
+    published = SimpleNamespace(id=7, owner_id=1, created_at=created)
+    cache.put(published, 3, {"strokes": ["secret"]})
+
+    # Another user's new draft got the deleted draft's ID (and was even created in the same second)
+    reused = SimpleNamespace(id=7, owner_id=2, created_at=created)
+    assert cache.serialized(reused, 3) is None
+    assert cache.take(reused, 3) is None
+
+    # The same draft still hits at its version
+    cache.put(published, 3, {"strokes": ["secret"]})
+    assert cache.serialized(published, 3) == '{"strokes":["secret"]}'
+    assert cache.serialized(published, 4) is None
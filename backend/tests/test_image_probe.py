@@ -0,0 +1,106 @@
+"""
+Upload header checks: probe_image parses PNG/JPEG/SVG headers and
+FileService.check_image turns the result into accept/reject decisions.
+"""
+import io
+import struct
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.image_probe import PROBE_BYTES, ImageProbeError, probe_image
+from app.services import FileService
+from tests.conftest import make_png
+
+
+def make_jpeg(size: tuple[int, int] = (64, 48)) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (40, 40, 220)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def png_header(width: int, height: int) -> bytes:
+    """Signature and IHDR chunk only: enough for the probe, no pixel data"""
+    ihdr = struct.pack(">II", width, height) + bytes([8, 2, 0, 0, 0])
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr + b"\x00" * 4
+
+
+def jpeg_segment(marker: int, payload: bytes) -> bytes:
+    return bytes([0xFF, marker]) + struct.pack(">H", len(payload) + 2) + payload
+
+
+def test_png_and_jpeg_dimensions():
+    assert probe_image(make_png((64, 48))) == ("png", 64, 48)
+    assert probe_image(make_jpeg((30, 20))) == ("jpg", 30, 20)
+
+
+@pytest.mark.parametrize("head", [
+    make_png()[:20],  # signature, but IHDR cut short
+    b"\xff\xd8\xff",  # JPEG SOI only
+    make_jpeg()[:100],  # JPEG cut in its quantization tables, before the frame header
+    b"GIF89a\x01\x00\x01\x00",
+    b"",
+], ids=["png", "jpeg-soi", "jpeg-no-frame", "gif", "empty"])
+def test_truncated_or_unknown_header_is_rejected(head):
+    with pytest.raises(ImageProbeError):
+        probe_image(head)
+    with pytest.raises(HTTPException) as error:
+        FileService.check_image(head, ".png")
+    assert error.value.status_code == 400
+
+
+def test_jpeg_frame_after_large_app_segments():
+    frame = jpeg_segment(0xC0, bytes([8]) + struct.pack(">HH", 600, 800) + bytes([3]) + b"\x01\x11\x00" * 3)
+    head = (
+        b"\xff\xd8"
+        + jpeg_segment(0xE1, b"Exif\x00\x00" + b"\x00" * 65000)  # EXIF with a thumbnail
+        + jpeg_segment(0xE2, b"ICC_PROFILE\x00" + b"\x00" * 65000)
+        + b"\xff"  # fill byte before a marker
+        + frame
+    )
+    assert probe_image(head) == ("jpg", 800, 600)
+
+
+def test_jpeg_frame_beyond_probe_window_is_rejected():
+    segments = jpeg_segment(0xE1, b"\x00" * 65000) * (PROBE_BYTES // 65000 + 1)
+    with pytest.raises(ImageProbeError):
+        probe_image((b"\xff\xd8" + segments)[:PROBE_BYTES])
+
+
+def test_decompression_bomb_is_rejected():
+    side = int(settings.MAX_IMAGE_PIXELS ** 0.5) + 1
+    with pytest.raises(HTTPException) as error:
+        FileService.check_image(png_header(side, side), ".png")
+    assert error.value.status_code == 413
+
+    info, _ = FileService.check_image(png_header(side, 1), ".png")
+    assert info.pixels == side
+
+
+def test_svg_entities_are_rejected():
+    head = b'<?xml version="1.0"?><!DOCTYPE svg [<!ENTITY lol "lol">]><svg width="10" height="10">&lol;</svg>'
+    with pytest.raises(HTTPException) as error:
+        FileService.check_image(head, ".svg")
+    assert error.value.status_code == 400
+
+
+def test_svg_dimensions():
+    assert probe_image(b'<svg xmlns="http://www.w3.org/2000/svg" width="120px" height="80"></svg>') == ("svg", 120, 80)
+    assert probe_image(b'<!-- logo --><svg viewBox="0 0 300 150"></svg>') == ("svg", 300, 150)
+    assert probe_image(b'<svg width="100%" height="100%"></svg>') == ("svg", None, None)
+    with pytest.raises(ImageProbeError):
+        probe_image(b"<html><svg></svg></html>")
+
+
+@pytest.mark.parametrize("content, name_ext, expected", [
+    (make_png(), ".jpg", ".png"),
+    (make_jpeg(), ".png", ".jpg"),
+    (make_jpeg(), ".jpeg", ".jpeg"),
+    (b'<svg width="4" height="4"></svg>', ".png", ".svg"),
+])
+def test_mislabeled_extension_is_corrected(content, name_ext, expected):
+    _, file_ext = FileService.check_image(content, name_ext)
+    assert file_ext == expected
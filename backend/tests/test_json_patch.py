@@ -0,0 +1,87 @@
+"""
+JSON Patch (RFC 6902) operations applied to canvas draft deltas.
+"""
+import pytest
+
+from app.core.json_patch import JsonPatchError, apply_patch
+
+
+def patched(doc, *operations):
+    return apply_patch(doc, list(operations))
+
+
+def test_add():
+    assert patched({"a": 1}, {"op": "add", "path": "/b", "value": 2}) == {"a": 1, "b": 2}
+    assert patched({"a": 1}, {"op": "add", "path": "/a", "value": 3}) == {"a": 3}
+    assert patched([1, 3], {"op": "add", "path": "/1", "value": 2}) == [1, 2, 3]
+    assert patched({"a": [1]}, {"op": "add", "path": "/a/-", "value": 2}) == {"a": [1, 2]}
+    assert patched({"a": 1}, {"op": "add", "path": "", "value": [9]}) == [9]
+
+
+def test_remove():
+    assert patched({"a": 1, "b": 2}, {"op": "remove", "path": "/a"}) == {"b": 2}
+    assert patched({"a": [1, 2, 3]}, {"op": "remove", "path": "/a/1"}) == {"a": [1, 3]}
+
+
+def test_replace():
+    assert patched({"a": 1}, {"op": "replace", "path": "/a", "value": {"x": 1}}) == {"a": {"x": 1}}
+    assert patched([1, 2, 3], {"op": "replace", "path": "/2", "value": 4}) == [1, 2, 4]
+    assert patched({"a": 1}, {"op": "replace", "path": "", "value": "root"}) == "root"
+
+
+def test_move():
+    assert patched({"a": {"b": 1}, "c": {}}, {"op": "move", "from": "/a/b", "path": "/c/d"}) == {"a": {}, "c": {"d": 1}}
+    assert patched({"a": [1, 2, 3]}, {"op": "move", "from": "/a/0", "path": "/a/-"}) == {"a": [2, 3, 1]}
+    assert patched({"a": 1}, {"op": "move", "from": "/a", "path": "/a"}) == {"a": 1}
+
+
+def test_copy_is_independent():
+    doc = patched({"a": {"b": [1]}}, {"op": "copy", "from": "/a", "path": "/c"})
+    assert doc == {"a": {"b": [1]}, "c": {"b": [1]}}
+    doc["c"]["b"].append(2)
+    assert doc["a"] == {"b": [1]}
+
+
+def test_test():
+    doc = {"a": [1, {"b": "x"}]}
+    assert patched(doc, {"op": "test", "path": "/a/1/b", "value": "x"}) == doc
+    assert patched({"n": 1}, {"op": "test", "path": "/n", "value": 1.0}) == {"n": 1}
+    with pytest.raises(JsonPatchError):
+        patched(doc, {"op": "test", "path": "/a/0", "value": 2})
+
+
+def test_test_compares_json_types():
+    # true is not 1 in JSON, even though it is in Python
+    with pytest.raises(JsonPatchError):
+        patched({"a": True}, {"op": "test", "path": "/a", "value": 1})
+    with pytest.raises(JsonPatchError):
+        patched({"a": [0]}, {"op": "test", "path": "/a", "value": [False]})
+
+
+def test_escaped_pointer_tokens():
+    doc = {"a/b": 1, "m~n": 2}
+    assert patched(doc, {"op": "test", "path": "/a~1b", "value": 1}) == doc
+    assert patched(doc, {"op": "replace", "path": "/m~0n", "value": 3}) == {"a/b": 1, "m~n": 3}
+    # "~01" is "~1" unescaped, not "/"
+    assert patched({}, {"op": "add", "path": "/~01", "value": 0}) == {"~1": 0}
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "add", "path": "/missing/child", "value": 1},
+    {"op": "add", "path": "/a/5", "value": 1},
+    {"op": "add", "path": "/a/01", "value": 1},
+    {"op": "add", "path": "a", "value": 1},
+    {"op": "add", "path": "/a/0"},
+    {"op": "remove", "path": "/missing"},
+    {"op": "remove", "path": "/a/-"},
+    {"op": "remove", "path": ""},
+    {"op": "replace", "path": "/a/3", "value": 1},
+    {"op": "move", "from": "/o", "path": "/o/inner"},
+    {"op": "copy", "path": "/x"},
+    {"op": "add", "path": "/s/x", "value": 1},
+    {"op": "frobnicate", "path": "/a"},
+    {"path": "/a"},
+], ids=lambda operation: f"{operation.get('op')} {operation.get('path')}")
+def test_invalid_operations(operation):
+    with pytest.raises(JsonPatchError):
+        patched({"a": [1, 2, 3], "o": {}, "s": "scalar"}, operation)
@@ -0,0 +1,94 @@
+"""
+Migrations adopt databases created with create_all before Alembic was used.
+"""
+import os
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+
+from app.core.database import BACKEND_DIR, SCHEMA_REVISION
+
+
+def legacy_metadata() -> sa.MetaData:
+    """Tables as create_all made them before palettes (no artwork_colors)"""
+    metadata = sa.MetaData()
+    sa.Table(
+        "users", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("artist_name", sa.String(100), unique=True, index=True, nullable=False),
+        sa.Column("email", sa.String(255), unique=True, index=True),
+        sa.Column("hashed_password", sa.String(255)),
+        sa.Column("bio", sa.String(500)),
+        sa.Column("avatar_url", sa.String(500)),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("is_verified", sa.Boolean),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    sa.Table(
+        "artworks", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("title", sa.String(200)),
+        sa.Column("description", sa.Text),
+        sa.Column("file_path", sa.String(500), nullable=False),
+        sa.Column("thumbnail_path", sa.String(500)),
+        sa.Column("file_format", sa.String(10), nullable=False),
+        sa.Column("file_size", sa.Integer, nullable=False),
+        sa.Column("width", sa.Integer),
+        sa.Column("height", sa.Integer),
+        sa.Column("canvas_data", sa.Text),
+        sa.Column("hearts", sa.Integer),
+        sa.Column("views", sa.Integer),
+        sa.Column("is_featured", sa.Boolean),
+        sa.Column("is_public", sa.Boolean),
+        sa.Column("artist_id", sa.Integer, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    sa.Table(
+        "sessions", metadata,
+        sa.Column("id", sa.Integer, primary_key=True, index=True),
+        sa.Column("session_token", sa.String(500), unique=True, index=True, nullable=False),
+        sa.Column("ip_address", sa.String(45)),
+        sa.Column("user_agent", sa.String(500)),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_activity", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    return metadata
+
+
+def test_upgrade_adopts_pre_palette_database(tmp_path):
+    engine = sa.create_engine(f"sqlite:///{tmp_path}/legacy.db")
+    legacy_metadata().create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(sa.text("INSERT INTO users (id, artist_name) VALUES (1, 'legacy')"))
+        connection.execute(sa.text(
+            "INSERT INTO artworks (id, file_path, file_format, file_size, artist_id) "
+            "VALUES (1, 'uploads/artworks/a.png', 'png', 10, 1)"
+        ))
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.attributes["configure_logger"] = False
+    try:
+        with engine.begin() as connection:
+            config.attributes["connection"] = connection
+            command.upgrade(config, "head")
+
+        inspector = sa.inspect(engine)
+        columns = {column["name"] for column in inspector.get_columns("artworks")}
+        assert {"palette", "placeholder"} <= columns
+        assert inspector.has_table("artwork_colors")
+        assert inspector.has_table("canvas_drafts")
+
+        with engine.connect() as connection:
+            assert connection.execute(sa.text("SELECT version_num FROM alembic_version")).scalar() == SCHEMA_REVISION
+            assert connection.execute(sa.text("SELECT file_path, palette FROM artworks")).one() == (
+                "uploads/artworks/a.png", None
+            )
+    finally:
+        engine.dispose()
@@ -0,0 +1,203 @@
+"""
+Query-plan regression tests.
+
+Every SQL statement issued by the hot request paths is captured and run
+through EXPLAIN QUERY PLAN against the seeded SQLite database. A path fails
+if any statement reads a whole table (a bare "SCAN <table>"), needs an
+automatic index, or sorts through a temporary B-tree. When a test fails,
+add or fix an index (with a migration) rather than loosening the check.
+"""
+import re
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+import pytest
+from sqlalchemy import event
+
+from app.core.cache import gallery_cache
+from app.core.database import SessionLocal, engine
+from tests.conftest import OWNER_NAME, OWNER_PASSWORD, make_png
+
+# Plan details that mean a query does work proportional to the table size
+BAD_PLAN = re.compile(r"^SCAN (TABLE )?\S+( AS \S+)?$|AUTOMATIC|USE TEMP B-TREE")
+
+EXPLAINED_STATEMENTS = ("SELECT", "UPDATE", "DELETE")
+
+
+@contextmanager
+def capture_statements() -> Iterator[list[tuple[str, tuple]]]:
+    """Collect (statement, parameters) of every query run inside the block"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(statement: str, parameters) -> list[str]:
+    """Plan detail lines of a statement, as reported by EXPLAIN QUERY PLAN"""
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in rows]
+
+
+def ok(response):
+    assert response.status_code < 400, response.text
+    return response
+
+
+def auth(seeded: dict) -> dict:
+    return {"Authorization": f"Bearer {seeded['token']}"}
+
+
+# ============= Hot paths =============
+
+def gallery(client, seeded):
+    ok(client.get("/api/gallery/", params={"limit": 50}))
+    ok(client.get("/api/gallery/", params={"skip": 50, "limit": 50}))
+
+
+def gallery_cards(client, seeded):
+    ok(client.get("/api/gallery/", params={"limit": 50, "fields": "card"}))
+    ok(client.get("/api/gallery/latest", params={"fields": "id,title,thumbnail_path"}))
+
+
+def gallery_by_color(client, seeded):
+    ok(client.get("/api/gallery/", params={"color": "red"}))
+
+
+def gallery_featured(client, seeded):
+    ok(client.get("/api/gallery/featured"))
+
+
+def gallery_latest(client, seeded):
+    ok(client.get("/api/gallery/latest"))
+
+
+def artist_artworks(client, seeded):
+    ok(client.get(f"/api/artworks/artist/{seeded['artist_id']}"))
+
+
+def artist_cards(client, seeded):
+    ok(client.get(f"/api/artworks/artist/{seeded['artist_id']}", params={"fields": "card"}))
+
+
+def own_artworks(client, seeded):
+    ok(client.get(f"/api/artworks/artist/{seeded['owner_id']}", headers=auth(seeded)))
+
+
+def artwork_view(client, seeded):
+    ok(client.get(f"/api/artworks/{seeded['artwork_id']}", headers=auth(seeded)))
+
+
+def artwork_multi_get(client, seeded):
+    ids = [seeded["artwork_id"], *seeded["owner_artwork_ids"], 10 ** 9]
+    ok(client.get("/api/artworks", params={"ids": ",".join(map(str, ids))}, headers=auth(seeded)))
+
+
+def artwork_heart(client, seeded):
+    ok(client.post(f"/api/artworks/{seeded['artwork_id']}/heart"))
+
+
+def artwork_upload(client, seeded):
+    ok(client.post("/api/artworks/upload", files={"file": ("plan.png", make_png())}, headers=auth(seeded)))
+
+
+def idempotent_upload(client, seeded):
+    headers = {**auth(seeded), "Idempotency-Key": "plan-upload"}
+    for _ in range(2):
+        ok(client.post("/api/artworks/upload", files={"file": ("plan.png", make_png())}, headers=headers))
+
+
+def idempotent_heart(client, seeded):
+    for _ in range(2):
+        ok(client.post(f"/api/artworks/{seeded['artwork_id']}/heart", headers={"Idempotency-Key": "plan-heart"}))
+
+
+def artwork_delete(client, seeded):
+    ok(client.delete(f"/api/artworks/{seeded['owner_artwork_ids'].pop()}", headers=auth(seeded)))
+
+
+def claim_art(client, seeded):
+    ok(client.post("/api/auth/claim-art", json={"artist_name": "plan_newcomer", "email": "new@example.com"}))
+
+
+def login(client, seeded):
+    ok(client.post("/api/auth/login", json={"artist_name": OWNER_NAME, "password": OWNER_PASSWORD}))
+
+
+def current_user(client, seeded):
+    ok(client.get("/api/auth/me", headers=auth(seeded)))
+
+
+def logout(client, seeded):
+    token = ok(client.post("/api/auth/login", json={"artist_name": OWNER_NAME, "password": OWNER_PASSWORD})).json()
+    ok(client.post("/api/auth/logout", headers={"Authorization": f"Bearer {token['access_token']}"}))
+
+
+def session_purge(client, seeded):
+    from app.services import AuthService
+
+    db = SessionLocal()
+    try:
+        AuthService.purge_sessions(db, batch_size=100)
+    finally:
+        db.close()
+
+
+def idempotency_purge(client, seeded):
+    from app.services import IdempotencyService
+
+    db = SessionLocal()
+    try:
+        IdempotencyService.purge_expired(db, batch_size=100)
+    finally:
+        db.close()
+
+
+HOT_PATHS: list[Callable] = [
+    gallery,
+    gallery_cards,
+    gallery_by_color,
+    gallery_featured,
+    gallery_latest,
+    artist_artworks,
+    artist_cards,
+    own_artworks,
+    artwork_view,
+    artwork_multi_get,
+    artwork_heart,
+    artwork_upload,
+    idempotent_upload,
+    idempotent_heart,
+    artwork_delete,
+    claim_art,
+    login,
+    current_user,
+    logout,
+    session_purge,
+    idempotency_purge,
+]
+
+
+@pytest.mark.parametrize("path", HOT_PATHS, ids=lambda path: path.__name__)
+def test_query_plans(client, seeded, path):
+    gallery_cache.invalidate()
+
+    with capture_statements() as statements:
+        path(client, seeded)
+    assert statements, "no queries captured"
+
+    problems = []
+    for statement, parameters in statements:
+        plan = explain(statement, parameters)
+        if any(BAD_PLAN.search(detail) for detail in plan):
+            problems.append(f"{statement}\n  params: {parameters}\n  plan:\n    " + "\n    ".join(plan))
+
+    assert not problems, "Queries without a usable index:\n\n" + "\n\n".join(problems)
@@ -0,0 +1,36 @@
+"""
+Session lifecycle: tokens authenticate only while their session is active.
+"""
+from app.core.config import settings
+
+
+def login(client, artist_name: str, password: str) -> str:
+    response = client.post("/api/auth/login", json={"artist_name": artist_name, "password": password})
+    assert response.status_code == 200, response.text
+    return response.json()["access_token"]
+
+
+def me(client, token: str) -> int:
+    return client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code
+
+
+def test_session_cap_revokes_oldest_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_ACTIVE_SESSIONS_PER_USER", 3)
+
+    response = client.post("/api/auth/claim-art", json={"artist_name": "session_capped", "password": "capped-password"})
+    assert response.status_code == 201, response.text
+    tokens = [response.json()["access_token"]]
+    tokens += [login(client, "session_capped", "capped-password") for _ in range(3)]
+
+    # The (cap + 1)-th session deactivated the first one
+    assert me(client, tokens[0]) == 401
+    assert [me(client, token) for token in tokens[1:]] == [200, 200, 200]
+
+
+def test_logged_out_token_is_rejected(client):
+    response = client.post("/api/auth/claim-art", json={"artist_name": "session_leaver", "password": "leaver-password"})
+    assert response.status_code == 201, response.text
+    token = response.json()["access_token"]
+
+    assert client.post("/api/auth/logout", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    assert me(client, token) == 401
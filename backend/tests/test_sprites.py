@@ -0,0 +1,36 @@
+"""
+Stale sprite sheet cleanup.
+"""
+import os
+import time
+
+from app.services.sprite_service import SpriteService
+from app.services.storage_service import LocalStorage
+
+
+def test_purge_stale_pairs_sheets_with_maps(tmp_path, monkeypatch):
+    storage = LocalStorage(str(tmp_path))
+    monkeypatch.setattr("app.services.sprite_service.get_storage", lambda: storage)
+
+    old = time.time() - 48 * 3600
+    files = {
+        # Old sheet whose map was refreshed recently: both kept
+        "sprites/aaaa.jpg": old, "sprites/aaaa.json": None,
+        # Old sheet and map: both deleted
+        "sprites/bbbb.jpg": old, "sprites/bbbb.json": old,
+        # Old sheet that never got a map: deleted
+        "sprites/cccc.jpg": old,
+        # Recent sheet without a map yet: kept
+        "sprites/dddd.jpg": None,
+    }
+    for key, modified in files.items():
+        with storage.writer(key) as f:
+            f.write(b"x" * 10)
+        if modified is not None:
+            os.utime(storage.path(key), (modified, modified))
+
+    stats = SpriteService.purge_stale()
+
+    assert stats == {"deleted": 3, "bytes": 30}
+    remaining = [key for key, _, _ in storage.list("sprites/")]
+    assert remaining == ["sprites/aaaa.jpg", "sprites/aaaa.json", "sprites/dddd.jpg"]
@@ -0,0 +1,115 @@
+"""
+S3 storage backend against a moto-mocked bucket, including one orphan
+collection pass.
+"""
+import pytest
+
+pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+from app.models import Artwork, User  # noqa: E402
+from app.services.cleanup_service import CleanupService  # noqa: E402
+from app.services.storage_service import S3Storage, StorageError  # noqa: E402
+
+BUCKET = "canvasquest-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """An S3Storage on an empty mocked bucket, also used by the collector"""
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(name, "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with moto.mock_aws():
+        storage = S3Storage(bucket=BUCKET, region="us-east-1")
+        storage.client.create_bucket(Bucket=BUCKET)
+        # Force several ListObjectsV2 round trips on small fixtures
+        storage.list_page_size = 2
+        monkeypatch.setattr("app.services.cleanup_service.get_storage", lambda: storage)
+        yield storage
+
+
+def put(storage: S3Storage, key: str, data: bytes):
+    with storage.writer(key) as f:
+        f.write(data)
+
+
+def test_save_list_move_delete(s3):
+    put(s3, "artworks/b.png", b"bbbb")
+    put(s3, "artworks/a.png", b"aa")
+    put(s3, "artworks/c.svg.gz", b"c")
+    put(s3, "thumbnails/a.png", b"t")
+
+    assert s3.exists("artworks/a.png")
+    assert not s3.exists("artworks/missing.png")
+    assert s3.size("artworks/b.png") == 4
+    with s3.open("artworks/a.png") as f:
+        assert f.read() == b"aa"
+    with pytest.raises(StorageError):
+        s3.open("artworks/missing.png")
+
+    head = s3.client.head_object(Bucket=BUCKET, Key="artworks/c.svg.gz")
+    assert head["ContentType"] == "image/svg+xml"
+    assert head["ContentEncoding"] == "gzip"
+
+    # Listing spans pages and comes back in key order
+    listing = list(s3.list("artworks/"))
+    assert [(key, size) for key, size, _ in listing] == [
+        ("artworks/a.png", 2), ("artworks/b.png", 4), ("artworks/c.svg.gz", 1),
+    ]
+    assert all(modified > 0 for _, _, modified in listing)
+
+    s3.move("artworks/b.png", "quarantine/20000101/artworks/b.png")
+    assert not s3.exists("artworks/b.png")
+    with s3.open("quarantine/20000101/artworks/b.png") as f:
+        assert f.read() == b"bbbb"
+
+    assert s3.delete("artworks/a.png")
+    assert [key for key, _, _ in s3.list("artworks/")] == ["artworks/c.svg.gz"]
+
+
+def test_collect_orphan_files(s3):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    try:
+        artist = User(artist_name="s3_artist")
+        db.add(artist)
+        db.flush()
+        db.add(Artwork(
+            file_path=f"{s3.reference_prefix}/artworks/keep.png",
+            thumbnail_path=f"{s3.reference_prefix}/thumbnails/keep.png",
+            file_format="png",
+            file_size=4,
+            artist_id=artist.id,
+        ))
+        db.commit()
+
+        for key in ("artworks/keep.png", "thumbnails/keep.png"):
+            put(s3, key, b"keep")
+        for key in ("artworks/orphan-1.png", "artworks/orphan-2.png", "thumbnails/orphan.png"):
+            put(s3, key, b"orphan")
+        # Expired quarantine is purged in the same pass
+        put(s3, "quarantine/20000101/artworks/old.png", b"old")
+
+        stats = CleanupService.collect_orphan_files(db, grace_hours=0, quarantine=False)
+
+        assert stats["scanned"] == 5
+        assert stats["referenced"] == 2
+        assert stats["deleted"] == 3
+        assert stats["purged"] == 1
+        assert stats["reclaimed_bytes"] == 3 * len(b"orphan") + len(b"old")
+        remaining = sorted(key for key, _, _ in s3.list())
+        assert remaining == ["artworks/keep.png", "thumbnails/keep.png"]
+    finally:
+        db.close()
+        engine.dispose()
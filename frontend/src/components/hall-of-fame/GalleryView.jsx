@@ -5,6 +5,9 @@ import { Heart, Eye, User } from 'lucide-react';
 import useGalleryStore from '../../stores/useGalleryStore';
 import { format } from 'date-fns';
 
+// Local uploads are stored as server-relative paths, S3 uploads as absolute URLs
+const fileUrl = (path) => (/^https?:\/\//.test(path) ? path : `http://localhost:8000/${path}`);
+
 const GalleryContainer = styled.div`
   padding: 2rem;
   max-width: 1400px;
@@ -254,7 +257,7 @@ const GalleryView = () => {
           >
             <ImageContainer>
               <img
-                src={`http://localhost:8000/${artwork.thumbnail_path || artwork.file_path}`}
+                src={fileUrl(artwork.thumbnail_path || artwork.file_path)}
                 alt={artwork.title || 'Artwork'}
                 onError={(e) => {
                   e.target.src = 'data:image/svg+xml,%3Csvg xmlns="http://www.w3.org/2000/svg" width="300" height="250"%3E%3Crect fill="%23f4f1e8" width="300" height="250"/%3E%3Ctext x="50%25" y="50%25" dominant-baseline="middle" text-anchor="middle" fill="%232c3e50" font-size="20"%3EArtwork%3C/text%3E%3C/svg%3E';